@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-month cost of compositing day cells.
+========================================
+Renders the day cells of each month once, then times compositing them
+onto the month page with per-cell overlay_image calls versus a single
+ImageUtils.composite_batch pass, and checks both produce the same pixels.
+
+Usage:
+    python benchmarks/compositing.py [settings.json] [--year 2026] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.calendar_generator import CalendarGenerator  # noqa: E402
+from src.utils.date_utils import DateUtils  # noqa: E402
+from src.utils.image_utils import ImageUtils  # noqa: E402
+
+
+def month_placements(generator: CalendarGenerator, year: int, month: int):
+    """Build the (tile, x, y) list create_month composites for a month."""
+    renderer = generator.month_renderer
+    geometry = renderer.get_month_geometry(month, generator.config)
+    first_weekday = DateUtils.get_first_weekday(year, month)
+    start_y = (geometry['offset_y'] + geometry['month_header_height']
+               + geometry['dow_height'] + geometry['gap_y'])
+    placements = []
+    for day in range(1, DateUtils.get_days_in_month(year, month) + 1):
+        weekday = datetime(year, month, day).weekday()
+        week_num = (first_weekday + day - 1) // 7
+        day_num = (first_weekday + day - 1) % 7
+        x = geometry['offset_x'] + geometry['gap_x'] + day_num * (geometry['day_width'] + geometry['gap_x'])
+        y = start_y + week_num * (geometry['day_height'] + geometry['gap_y'])
+        tile = renderer.day_renderer.create_day_image(day, month, weekday, generator.config)
+        placements.append((tile, x, y))
+    page = ImageUtils.create_white_image(geometry['total_width'], geometry['total_height'])
+    return page, placements
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", nargs="?", default="settings.json")
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    generator = CalendarGenerator(args.config)
+
+    def per_cell(page, placements):
+        for tile, x, y in placements:
+            page = ImageUtils.overlay_image(page, tile, x, y)
+        return page
+
+    print(f"{'month':>5} {'cells':>5} {'per-cell ms':>12} {'batch ms':>9} {'speedup':>8}")
+    total_cell = total_batch = 0.0
+    for month in range(1, 13):
+        page, placements = month_placements(generator, args.year, month)
+        if not (per_cell(page, placements) == ImageUtils.composite_batch(page, placements)).all():
+            print(f"month {month}: batch output differs from per-cell output")
+            sys.exit(1)
+        cell_ms = best_of(lambda: per_cell(page, placements), args.repeat)
+        batch_ms = best_of(lambda: ImageUtils.composite_batch(page, placements), args.repeat)
+        total_cell += cell_ms
+        total_batch += batch_ms
+        print(f"{month:>5} {len(placements):>5} {cell_ms:>12.1f} {batch_ms:>9.1f} "
+              f"{cell_ms / batch_ms:>7.1f}x")
+    print(f"{'year':>5} {'':>5} {total_cell:>12.1f} {total_batch:>9.1f} "
+          f"{total_cell / total_batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Encode time and file size of each PNG encoder profile.
+======================================================
+Renders the chosen months once, then encodes every page with the draft,
+final and web profiles (see src/utils/png_encoder.py) and reports the best
+encode time and the file size of each. Full-color profiles are checked to
+decode back to the rendered pixels; for the palette profile the mean
+per-channel error is shown instead.
+
+Usage:
+    python benchmarks/encoding.py [settings.json] [--year 2026] [--months 1,6,12] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from src.calendar_generator import CalendarGenerator  # noqa: E402
+from src.utils.png_encoder import ENCODER_PROFILES, encode_png, get_encoder_profile  # noqa: E402
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def decode_error(page: np.ndarray, data: bytes) -> float:
+    """Mean absolute per-channel difference between a page and its decoded PNG."""
+    decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+    channels = min(decoded.shape[2], page.shape[2])
+    return float(np.abs(decoded[:, :, :channels].astype(np.int16)
+                        - page[:, :, :channels]).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", nargs="?", default="settings.json")
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--months", default="1,6,12")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    generator = CalendarGenerator(args.config)
+    months = [int(m) for m in args.months.split(",")]
+
+    print(f"{'month':>5} {'profile':>8} {'encode ms':>10} {'KB':>8} {'vs draft':>9} {'error':>7}")
+    totals = {name: [0.0, 0] for name in ENCODER_PROFILES}
+    for month in months:
+        page = generator.create_month(args.year, month)
+        draft_size = None
+        for name in ENCODER_PROFILES:
+            ms, data = best_of(lambda: encode_png(page, name), args.repeat)
+            error = decode_error(page, data)
+            if not get_encoder_profile(name)['colors'] and error:
+                print(f"month {month}: {name} output does not decode to the rendered page")
+                sys.exit(1)
+            draft_size = draft_size or len(data)
+            totals[name][0] += ms
+            totals[name][1] += len(data)
+            print(f"{month:>5} {name:>8} {ms:>10.1f} {len(data) / 1024:>8.0f} "
+                  f"{draft_size / len(data):>8.1f}x {error:>7.2f}")
+
+    draft_total = totals[next(iter(ENCODER_PROFILES))][1]
+    for name, (ms, size) in totals.items():
+        print(f"{'all':>5} {name:>8} {ms:>10.1f} {size / 1024:>8.0f} {draft_total / size:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Background decode time with and without reduced-resolution JPEG decoding.
+========================================================================
+Times ImageUtils.decode_background (the uncached part of load_background)
+for each source and target size, once with a full decode and once with
+the reduced decode it picks from the header. Both are compared (PSNR)
+with an area-averaged downscale of the full image, which does not alias.
+Without arguments a 24-megapixel photo-like JPEG is generated in a
+temporary directory.
+
+Usage:
+    python benchmarks/loading.py [image.jpg ...] [--sizes 604x740,250x250,2480x3508] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from src.utils.image_utils import ImageUtils  # noqa: E402
+
+
+def synthetic_photo(path: str, width: int = 6000, height: int = 4000):
+    """Write a JPEG with smooth gradients, fine grain and hard edges."""
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    image = np.stack([127 + 80 * np.sin(xx / 230) * np.cos(yy / 170),
+                      127 + 80 * np.sin((xx + yy) / 400),
+                      127 + 60 * np.cos(xx / 90 + yy / 310)], axis=-1)
+    image += cv2.GaussianBlur(rng.normal(0, 40, (height, width, 3)).astype(np.float32),
+                              (0, 0), 1.2)
+    cv2.circle(image, (width // 2, height // 2), height // 3, (20, 200, 40), 25)
+    cv2.imwrite(path, np.clip(image, 0, 255).astype(np.uint8), [cv2.IMWRITE_JPEG_QUALITY, 92])
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--sizes", default="604x740,250x250,2480x3508")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sizes = [tuple(int(v) for v in size.split("x")) for size in args.sizes.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        images = args.images
+        if not images:
+            images = [str(Path(tmp) / "photo_24mp.jpg")]
+            synthetic_photo(images[0])
+
+        print(f"{'source':>24} {'target':>10} {'factor':>6} {'full ms':>8} "
+              f"{'reduced ms':>10} {'speedup':>8} {'PSNR full':>9} {'PSNR reduced':>12}")
+        for path in images:
+            for width, height in sizes:
+                factor = ImageUtils.reduced_decode_factor(path, width, height)
+                full_ms, full = best_of(
+                    lambda: ImageUtils.decode_background(path, width, height, reduce=False),
+                    args.repeat)
+                reduced_ms, reduced = best_of(
+                    lambda: ImageUtils.decode_background(path, width, height), args.repeat)
+                reference = ImageUtils.ensure_bgra(cv2.resize(
+                    ImageUtils.ensure_bgra(cv2.imread(path, cv2.IMREAD_UNCHANGED)),
+                    (width, height), interpolation=cv2.INTER_AREA))
+                print(f"{Path(path).name[-24:]:>24} {width:>4}x{height:<5} {factor:>6} "
+                      f"{full_ms:>8.1f} {reduced_ms:>10.1f} {full_ms / reduced_ms:>7.1f}x "
+                      f"{cv2.PSNR(full[:, :, :3], reference[:, :, :3]):>9.1f} "
+                      f"{cv2.PSNR(reduced[:, :, :3], reference[:, :, :3]):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
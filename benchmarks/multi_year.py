@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Multi-year rendering against N single-year runs.
+================================================
+Renders a range of years once as independent one-shot years (create_month
+for every month, one-shot cache budget) and once through
+CalendarGenerator.iter_years, which composites each repeating month grid
+once and only stamps titles on the other years. Encoding is left out;
+the last year's pages are checked to be identical.
+
+Usage:
+    python benchmarks/multi_year.py [settings.json] [--years 2026-2035]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.calendar_generator import (  # noqa: E402
+    RENDER_ONCE_CACHE_BYTES, RENDER_YEARS_CACHE_BYTES, CalendarGenerator, parse_years,
+)
+from src.utils.cache_registry import get_cache_registry  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", nargs="?", default="settings.json")
+    parser.add_argument("--years", type=parse_years, default=parse_years("2026-2035"))
+    args = parser.parse_args()
+    years = args.years
+
+    registry = get_cache_registry()
+    registry.set_budget(RENDER_ONCE_CACHE_BYTES)
+    start = time.perf_counter()
+    for year in years:
+        # Each year as its own run: fresh generator and cold caches
+        registry.clear()
+        generator = CalendarGenerator(args.config)
+        last_single = [generator.create_month(year, month) for month in range(1, 13)]
+    single_s = time.perf_counter() - start
+
+    registry.clear()
+    registry.set_budget(RENDER_YEARS_CACHE_BYTES)
+    start = time.perf_counter()
+    generator = CalendarGenerator(args.config)
+    grids = 0
+    last_multi = {}
+    for year, month, page in generator.iter_years(years):
+        grids += 'grid' in generator.month_renderer.rasterized
+        if year == years[-1]:
+            last_multi[month] = page
+    multi_s = time.perf_counter() - start
+
+    same = all((last_single[m - 1] == last_multi[m]).all() for m in range(1, 13))
+    pages = 12 * len(years)
+    print(f"{len(years)} years ({years[0]}-{years[-1]}), {pages} pages, "
+          f"{grids} grids composited")
+    print(f"{'run':>12} {'s':>8} {'ms/page':>8}")
+    print(f"{'N x 1 year':>12} {single_s:>8.2f} {single_s * 1000 / pages:>8.1f}")
+    print(f"{'multi-year':>12} {multi_s:>8.2f} {multi_s * 1000 / pages:>8.1f}")
+    print(f"multi-year {single_s / multi_s:.1f}x faster; last year identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Vector PDF export against the raster print path.
+================================================
+The raster path renders every month, encodes it as PNG and wraps the
+pages in a PDF (Pillow); the vector path writes the months straight from
+the layout with src/pdf_export.py. Reports the time and file size of
+each and how many distinct images the vector file embeds for how many
+placements.
+
+Usage:
+    python benchmarks/pdf_export.py [settings.json] [--year 2026] [--months 1,6,12] [--repeat 3]
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image  # noqa: E402
+
+from src.calendar_generator import CalendarGenerator  # noqa: E402
+from src.pdf_export import PDF_DPI, export_pdf  # noqa: E402
+from src.utils.png_encoder import DEFAULT_PROFILE, encode_png  # noqa: E402
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def raster_pdf(generator: CalendarGenerator, year: int, months: list[int], path: str) -> int:
+    """Render, PNG-encode and wrap pages in a PDF; returns the file size."""
+    pages = []
+    for month in months:
+        data = encode_png(generator.create_month(year, month), DEFAULT_PROFILE)
+        pages.append(Image.open(io.BytesIO(data)).convert('RGB'))
+    pages[0].save(path, save_all=True, append_images=pages[1:], resolution=PDF_DPI)
+    return Path(path).stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", nargs="?", default="settings.json")
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--months", default="1,6,12")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    generator = CalendarGenerator(args.config)
+    months = [int(m) for m in args.months.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raster_ms, raster_size = best_of(
+            lambda: raster_pdf(generator, args.year, months, str(Path(tmp) / "raster.pdf")),
+            args.repeat)
+        vector_ms, stats = best_of(
+            lambda: export_pdf(generator, args.year, str(Path(tmp) / "vector.pdf"), months),
+            args.repeat)
+
+    print(f"{'path':>7} {'pages':>5} {'ms':>9} {'KB':>8} {'images':>7} {'placements':>10}")
+    print(f"{'raster':>7} {len(months):>5} {raster_ms:>9.1f} {raster_size / 1024:>8.0f} "
+          f"{len(months):>7} {len(months):>10}")
+    print(f"{'vector':>7} {stats['pages']:>5} {vector_ms:>9.1f} {stats['bytes'] / 1024:>8.0f} "
+          f"{stats['images']:>7} {stats['image_draws']:>10}")
+    print(f"vector export {raster_ms / vector_ms:.1f}x faster, "
+          f"{raster_size / stats['bytes']:.1f}x smaller; {stats['text_ops']} text runs "
+          f"as embedded-font text ({stats['raster_text_ops']} rasterized)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Year rendering with and without concurrent background prefetch.
+===============================================================
+Renders a year cold (in-memory caches cleared, persistent asset cache
+off) twice: decoding each background when the renderer first needs it,
+and with an AssetPrefetcher decoding all of them on a thread pool ahead
+of the renderer. Each run is traced; the report shows wall time, decode
+time, how much decoding overlapped compositing and how long the renderer
+waited for a decode. Pages are checked to be identical. --timeline prints
+the prefetch run's per-thread timeline.
+
+Usage:
+    python benchmarks/prefetch.py [settings.json] [--year 2026] [--repeat 3] [--timeline]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Every run decodes from the source files
+os.environ['CALENDAR_MAKER_ASSET_CACHE'] = '0'
+
+from src.calendar_generator import RENDER_ONCE_CACHE_BYTES, CalendarGenerator  # noqa: E402
+from src.utils.cache_registry import get_cache_registry  # noqa: E402
+from src.utils.trace import Trace  # noqa: E402
+
+
+def render(config: str, year: int, prefetch: bool) -> tuple[float, Trace, list]:
+    """Cold single-process render of a year; (seconds, trace, pages)."""
+    get_cache_registry().clear()
+    with contextlib.redirect_stdout(None):
+        generator = CalendarGenerator(config)
+    trace = Trace()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(None):
+        pages = generator.create_year(year, trace=trace, prefetch=prefetch)
+    return time.perf_counter() - start, trace, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", nargs="?", default="settings.json")
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeline", action="store_true")
+    args = parser.parse_args()
+
+    get_cache_registry().set_budget(RENDER_ONCE_CACHE_BYTES)
+    print(f"{'run':>11} {'s':>7} {'decode s':>9} {'overlap s':>10} {'wait s':>7}")
+    results = {}
+    for name, prefetch in (("on demand", False), ("prefetch", True)):
+        best = min((render(args.config, args.year, prefetch) for _ in range(args.repeat)),
+                   key=lambda run: run[0])
+        results[name] = best
+        seconds, trace, _ = best
+        if not prefetch:
+            # Decodes run inside the renderer's compute and are not traced apart
+            print(f"{name:>11} {seconds:>7.2f} {'-':>9} {'-':>10} {'-':>7}")
+            continue
+        summary = trace.summary()
+        print(f"{name:>11} {seconds:>7.2f} {summary['io']:>9.2f} "
+              f"{summary['overlap']:>10.2f} {summary['wait']:>7.2f}")
+
+    on_demand, prefetched = results["on demand"], results["prefetch"]
+    same = all((a == b).all() for a, b in zip(on_demand[2], prefetched[2]))
+    print(f"prefetch {on_demand[0] / prefetched[0]:.2f}x faster; pages identical: {same}")
+    if args.timeline:
+        print(prefetched[1].format_timeline())
+
+
+if __name__ == "__main__":
+    main()
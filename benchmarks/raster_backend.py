@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Raster backends compared per operation.
+=======================================
+Times every raster operation (decode, resize, composite, draw_text,
+encode) on each backend with workloads taken from a config: its
+background files at their cell sizes, a month of day cells onto the page
+plus translucent tiles onto a translucent cell (as day cells are built),
+day numbers with outlines, and a rendered page encoded with the draft
+profile. Reports the largest pixel difference from the default backend
+of each operation and picks the fastest backend whose output stays
+within --tolerance of it; --save stores that choice for
+get_raster_backend (CALENDAR_MAKER_RASTER_BACKEND still overrides it).
+
+Usage:
+    python benchmarks/raster_backend.py [settings.json] [--year 2026] [--month 1] [--repeat 3]
+                                        [--tolerance 2] [--save]
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from compositing import month_placements  # noqa: E402
+from src.calendar_generator import CalendarGenerator  # noqa: E402
+from src.preflight import collect_assets  # noqa: E402
+from src.utils.image_utils import ImageUtils  # noqa: E402
+from src.utils.png_encoder import DEFAULT_PROFILE, get_encoder_profile  # noqa: E402
+from src.utils.raster_backend import (  # noqa: E402
+    BACKENDS, DEFAULT_SELECTION, RASTER_OPERATIONS, format_selection, save_selection,
+)
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def max_diff(a, b) -> int:
+    """Largest per-channel difference of two image lists (-1 if shapes differ)."""
+    if any(x.shape != y.shape for x, y in zip(a, b)):
+        return -1
+    return max((int(np.abs(x.astype(np.int16) - y).max()) for x, y in zip(a, b)), default=0)
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """Encoded PNG back to pixels, to check encoders are lossless."""
+    return np.asarray(Image.open(io.BytesIO(data)).convert('RGBA'))
+
+
+def workloads(generator: CalendarGenerator, year: int, month: int) -> dict:
+    """Operation -> function(backend) returning a list of result images."""
+    config = generator.config
+    images = {}
+    for ref in collect_assets(config, generator.month_renderer):
+        if ref['kind'] == 'image' and Path(ref['path']).exists():
+            images.setdefault(ref['path'], ref['size'])
+    decoded = {path: BACKENDS['cv2'].decode(path) for path in images}
+    decoded = {path: image for path, image in decoded.items() if image is not None}
+
+    page, placements = month_placements(generator, year, month)
+
+    # Day cells are composited onto transparent or translucent canvases too
+    rng = np.random.default_rng(0)
+    geometry = generator.month_renderer.get_month_geometry(month, config)
+    cell_h, cell_w = geometry['day_height'], geometry['day_width']
+    cell = rng.integers(0, 256, (cell_h, cell_w, 4), dtype=np.uint8)
+    cell[..., 3] = np.linspace(0, 255, cell_w, dtype=np.uint8)
+    overlay = rng.integers(0, 256, (cell_h, cell_w, 4), dtype=np.uint8)
+    overlay[..., 3] = np.linspace(0, 255, cell_h, dtype=np.uint8)[:, None]
+
+    font = generator.font_manager.get_font(geometry['day_height'] // 3)
+    tile = ImageUtils.create_white_image(geometry['day_width'], geometry['day_height'])
+    text_runs = [ImageUtils._text_runs(str(day), 20, 20, (200, 30, 30), font, True)
+                 for day in range(1, 32)]
+
+    rendered = generator.create_month(year, month)
+    settings = get_encoder_profile(DEFAULT_PROFILE)
+
+    return {
+        'decode': lambda b: [b.decode(path) for path in decoded],
+        'resize': lambda b: [b.resize(image, *images[path]) for path, image in decoded.items()],
+        'composite': lambda b: [b.composite(page, placements),
+                                b.composite(cell, [(overlay, 0, 0)])],
+        'draw_text': lambda b: [b.draw_text(tile, runs) for runs in text_runs],
+        'encode': lambda b: [decode_png(b.encode(rendered, settings))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", nargs="?", default="settings.json")
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--month", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=int, default=2,
+                        help="largest pixel difference from the default backend a "
+                             "selected backend may produce")
+    parser.add_argument("--save", action="store_true",
+                        help="store the fastest backend per operation as the default")
+    args = parser.parse_args()
+
+    generator = CalendarGenerator(args.config)
+    jobs = workloads(generator, args.year, args.month)
+
+    print(f"{'operation':>10} " + " ".join(f"{name + ' ms':>10}" for name in BACKENDS)
+          + f" {'max diff':>9} {'selected':>8}")
+    selection = dict(DEFAULT_SELECTION)
+    timings = {}
+    for op in RASTER_OPERATIONS:
+        results = {name: best_of(lambda: jobs[op](backend), args.repeat)
+                   for name, backend in BACKENDS.items()}
+        timings[op] = {name: round(ms, 2) for name, (ms, _) in results.items()}
+        reference = results[DEFAULT_SELECTION[op]][1]
+        diffs = {name: max_diff(reference, images) for name, (_, images) in results.items()}
+        # A faster backend only counts if renders stay (nearly) unchanged
+        matching = [name for name, diff in diffs.items() if 0 <= diff <= args.tolerance]
+        selection[op] = min(matching, key=lambda name: results[name][0])
+        fastest = min(results, key=lambda name: results[name][0])
+        note = f" ({fastest} differs)" if fastest != selection[op] else ""
+        print(f"{op:>10} " + " ".join(f"{ms:>10.1f}" for ms, _ in results.values())
+              + f" {max(diffs.values(), key=abs):>9} {selection[op]:>8}{note}")
+
+    total = {name: sum(t[name] for t in timings.values()) for name in BACKENDS}
+    best = sum(timings[op][selection[op]] for op in RASTER_OPERATIONS)
+    print("total: " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in total.items())
+          + f", selected per operation {best:.1f} ms")
+    print(f"selection: {format_selection(selection)}")
+    if args.save:
+        save_selection(selection, timings)
+        print("saved as the default raster backend selection")
+
+
+if __name__ == "__main__":
+    main()
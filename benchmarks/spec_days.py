@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Spec day images: file round trip against in-memory handoff.
+===========================================================
+The file workflow generates every spec day at the generator canvas size,
+writes spec_DD_MM.png files, and the day renderer decodes and resizes each
+one to its cell. The in-memory workflow draws each image at cell size and
+passes the arrays straight to the renderer. Times both up to the arrays
+the cells are composited from (background caches bypassed).
+
+Usage:
+    python benchmarks/spec_days.py [settings.json] [--canvas 800x600] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.calendar_generator import CalendarGenerator  # noqa: E402
+from src.features.spec_days_generator.generator import (  # noqa: E402
+    generate_all_spec_days, render_spec_day_images,
+)
+from src.utils.image_utils import ImageUtils  # noqa: E402
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("config", nargs="?", default="settings.json")
+    parser.add_argument("--canvas", default="800x600")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    generator = CalendarGenerator(args.config)
+    config = generator.config
+    width, height = (int(v) for v in args.canvas.split("x"))
+    settings = config.get("spec_days_generator") or {
+        "date": {"x": width // 2, "y": height // 8, "font_size": height // 5,
+                 "h_align": "center", "v_align": "top"},
+        "desc": {"x": width // 2, "y": height * 2 // 3, "font_size": height // 10},
+        "canvas": {"width": width, "height": height,
+                   "background": config.get("spec_day", {}).get("background", "")},
+    }
+    spec_days = config.get("spec_days", [])
+    sizes = {}
+    for date, info in generator.spec_days.items():
+        style = info.get("style") or config["spec_day"]
+        sizes[date] = (style["width"], style["height"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def round_trip():
+            paths = generate_all_spec_days(spec_days, settings["date"], settings["desc"],
+                                           settings["canvas"], tmp)
+            return [ImageUtils.decode_background(path, *sizes[s["date"]])
+                    for path, s in zip(paths, spec_days)]
+
+        def in_memory():
+            return render_spec_day_images(spec_days, settings["date"], settings["desc"],
+                                          settings["canvas"], sizes)
+
+        file_ms, _ = best_of(round_trip, args.repeat)
+        memory_ms, images = best_of(in_memory, args.repeat)
+
+    print(f"{len(images)} spec days, canvas {settings['canvas'].get('width')}x"
+          f"{settings['canvas'].get('height')}")
+    print(f"{'workflow':>10} {'ms':>9} {'ms/day':>8}")
+    print(f"{'files':>10} {file_ms:>9.1f} {file_ms / max(1, len(images)):>8.1f}")
+    print(f"{'in-memory':>10} {memory_ms:>9.1f} {memory_ms / max(1, len(images)):>8.1f}")
+    print(f"in-memory handoff {file_ms / memory_ms:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
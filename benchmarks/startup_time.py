@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Startup time budget for the CLI and UI entry points.
+=====================================================
+Runs each entry point in a fresh interpreter with `python -X importtime`,
+reports wall time, cumulative import time and the heaviest imports, and
+exits with a non-zero status if a budget is exceeded.
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --cli-budget 150 --ui-budget 1500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just to print `cli.py --help`
+HEAVY_MODULES = ("cv2", "numpy", "PIL", "PySide6")
+
+# Builds and shows the main window exactly like ui.py, then exits
+UI_FIRST_WINDOW = """
+import sys
+from PySide6.QtWidgets import QApplication
+from src.ui_components import MainWindow, STYLESHEET, load_default_config
+app = QApplication(sys.argv)
+app.setStyleSheet(STYLESHEET)
+win = MainWindow(load_default_config())
+win.show()
+app.processEvents()
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Captured stderr of the child interpreter
+
+    Returns:
+        List of (module, self_us, cumulative_us) for top-level imports
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented; only top-level ones add up to the total
+        if name.startswith(" ") and not name.startswith("  "):
+            entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def run_entry(name: str, args: list[str], budget_ms: float, env: dict) -> bool:
+    """
+    Measure one entry point against its budget.
+
+    Args:
+        name: Label for the report
+        args: Arguments passed to the interpreter after `-X importtime`
+        budget_ms: Wall time budget in milliseconds
+        env: Environment for the child process
+
+    Returns:
+        True if the entry point stayed within budget
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if proc.returncode != 0:
+        print(f"{name}: FAILED (exit code {proc.returncode})")
+        print(proc.stderr.splitlines()[-1] if proc.stderr else "")
+        return False
+
+    entries = parse_importtime(proc.stderr)
+    import_ms = sum(e[2] for e in entries) / 1000
+    loaded = {e[0].split(".")[0] for e in entries}
+
+    ok = wall_ms <= budget_ms
+    print(f"{name}: {wall_ms:.0f} ms wall, {import_ms:.0f} ms imports "
+          f"(budget {budget_ms:.0f} ms) {'OK' if ok else 'OVER BUDGET'}")
+    for module, _, cumulative_us in sorted(entries, key=lambda e: -e[2])[:8]:
+        print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    if heavy:
+        print(f"    heavy modules imported: {', '.join(heavy)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cli-budget", type=float, default=150,
+                        help="Budget for `cli.py --help` in ms (default: 150)")
+    parser.add_argument("--ui-budget", type=float, default=1500,
+                        help="Budget for ui.py time-to-first-window in ms (default: 1500)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    results = [run_entry("cli.py --help", ["cli.py", "--help"], args.cli_budget, env)]
+    try:
+        import PySide6  # noqa: F401
+    except ImportError:
+        print("ui.py first window: skipped (PySide6 not installed)")
+    else:
+        results.append(run_entry("ui.py first window", ["-c", UI_FIRST_WINDOW],
+                                 args.ui_budget, env))
+
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
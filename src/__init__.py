@@ -1,6 +1,12 @@
 """Calendar Maker - A tool for creating custom calendars."""
 
-from src.calendar_generator import CalendarGenerator
-
 __all__ = ['CalendarGenerator']
 __version__ = '0.1.0'
+
+
+def __getattr__(name: str):
+    # Resolve the generator on first use so `import src` stays cheap
+    if name == 'CalendarGenerator':
+        from src.calendar_generator import CalendarGenerator
+        return CalendarGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
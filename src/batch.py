@@ -0,0 +1,272 @@
+"""Personalized batch mode: one base calendar, many recipients with their own special days."""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+from src.calendar_generator import CalendarGenerator
+from src.config_loader import deep_merge, normalize_config
+from src.day_renderer import DayRenderer
+from src.month_renderer import CELL_GEOMETRY, MonthRenderer
+from src.utils.date_utils import DateUtils
+from src.utils.png_encoder import DEFAULT_PROFILE
+
+ALL_MONTHS = frozenset(range(1, 13))
+
+# Config sections drawn only in the page layers (background, title, weekday header)
+PAGE_SECTIONS = ('month', 'months', 'day_of_the_week')
+
+BASE_DIR_NAME = '_base'
+
+
+def load_recipients(path: str) -> list[dict]:
+    """
+    Load a recipients file.
+
+    The file is either a list of recipients or {"recipients": [...]}. Each
+    recipient has an 'id' (its output folder), 'spec_days' entries in the
+    flat settings.json format and optionally 'config', a partial config
+    merged over the base (e.g. month title colors).
+
+    Args:
+        path: Path to JSON file
+
+    Returns:
+        List of recipient dicts
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    recipients = data.get('recipients', []) if isinstance(data, dict) else data
+    for i, recipient in enumerate(recipients):
+        if not recipient.get('id'):
+            raise ValueError(f"Recipient #{i + 1} in {path} has no 'id'")
+    return recipients
+
+
+def merge_spec_days(base: list[dict], overrides: list[dict]) -> list[dict]:
+    """
+    Merge recipient special days into the base list by date.
+
+    An override replaces the base entry with the same date, new dates are
+    appended and {"date": ..., "remove": true} drops a base date.
+
+    Args:
+        base: Base spec_days entries
+        overrides: Recipient spec_days entries
+
+    Returns:
+        Merged spec_days entries
+    """
+    merged = {entry['date']: entry for entry in base}
+    for entry in overrides:
+        if entry.get('remove'):
+            merged.pop(entry['date'], None)
+        else:
+            merged[entry['date']] = entry
+    return list(merged.values())
+
+
+def _output_dir_name(recipient_id: str) -> str:
+    """Recipient id made safe for use as a folder name."""
+    return re.sub(r'[^\w.-]+', '_', str(recipient_id)).strip('.') or '_'
+
+
+def _link_or_copy(source: str, target: str):
+    """Hard-link an unchanged page into a recipient folder, copying if links fail."""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+class PersonalizedBatch:
+    """
+    Renders one calendar for many recipients, redrawing only what differs.
+
+    Every month is rendered once from the base config and kept together with
+    the page under its cells. For each recipient only the cells whose special
+    day differs from the base are redrawn and composited onto a copy; months
+    without changes are hard-linked to the base output instead of being
+    encoded again. A recipient's 'config' that changes only page layers
+    (e.g. a title color) keeps the base's cells and re-renders just those
+    layers (see MonthRenderer.month_layers); months whose cell styles or
+    cell geometry it changes are rendered in full. Work is done month by
+    month, so only one month's base is held in memory.
+    """
+
+    def __init__(self, base_config: dict, year: int, output_dir: str = 'output',
+                 profile: str = DEFAULT_PROFILE):
+        """
+        Initialize personalized batch.
+
+        Args:
+            base_config: Base configuration as loaded from JSON (flat or structured)
+            year: Year to render
+            output_dir: Output root (base pages go to <output_dir>/_base,
+                recipients to <output_dir>/<id>)
+            profile: Encoder profile for every written page
+        """
+        self.base_config = base_config
+        self.year = year
+        self.output_dir = output_dir
+        self.profile = profile
+        self.generator = CalendarGenerator(config=base_config)
+
+    def _prepare(self, recipient: dict) -> dict:
+        """Resolve a recipient's config, special days and changed dates/months."""
+        generator = self.generator
+        raw = copy.deepcopy(self.base_config)
+        if recipient.get('config'):
+            raw = deep_merge(raw, recipient['config'])
+        raw['spec_days'] = merge_spec_days(raw.get('spec_days', []),
+                                           recipient.get('spec_days', []))
+        config = normalize_config(raw)
+        spec_days = generator._parse_spec_days(config)
+
+        # Compare what applies in this year ("DD.MM.YYYY" entries of other years drop out)
+        base_spec = DateUtils.spec_days_for_year(generator.spec_days, self.year)
+        year_spec = DateUtils.spec_days_for_year(spec_days, self.year)
+        changed_dates = {date for date in set(base_spec) | set(year_spec)
+                         if base_spec.get(date) != year_spec.get(date)}
+        days_by_month: dict[int, list[int]] = {}
+        for date in changed_dates:
+            day, month = DateUtils.parse_spec_day_date(date)
+            days_by_month.setdefault(month, []).append(day)
+
+        # Saved spec day images are the base calendar's; recipients stay in memory
+        spec_day_images = generator.generate_spec_day_images(config, spec_days, persist=False)
+        full_months, restyled_months = set(), set()
+        month_renderer = generator.month_renderer
+        if recipient.get('config'):
+            month_renderer = MonthRenderer(generator.font_manager, spec_days,
+                                           config.get('months', []))
+            month_renderer.day_renderer.spec_day_images = spec_day_images
+            full_months, restyled_months = self._layout_changes(config, month_renderer)
+
+        return {
+            'id': recipient['id'],
+            'dir': str(Path(self.output_dir) / _output_dir_name(recipient['id'])),
+            'config': config,
+            'day_renderer': DayRenderer(generator.font_manager, year_spec,
+                                        DateUtils.spec_days_for_year(spec_day_images, self.year)),
+            'month_renderer': month_renderer,
+            'days_by_month': {m: sorted(days) for m, days in days_by_month.items()},
+            'full_months': full_months,
+            'restyled_months': restyled_months,
+        }
+
+    def _layout_changes(self, config: dict,
+                        month_renderer: MonthRenderer) -> tuple[set[int], set[int]]:
+        """
+        Months whose rendering differs beyond special days.
+
+        Returns:
+            (months to render in full, months whose page layers differ but
+            whose day cells are the base's)
+        """
+        base = self.generator.config
+        shared = (set(base) | set(config)) - {'spec_days', *PAGE_SECTIONS}
+        if any(base.get(key) != config.get(key) for key in shared):
+            # Cell styles or spec day images differ
+            return set(ALL_MONTHS), set()
+        base_renderer = self.generator.month_renderer
+        header_changed = base['day_of_the_week'] != config['day_of_the_week']
+        full, restyled = set(), set()
+        for month in ALL_MONTHS:
+            base_geometry = base_renderer.get_month_geometry(month, base)
+            geometry = month_renderer.get_month_geometry(month, config)
+            if any(base_geometry[name] != geometry[name] for name in CELL_GEOMETRY):
+                full.add(month)
+            elif header_changed or base_geometry['month_cfg'] != geometry['month_cfg']:
+                restyled.add(month)
+        return full, restyled
+
+    def run(self, recipients: list[dict], months: list[int] | None = None) -> dict:
+        """
+        Render the base calendar and every recipient's copy.
+
+        Args:
+            recipients: load_recipients result
+            months: Month numbers (all twelve if None)
+
+        Returns:
+            Dict with 'recipients', 'cells_redrawn', 'pages_rendered',
+            'pages_linked', 'files' and 'seconds'
+        """
+        start = time.perf_counter()
+        generator = self.generator
+        months = months or list(range(1, 13))
+        prepared = [self._prepare(r) for r in recipients]
+        base_dir = str(Path(self.output_dir) / BASE_DIR_NAME)
+        Path(self.output_dir).mkdir(exist_ok=True)
+        for job in prepared:
+            Path(job['dir']).mkdir(exist_ok=True)
+
+        stats = {'recipients': len(prepared), 'cells_redrawn': 0,
+                 'pages_rendered': 0, 'pages_linked': 0, 'files': []}
+        for month in months:
+            base = generator.month_renderer.create_month_base(self.year, month, generator.config)
+            base_file = generator.save_month(base['page'], self.year, month, base_dir,
+                                             self.profile)
+            stats['files'].append(base_file)
+
+            for job in prepared:
+                days = job['days_by_month'].get(month, [])
+                if month in job['full_months']:
+                    page = job['month_renderer'].create_month(self.year, month, job['config'])
+                elif month in job['restyled_months']:
+                    # The base's cells under the recipient's page layers
+                    restyled = job['month_renderer'].create_month_base(
+                        self.year, month, job['config'], base['cells_layer'])
+                    page = restyled['page']
+                    if days:
+                        page = job['month_renderer'].recomposite_days(
+                            restyled, month, days, job['config'], job['day_renderer'])
+                        stats['cells_redrawn'] += len(days)
+                elif days:
+                    page = generator.month_renderer.recomposite_days(
+                        base, month, days, job['config'], job['day_renderer']
+                    )
+                    stats['cells_redrawn'] += len(days)
+                else:
+                    target = str(Path(job['dir']) / Path(base_file).name)
+                    _link_or_copy(base_file, target)
+                    stats['pages_linked'] += 1
+                    stats['files'].append(target)
+                    continue
+                stats['files'].append(generator.save_month(page, self.year, month, job['dir'],
+                                                        self.profile))
+                stats['pages_rendered'] += 1
+            print(f"Month {month}/12 done for {len(prepared)} recipients")
+
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+
+def run_batch(config_path: str, recipients_path: str, year: int,
+              output_dir: str = 'output', profile: str = DEFAULT_PROFILE) -> dict:
+    """
+    Run a personalized batch from files.
+
+    Args:
+        config_path: Base configuration file
+        recipients_path: Recipients file (see load_recipients)
+        year: Year to render
+        output_dir: Output root
+        profile: Encoder profile for every written page
+
+    Returns:
+        PersonalizedBatch.run statistics
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        base_config = json.load(f)
+    recipients = load_recipients(recipients_path)
+    return PersonalizedBatch(base_config, year, output_dir, profile).run(recipients)
@@ -1,25 +1,65 @@
 """Main calendar generator module."""
 
-import json
-import cv2
-import numpy as np
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json as json_module
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from src.utils.lazy_import import lazy_import
+from src.config_loader import load_config, normalize_config
 from src.utils.font_manager import FontManager
+from src.utils.image_utils import ImageUtils
+from src.utils.cache_registry import format_cache_stats, get_cache_registry
+from src.utils.date_utils import DateUtils
+from src.utils.png_encoder import DEFAULT_PROFILE, ENCODER_PROFILES, write_png
+from src.utils.prefetch import AssetPrefetcher, prefetch_budget
+from src.utils.shared_assets import SharedAssetStore, attach_shared_store
+from src.utils.text_layout import get_text_layout
+from src.utils.trace import Trace, trace_span
 from src.month_renderer import MonthRenderer
+from src.preflight import collect_assets, run_preflight, format_preflight_report
+from src.render_plan import build_render_plan, format_render_plan
+from src.thumbnails import thumbnails_from_arrays
+
+np = lazy_import('numpy')
+
+# A single pass over the year never revisits page backgrounds or cell grids;
+# this budget still holds what repeats across cells and months (fonts, text
+# metrics, cell backgrounds, the weekday header strip)
+RENDER_ONCE_CACHE_BYTES = 8 * 1024 * 1024
+
+# Multi-year runs revisit each month's page layers and finished grids; this
+# holds one month's page layers and the grid of the pattern being rendered
+RENDER_YEARS_CACHE_BYTES = 128 * 1024 * 1024
 
 
 class CalendarGenerator:
     """Calendar generator based on JSON configuration."""
 
-    def __init__(self, config_path: str = 'settings.json'):
+    def __init__(self, config_path: str = 'settings.json', config: dict | None = None,
+                 spec_day_images: dict | None = None):
         """
         Initialize calendar generator.
 
         Args:
             config_path: Path to JSON configuration file
+            config: Already loaded configuration dict (overrides config_path)
+            spec_day_images: Spec day images already rendered in memory ("DD.MM"
+                -> BGRA array); by default they are generated here when the
+                config has a spec_days_generator section
+
+        Both the flat settings.json format and the structured
+        canvas/layout/defaults schema are accepted; the latter is compiled
+        to flat styles once here.
         """
-        self.config = self._load_config(config_path)
+        self.config = (normalize_config(config) if config is not None
+                       else self._load_config(config_path))
 
         self.spec_days = self._parse_spec_days()
 
@@ -38,24 +78,95 @@ class CalendarGenerator:
             self.spec_days, 
             self.months_config
         )
+        self.month_renderer.day_renderer.spec_day_images = (
+            self.generate_spec_day_images() if spec_day_images is None else spec_day_images
+        )
+
+    def set_config(self, config: dict):
+        """
+        Switch to a new configuration, keeping fonts and render caches warm.
+
+        Args:
+            config: Configuration dict (flat or structured)
+        """
+        self.config = normalize_config(config)
+        self.spec_days = self._parse_spec_days()
+        self.months_config = self.config.get('months', [])
+
+        default_font = self.config.get('regular_day', {}).get(
+            'text_font', 'C:/Windows/Fonts/arial.ttf'
+        )
+        if default_font != self.font_manager.default_font:
+            self.font_manager.default_font = default_font
+            self.font_manager.reload()
+
+        self.month_renderer.spec_days = self.spec_days
+        self.month_renderer.months_config = self.months_config
+        self.month_renderer.day_renderer.spec_days = self.spec_days
+        self.month_renderer.day_renderer.spec_day_images = self.generate_spec_day_images()
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from JSON file."""
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_config(config_path)
 
-    def _parse_spec_days(self) -> dict:
-        """Parse special days into {month.day: description} dict."""
+    def _parse_spec_days(self, config: dict | None = None) -> dict:
+        """Parse special days (of config, default self.config) into {month.day: description} dict."""
+        config = self.config if config is None else config
         spec_days_dict = {}
-        for spec_day in self.config.get('spec_days', []):
+        for spec_day in config.get('spec_days', []):
             date = spec_day['date']  # format "DD.MM"
             spec_days_dict[date] = {
                 'desc': spec_day.get('desc', ''),
                 'name': spec_day.get('name', ''),
                 'background': spec_day.get('background', '')
             }
+            if 'style' in spec_day:
+                spec_days_dict[date]['style'] = spec_day['style']
         return spec_days_dict
 
+    def generate_spec_day_images(self, config: dict | None = None,
+                                 spec_days: dict | None = None, persist: bool = True) -> dict:
+        """
+        Render spec day images in memory with the spec days generator.
+
+        Each image is drawn at the size of the cell it fills, so the day
+        renderer uses it without a PNG round trip or a second resample.
+        Settings come from the config's spec_days_generator section: 'date',
+        'desc' and 'canvas' as in the generator window, and an optional
+        'save_dir' to also write the images there as spec_DD_MM.png.
+
+        Args:
+            config: Configuration dict (default: self.config)
+            spec_days: Parsed special days (default: self.spec_days)
+            persist: Write to the section's save_dir, if it names one
+
+        Returns:
+            Dict of "DD.MM" -> BGRA image array (empty without the section)
+        """
+        config = self.config if config is None else config
+        spec_days = self.spec_days if spec_days is None else spec_days
+        settings = config.get('spec_days_generator')
+        if not settings:
+            return {}
+
+        from src.features.spec_days_generator.generator import render_spec_day_images
+        sizes = {}
+        for date, info in spec_days.items():
+            style = info.get('style') or config['spec_day']
+            sizes[date] = (style['width'], style['height'])
+        return render_spec_day_images(
+            config.get('spec_days', []), settings.get('date', {}), settings.get('desc', {}),
+            settings.get('canvas', {}), sizes, settings.get('save_dir') if persist else None)
+
+    def preflight(self) -> list[dict]:
+        """
+        Check all assets and fonts referenced by the config before rendering.
+
+        Returns:
+            List of issues (missing files, upscaling, aspect distortion, fonts)
+        """
+        return run_preflight(self.config, self.month_renderer)
+
     def create_month(self, year: int, month: int) -> np.ndarray:
         """
         Create calendar for a month.
@@ -69,25 +180,146 @@ class CalendarGenerator:
         """
         return self.month_renderer.create_month(year, month, self.config)
 
-    def create_year(self, year: int) -> list[np.ndarray]:
+    def _prefetcher(self, pages: list[tuple[int, int]], trace: Trace | None = None):
+        """
+        Prefetcher decoding the backgrounds of these pages ahead of rendering.
+
+        Args:
+            pages: (year, month) in render order
+            trace: Trace to record decodes and waits in (optional)
+
+        Returns:
+            AssetPrefetcher, or a no-op context when there is nothing to
+            prefetch or prefetching is disabled
+        """
+        if prefetch_budget() <= 0:
+            return contextlib.nullcontext()
+        assets = self.month_renderer.month_assets(pages, self.config)
+        if not assets:
+            return contextlib.nullcontext()
+        return AssetPrefetcher(assets, ImageUtils.load_background_uncached, trace=trace)
+
+    def create_year(self, year: int, workers: int = 1, trace: Trace | None = None,
+                    prefetch: bool = True) -> list[np.ndarray]:
         """
         Create calendar for entire year.
 
+        In this process, the backgrounds of all months are decoded and
+        resized on a thread pool ahead of the month being composited.
+
         Args:
             year: Year
+            workers: Number of worker processes (1 renders in this process)
+            trace: Trace to record months, decodes and waits in (optional)
+            prefetch: Decode backgrounds concurrently ahead of rendering
 
         Returns:
             List of month images
         """
+        if workers > 1:
+            return self._create_year_parallel(year, workers)
+
+        pages = [(year, month) for month in range(1, 13)]
         months = []
-        for month in range(1, 13):
-            print(f"Generating month {month}/12...")
-            month_img = self.create_month(year, month)
-            months.append(month_img)
+        with self._prefetcher(pages, trace) if prefetch else contextlib.nullcontext():
+            for month in range(1, 13):
+                print(f"Generating month {month}/12...")
+                with trace_span(trace, f"month {month}"):
+                    month_img = self.create_month(year, month)
+                months.append(month_img)
         return months
 
+    def iter_years(self, years: list[int], trace: Trace | None = None,
+                   prefetch: bool = True) -> Iterator[tuple[int, int, np.ndarray]]:
+        """
+        Render several years, reusing month grids that repeat between years.
+
+        A month's grid depends on the year only through its first weekday
+        and length, so months are rendered month by month with the years
+        sharing a pattern back to back: the grid is composited once per
+        pattern and every other year only stamps its title and redraws its
+        year-specific special days. Pages are yielded as they are done, so
+        callers can save them without holding the whole run in memory.
+
+        Args:
+            years: Years to render
+            trace: Trace to record pages, decodes and waits in (optional)
+            prefetch: Decode backgrounds concurrently ahead of rendering
+
+        Yields:
+            (year, month, BGRA image array) in month-major order
+        """
+        order = []
+        # Years of one pattern share the grid's backgrounds; prefetch them once
+        first_of_pattern = []
+        for month in range(1, 13):
+            patterns: dict[tuple[int, int], list[int]] = {}
+            for year in years:
+                pattern = (DateUtils.get_first_weekday(year, month),
+                           DateUtils.get_days_in_month(year, month))
+                patterns.setdefault(pattern, []).append(year)
+            for group in patterns.values():
+                order += [(year, month) for year in group]
+                first_of_pattern.append((group[0], month))
+
+        with self._prefetcher(first_of_pattern, trace) if prefetch else contextlib.nullcontext():
+            for year, month in order:
+                with trace_span(trace, f"{year}-{month:02d}"):
+                    page = self.create_month(year, month)
+                yield year, month, page
+
+    def save_years(self, years: list[int], output_dir: str = 'output',
+                   profile: str = DEFAULT_PROFILE, trace: Trace | None = None) -> dict:
+        """
+        Render and save several years (see iter_years).
+
+        Args:
+            years: Years to render
+            output_dir: Output directory
+            profile: Encoder profile ('draft', 'final' or 'web', see png_encoder)
+            trace: Trace to record rendering, saving, decodes and waits in (optional)
+
+        Returns:
+            Dict with 'files', 'pages', 'grids' (grids composited),
+            'cells' (cell layers rendered) and 'seconds'
+        """
+        start = time.perf_counter()
+        stats = {'files': [], 'pages': 0, 'grids': 0, 'cells': 0}
+        renderer = self.month_renderer
+        for year, month, month_img in self.iter_years(years, trace):
+            stats['grids'] += 'grid' in renderer.rasterized
+            stats['cells'] += 'cells' in renderer.rasterized
+            with trace_span(trace, f"save {year}-{month:02d}"):
+                stats['files'].append(self.save_month(month_img, year, month, output_dir, profile))
+            stats['pages'] += 1
+            if stats['pages'] % len(years) == 0:
+                print(f"Month {month}/12 done for {len(years)} years")
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+    def _create_year_parallel(self, year: int, workers: int) -> list[np.ndarray]:
+        """
+        Render months in a process pool sharing one copy of decoded assets.
+
+        Every background is decoded once here into a memory-mapped store;
+        workers map it read-only, so asset memory does not grow with the
+        number of workers.
+        """
+        with SharedAssetStore() as store:
+            store.populate(collect_assets(self.config, self.month_renderer),
+                           ImageUtils.load_background)
+            print(f"Shared assets: {len(store.entries)} images, "
+                  f"{store.nbytes() / 1024 / 1024:.1f} MB")
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.config, store.handle(),
+                          self.month_renderer.day_renderer.spec_day_images),
+            ) as pool:
+                return list(pool.map(_render_month_in_worker, [year] * 12, range(1, 13)))
+
     def save_month(self, month_img: np.ndarray, year: int, month: int,
-                   output_dir: str = 'output') -> str:
+                   output_dir: str = 'output', profile: str = DEFAULT_PROFILE) -> str:
         """
         Save month image.
 
@@ -96,17 +328,18 @@ class CalendarGenerator:
             year: Year
             month: Month
             output_dir: Output directory
+            profile: Encoder profile ('draft', 'final' or 'web', see png_encoder)
 
         Returns:
             Path to saved file
         """
         Path(output_dir).mkdir(exist_ok=True)
         filename = f"{output_dir}/calendar_{year}_{month:02d}.png"
-        cv2.imwrite(filename, month_img)
+        write_png(filename, month_img, profile)
         return filename
 
     def save_year(self, months: list[np.ndarray], year: int,
-                  output_dir: str = 'output') -> list[str]:
+                  output_dir: str = 'output', profile: str = DEFAULT_PROFILE) -> list[str]:
         """
         Save all months of the year.
 
@@ -114,39 +347,217 @@ class CalendarGenerator:
             months: List of month images
             year: Year
             output_dir: Output directory
+            profile: Encoder profile ('draft', 'final' or 'web', see png_encoder)
 
         Returns:
             List of paths to saved files
         """
         filenames = []
         for i, month_img in enumerate(months):
-            filename = self.save_month(month_img, year, i + 1, output_dir)
+            filename = self.save_month(month_img, year, i + 1, output_dir, profile)
             filenames.append(filename)
             print(f"Saved: {filename}")
         return filenames
 
 
-def main(json=None):
-    """Main function."""
-    # Initialize generator
-
-    generator = CalendarGenerator(json if json else 'settings.json')
+# Per-process generator for pool workers (set by _init_worker)
+_worker_generator: CalendarGenerator | None = None
+
+
+def _init_worker(config: dict, store_handle: dict, spec_day_images: dict):
+    """Process pool initializer: attach shared assets and build a generator."""
+    global _worker_generator
+    attach_shared_store(store_handle)
+    get_cache_registry().set_budget(RENDER_ONCE_CACHE_BYTES)
+    _worker_generator = CalendarGenerator(config=config, spec_day_images=spec_day_images)
+
+
+def _render_month_in_worker(year: int, month: int) -> np.ndarray:
+    """Render one month in a pool worker."""
+    print(f"Generating month {month}/12...")
+    return _worker_generator.create_month(year, month)
+
+
+def parse_years(text: str) -> list[int]:
+    """Parse a --years value: 'FIRST-LAST' or a single year."""
+    first, _, last = text.partition('-')
+    try:
+        years = list(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FIRST-LAST, got {text!r}") from None
+    if not years:
+        raise argparse.ArgumentTypeError(f"empty year range {text!r}")
+    return years
+
+
+def report_trace(trace: Trace | None, path: str | None):
+    """Print the timeline of a trace and write it to path in Chrome trace format."""
+    if trace is None:
+        return
+    print(trace.format_timeline())
+    trace.save_chrome(path)
+    print(f"Trace written to {path} (open in chrome://tracing or ui.perfetto.dev)")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build command line parser for the calendar generator."""
+    parser = argparse.ArgumentParser(
+        description='Generate calendar month images from a JSON configuration.'
+    )
+    parser.add_argument('config', nargs='?', default='settings.json',
+                        help='Path to JSON configuration file (default: settings.json)')
+    parser.add_argument('--year', type=int, default=2026,
+                        help='Year to generate (default: 2026)')
+    parser.add_argument('--output', default='output',
+                        help='Output directory (default: output)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Render months in N worker processes (default: 1)')
+    parser.add_argument('--check', action='store_true',
+                        help='Only run pre-flight asset checks; exit 1 on errors')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Lay out every month and report predicted memory, '
+                             'composites, text draws, assets and fonts without rendering')
+    parser.add_argument('--json', action='store_true',
+                        help='With --dry-run, print the plan as JSON')
+    parser.add_argument('--thumbnails', action='store_true',
+                        help='Also write month thumbnails and a contact sheet '
+                             'to <output>/thumbnails')
+    parser.add_argument('--watch', action='store_true',
+                        help='After rendering, watch the config and its assets and '
+                             're-render only the affected months on change')
+    parser.add_argument('--profile', choices=list(ENCODER_PROFILES), default=DEFAULT_PROFILE,
+                        help='PNG encoder profile: draft (fast, large), final (max '
+                             'compression, slow) or web (256-color palette) '
+                             f'(default: {DEFAULT_PROFILE})')
+    parser.add_argument('--cache-stats', action='store_true',
+                        help='Print hits, misses, evictions and memory of every '
+                             'in-memory cache after rendering')
+    parser.add_argument('--batch', metavar='RECIPIENTS',
+                        help='Render the config once per recipient in this JSON file, '
+                             'redrawing only cells whose special days differ '
+                             '(output goes to <output>/<recipient id>)')
+    parser.add_argument('--years', metavar='FIRST-LAST', type=parse_years,
+                        help='Render a range of years (e.g. 2026-2035), compositing each '
+                             'repeating month grid once; overrides --year')
+    parser.add_argument('--pdf', metavar='FILE',
+                        help='Write the year as one vector PDF (embedded-font text, '
+                             'each distinct background stored once) instead of PNG pages')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Record rendering, background decodes and waits per thread, '
+                             'print a timeline and write FILE in Chrome trace format')
+    return parser
+
+
+def main(json=None, argv: list[str] | None = None):
+    """
+    Main function.
+
+    Args:
+        json: Path to JSON configuration file (overrides command line)
+        argv: Command line arguments (defaults to sys.argv when json is not given)
+    """
+    # When called programmatically with a config path, ignore the host's sys.argv
+    args = build_arg_parser().parse_args([] if json and argv is None else argv)
+
+    # Initialize generator (machine-readable plans keep stdout for JSON only)
+    with contextlib.redirect_stdout(sys.stderr if args.dry_run and args.json else sys.stdout):
+        generator = CalendarGenerator(json if json else args.config)
+
+    if args.dry_run:
+        plan = build_render_plan(generator, args.year)
+        if args.json:
+            print(json_module.dumps(plan, indent=2, default=list))
+        else:
+            print(format_render_plan(plan))
+        return
+
+    # Validate every referenced asset before spending time on rendering
+    issues = generator.preflight()
+    print(format_preflight_report(issues))
+    if args.check:
+        raise SystemExit(1 if any(i['severity'] == 'error' for i in issues) else 0)
 
     # Year to generate
-    year = 2026
+    year = args.year
+
+    if args.batch:
+        from src.batch import run_batch
+        stats = run_batch(json if json else args.config, args.batch, year, args.output,
+                          args.profile)
+        print(f"\nDone! {stats['recipients']} recipients in {stats['seconds']:.2f}s: "
+              f"{stats['cells_redrawn']} cells redrawn, {stats['pages_rendered']} pages "
+              f"encoded, {stats['pages_linked']} pages linked to {args.output}/_base")
+        if args.cache_stats:
+            registry = get_cache_registry()
+            print(format_cache_stats(registry.stats(), registry.max_bytes))
+        return
+
+    if args.pdf:
+        from src.pdf_export import export_pdf
+        stats = export_pdf(generator, year, args.pdf)
+        print(f"\nDone! {stats['pages']} pages in {stats['seconds']:.2f}s: "
+              f"{stats['path']} ({stats['bytes'] / 1024:.0f} KB, {stats['images']} images "
+              f"for {stats['image_draws']} placements, {stats['text_ops']} text runs)")
+        if stats['raster_text_ops']:
+            print(f"  {stats['raster_text_ops']} text runs rasterized "
+                  f"(font file missing or not embeddable)")
+        return
+
+    trace = Trace() if args.trace else None
+
+    if args.years:
+        years = args.years
+        print(f"Generating calendars for {years[0]}-{years[-1]}...")
+        get_cache_registry().set_budget(RENDER_YEARS_CACHE_BYTES)
+        stats = generator.save_years(years, args.output, args.profile, trace)
+        print(f"\nDone! {stats['pages']} pages for {len(years)} years in "
+              f"{stats['seconds']:.2f}s: {stats['grids']} grids composited, "
+              f"{stats['cells']} cell layers rendered")
+        report_trace(trace, args.trace)
+        if args.cache_stats:
+            registry = get_cache_registry()
+            print(format_cache_stats(registry.stats(), registry.max_bytes))
+        return
 
     print(f"Generating calendar for {year}...")
 
+    # Watch mode re-renders from cached layers; a one-shot run does not need them
+    if not args.watch:
+        get_cache_registry().set_budget(RENDER_ONCE_CACHE_BYTES)
+
     # Create year calendar
-    months = generator.create_year(year)
+    months = generator.create_year(year, workers=args.workers, trace=trace)
 
     # Save months
-    filenames = generator.save_year(months, year, 'output')
+    with trace_span(trace, 'save'):
+        filenames = generator.save_year(months, year, args.output, args.profile)
 
     print(f"\nDone! Created {len(filenames)} files:")
     for f in filenames:
         print(f"  - {f}")
 
+    # Thumbnails straight from the rendered arrays, before they are released
+    if args.thumbnails:
+        thumbs = thumbnails_from_arrays(months, year, args.output)
+        print(f"Thumbnails: {len(thumbs)} files in {Path(args.output) / 'thumbnails'}")
+
+    report_trace(trace, args.trace)
+
+    # Pool workers lay out text in their own processes, so there is nothing to report
+    if args.workers <= 1:
+        text_stats = get_text_layout().stats()
+        print(f"Text layout cache: {text_stats['hits']} hits, {text_stats['misses']} misses "
+              f"({text_stats['hit_rate']:.0%} hit rate)")
+    if args.cache_stats:
+        registry = get_cache_registry()
+        print(format_cache_stats(registry.stats(), registry.max_bytes))
+
+    if args.watch:
+        from src.watch import MonthWatcher
+        del months
+        MonthWatcher(generator, json if json else args.config, year, args.output,
+                     profile=args.profile).run()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,411 @@
+"""Loader for calendar configs, including the structured canvas/layout/defaults schema."""
+
+from __future__ import annotations
+
+import copy
+import json
+
+# Keys that link a style node to the node(s) it extends
+INHERIT_KEYS = ('inherit', 'inherit_block', 'inherit_text')
+
+# Entries of spec_days that describe the date rather than its style
+SPEC_DAY_FIELDS = ('date', 'name', 'desc', 'background', 'background_image')
+
+DEFAULT_CELL_SIZE = 200
+DEFAULT_TEXT_SIZE = 48
+
+
+class ConfigError(ValueError):
+    """Invalid configuration (unknown inherit reference or inheritance cycle)."""
+
+
+def load_config(config_path: str) -> dict:
+    """
+    Load a configuration file in either supported format.
+
+    Args:
+        config_path: Path to JSON configuration file
+
+    Returns:
+        Flat configuration dict as used by the renderers
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return normalize_config(json.load(f))
+
+
+def normalize_config(config: dict) -> dict:
+    """
+    Compile a structured config; flat configs are returned unchanged.
+
+    Args:
+        config: Loaded configuration dict
+
+    Returns:
+        Flat configuration dict
+    """
+    if is_structured_config(config):
+        return compile_config(config)
+    return config
+
+
+def is_structured_config(config: dict) -> bool:
+    """Check whether a config uses the canvas/layout/defaults schema."""
+    return 'canvas' in config or 'defaults' in config
+
+
+def deep_merge(base: dict, override: dict) -> dict:
+    """
+    Merge override into a copy of base, recursing into nested dicts.
+
+    Args:
+        base: Inherited values (not modified)
+        override: Values taking precedence (not modified)
+
+    Returns:
+        New merged dict
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class StyleResolver:
+    """
+    Resolves inherit / inherit_block / inherit_text chains of a structured config.
+
+    Each referenced node (a dotted path such as 'defaults.text' or 'day') is
+    resolved once and memoized, so shared bases are not walked again for
+    every style that extends them.
+
+    A node's own keys override everything it inherits. 'inherit' extends a
+    whole style, 'inherit_block' the box properties and 'inherit_text' the
+    text properties: text goes under 'text' for block styles and is merged
+    at the top level for text-only styles such as month_title.
+    """
+
+    def __init__(self, config: dict):
+        """
+        Initialize style resolver.
+
+        Args:
+            config: Structured configuration dict
+        """
+        self.config = config
+        self._resolved: dict[str, dict] = {}
+        self._resolving: list[str] = []
+
+    def _lookup(self, ref: str) -> dict:
+        """Find the node a dotted reference points to."""
+        node = self.config
+        for part in ref.split('.'):
+            if not isinstance(node, dict) or part not in node:
+                raise ConfigError(f"Unknown style reference: {ref!r}")
+            node = node[part]
+        if not isinstance(node, dict):
+            raise ConfigError(f"Style reference {ref!r} is not an object")
+        return node
+
+    def resolve(self, ref: str) -> dict:
+        """
+        Get the fully inherited style of a referenced node.
+
+        Args:
+            ref: Dotted path of the node, e.g. 'defaults.block'
+
+        Returns:
+            Resolved style without inherit keys (shared, do not modify)
+
+        Raises:
+            ConfigError: If the reference is unknown or the chain is cyclic
+        """
+        style = self._resolved.get(ref)
+        if style is not None:
+            return style
+
+        if ref in self._resolving:
+            cycle = self._resolving[self._resolving.index(ref):] + [ref]
+            raise ConfigError(f"Style inheritance cycle: {' -> '.join(cycle)}")
+
+        self._resolving.append(ref)
+        try:
+            style = self.resolve_node(self._lookup(ref))
+        finally:
+            self._resolving.pop()
+
+        self._resolved[ref] = style
+        return style
+
+    def resolve_node(self, node: dict) -> dict:
+        """
+        Resolve an inline style node (e.g. one spec_days entry).
+
+        Args:
+            node: Style node, may contain inherit keys
+
+        Returns:
+            New resolved style without inherit keys
+        """
+        style = {}
+        if 'inherit' in node:
+            style = deep_merge(style, self.resolve(node['inherit']))
+        if 'inherit_block' in node:
+            style = deep_merge(style, self.resolve(node['inherit_block']))
+        if 'inherit_text' in node:
+            text = self.resolve(node['inherit_text'])
+            if 'inherit_block' in node or 'text' in style:
+                style['text'] = deep_merge(style.get('text', {}), text)
+            else:
+                style = deep_merge(style, text)
+
+        own = {key: value for key, value in node.items() if key not in INHERIT_KEYS}
+        return deep_merge(style, own)
+
+    def section(self, *refs: str) -> dict:
+        """
+        Resolve the first of several section names present in the config.
+
+        Args:
+            refs: Candidate section names, most specific first
+
+        Returns:
+            Resolved style, or an empty dict if none is present
+        """
+        for ref in refs:
+            if ref in self.config:
+                return self.resolve(ref)
+        return {}
+
+
+def _box(value, default: int = 0) -> dict:
+    """Normalize a padding/margin value (number or per-side dict)."""
+    if isinstance(value, dict):
+        return {side: value.get(side, default) for side in ('top', 'right', 'bottom', 'left')}
+    if value is None:
+        value = default
+    return {'top': value, 'right': value, 'bottom': value, 'left': value}
+
+
+def _relative_position(position: dict | None) -> dict:
+    """Get the relative alignment block of a position spec."""
+    position = position or {}
+    relative = position.get('relative', {})
+    return {
+        'x_align': relative.get('x_align', 'center'),
+        'y_align': relative.get('y_align', 'center'),
+        'offset_x': relative.get('offset_x', 0),
+        'offset_y': relative.get('offset_y', 0),
+    }
+
+
+def _text_anchor(position: dict | None, padding: dict, width: int,
+                 height: int) -> tuple[list[int], str, str]:
+    """
+    Convert a text position spec to a cell anchor and alignment.
+
+    Returns:
+        ([x, y], text_align, text_valign) as used by DayRenderer
+    """
+    if position and position.get('mode') == 'absolute':
+        absolute = position.get('absolute', {})
+        return [absolute.get('x', 0), absolute.get('y', 0)], 'left', 'top'
+
+    rel = _relative_position(position)
+    inner_w = width - padding['left'] - padding['right']
+    inner_h = height - padding['top'] - padding['bottom']
+
+    x_align = rel['x_align']
+    if x_align == 'left':
+        x = padding['left']
+    elif x_align == 'right':
+        x = width - padding['right']
+    else:
+        x_align = 'center'
+        x = padding['left'] + inner_w // 2
+
+    y_align = rel['y_align']
+    if y_align == 'top':
+        y = padding['top']
+    elif y_align == 'bottom':
+        y = height - padding['bottom']
+    else:
+        y_align = 'center'
+        y = padding['top'] + inner_h // 2
+
+    return [x + rel['offset_x'], y + rel['offset_y']], x_align, y_align
+
+
+def _compile_cell(style: dict) -> dict:
+    """Flatten a resolved block style into a day cell config."""
+    text = style.get('text', {})
+    width = style.get('width', DEFAULT_CELL_SIZE)
+    height = style.get('height', DEFAULT_CELL_SIZE)
+    padding = _box(style.get('padding'))
+    position, align, valign = _text_anchor(text.get('position'), padding, width, height)
+
+    cell = {
+        'width': width,
+        'height': height,
+        'text_color': list(text.get('color', [0, 0, 0])),
+        'text_position': position,
+        'text_size': text.get('size', DEFAULT_TEXT_SIZE),
+        'text_align': align,
+        'text_valign': valign,
+    }
+    if text.get('font'):
+        cell['text_font'] = text['font']
+    background = style.get('background_image') or style.get('background')
+    if background:
+        cell['background'] = background
+    if style.get('background_color'):
+        cell['background_color'] = list(style['background_color'])
+    if style.get('border_width'):
+        cell['border_width'] = style['border_width']
+        cell['border_color'] = list(style.get('border_color', [0, 0, 0]))
+    if style.get('opacity', 1.0) < 1.0:
+        cell['opacity'] = style['opacity']
+    if style.get('label'):
+        cell['label'] = copy.deepcopy(style['label'])
+    return cell
+
+
+def _compile_month(config: dict, resolver: StyleResolver) -> dict:
+    """Flatten canvas, layout and month_title into the base month config."""
+    canvas = config.get('canvas', {})
+    layout = config.get('layout', {})
+    title = resolver.section('month_title')
+    if 'text' in title:
+        title = deep_merge(title, title['text'])
+
+    gap = layout.get('gap', {})
+    if not isinstance(gap, dict):
+        gap = {'x': gap, 'y': gap}
+    safe = _box(canvas.get('safe_margin'))
+    rel = _relative_position(layout.get('position'))
+    margin = _box(title.get('margin'))
+    size = title.get('size', DEFAULT_TEXT_SIZE)
+
+    month = {
+        'gap': gap.get('x', 10),
+        'gap_x': gap.get('x', 10),
+        'gap_y': gap.get('y', gap.get('x', 10)),
+        'text_color': list(title.get('color', [0, 0, 0])),
+        'text_size': size,
+        'text_align': 'center',
+        # Title band: margins around the text, title centered between them
+        'title_height': margin['top'] + size + margin['bottom'],
+        'title_offset_y': (margin['top'] - margin['bottom']) // 2,
+        'min_width': canvas.get('width', 0),
+        'min_height': canvas.get('height', 0),
+        'width_pos': rel['x_align'],
+        'height_pos': rel['y_align'],
+        'content_offset_x': rel['offset_x'],
+        'content_offset_y': rel['offset_y'],
+        'padding_top': safe['top'],
+        'padding_right': safe['right'],
+        'padding_bottom': safe['bottom'],
+        'padding_left': safe['left'],
+    }
+    if title.get('font'):
+        month['text_font'] = title['font']
+    if canvas.get('background_color'):
+        month['background_color'] = list(canvas['background_color'])
+    if canvas.get('background_image'):
+        month['background'] = canvas['background_image']
+    return month
+
+
+def _compile_header(style: dict, day_width: int) -> dict:
+    """Flatten the resolved week_day_header style."""
+    text = style.get('text', {})
+    height = style.get('height', text.get('size', DEFAULT_TEXT_SIZE) + 20)
+    header = {
+        'width': day_width,
+        'height': height,
+        'header_height': height,
+        'text_color': list(text.get('color', [0, 0, 0])),
+        'text_size': text.get('size', DEFAULT_TEXT_SIZE),
+        'text_align': 'center',
+    }
+    if text.get('font'):
+        header['text_font'] = text['font']
+    background = style.get('background_image') or style.get('background')
+    if background:
+        header['background'] = background
+    if style.get('background_color'):
+        header['background_color'] = list(style['background_color'])
+    return header
+
+
+def _compile_months(config: dict) -> list[dict]:
+    """Map per-month entries onto the flat month override keys."""
+    months = []
+    for entry in config.get('months', []):
+        month = {key: value for key, value in entry.items() if key != 'background_image'}
+        if entry.get('background_image'):
+            month['background'] = entry['background_image']
+        months.append(month)
+    return months
+
+
+def _compile_spec_days(config: dict, resolver: StyleResolver,
+                       base_ref: str | None) -> list[dict]:
+    """Resolve every spec_days entry into a flat entry with its own cell style."""
+    spec_days = []
+    for entry in config.get('spec_days', []):
+        style_node = {key: value for key, value in entry.items() if key not in SPEC_DAY_FIELDS}
+        if base_ref:
+            style_node.setdefault('inherit', base_ref)
+        spec_days.append({
+            'date': entry['date'],
+            'name': entry.get('name', ''),
+            'desc': entry.get('desc', ''),
+            'background': entry.get('background_image') or entry.get('background', ''),
+            'style': _compile_cell(resolver.resolve_node(style_node)),
+        })
+    return spec_days
+
+
+def compile_config(config: dict) -> dict:
+    """
+    Compile a structured config into the flat shape the renderers read.
+
+    All inheritance is resolved here, once; every section of the result is
+    a plain dict, so render-time lookups never follow inherit references.
+
+    Args:
+        config: Structured configuration dict
+
+    Returns:
+        Flat configuration dict (regular_day, weekend, spec_day,
+        day_of_the_week, month, months, spec_days, ...)
+
+    Raises:
+        ConfigError: On unknown references or inheritance cycles
+    """
+    resolver = StyleResolver(config)
+
+    regular_day = _compile_cell(resolver.section('regular_day', 'day'))
+    spec_base = 'spec_day' if 'spec_day' in config else 'day' if 'day' in config else None
+
+    compiled = {
+        'month': _compile_month(config, resolver),
+        'regular_day': regular_day,
+        'weekend': _compile_cell(resolver.section('weekend', 'day')),
+        'spec_day': _compile_cell(resolver.section('spec_day', 'day')),
+        'day_of_the_week': _compile_header(resolver.section('week_day_header'),
+                                           regular_day['width']),
+        'months': _compile_months(config),
+        'spec_days': _compile_spec_days(config, resolver, spec_base),
+    }
+    # Styles the renderer does not draw yet, compiled for completeness
+    for section in ('other_month_day', 'today'):
+        if section in config:
+            compiled[section] = _compile_cell(resolver.resolve(section))
+    for section in ('locale', 'export', 'spec_days_generator'):
+        if section in config:
+            compiled[section] = copy.deepcopy(config[section])
+    return compiled
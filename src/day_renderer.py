@@ -1,25 +1,65 @@
 """Day rendering logic for calendar generation."""
 
-import numpy as np
+from __future__ import annotations
 
+from pathlib import Path
+
+from src.utils.lazy_import import lazy_import
 from src.utils.image_utils import ImageUtils
 from src.utils.font_manager import FontManager
 from src.utils.date_utils import DateUtils
+from src.utils.text_layout import DEFAULT_MIN_FONT_SIZE, get_text_layout
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+
+class _LabelFields(dict):
+    """Label template fields; unknown placeholders are left as written."""
+
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
+def format_label(template: str, info: dict) -> str:
+    """
+    Fill a spec day label template ({name} and {desc}).
+
+    The template is user-editable text: other placeholders stay as they
+    are, and a template that is not valid format syntax (e.g. a single
+    brace) is used verbatim instead of aborting the render.
+
+    Args:
+        template: Label text from the config
+        info: Spec day info with 'name' and 'desc'
+
+    Returns:
+        Label text
+    """
+    fields = _LabelFields(name=info.get('name', ''), desc=info.get('desc', ''))
+    try:
+        return template.format_map(fields)
+    except (ValueError, IndexError, AttributeError, TypeError):
+        return template
 
 
 class DayRenderer:
     """Renders individual calendar days."""
 
-    def __init__(self, font_manager: FontManager, spec_days: dict):
+    def __init__(self, font_manager: FontManager, spec_days: dict,
+                 spec_day_images: dict | None = None):
         """
         Initialize day renderer.
 
         Args:
             font_manager: Font manager instance
             spec_days: Special days configuration dict
+            spec_day_images: In-memory spec day backgrounds ("DD.MM" -> BGRA
+                array at cell size), used instead of their background files
         """
         self.font_manager = font_manager
         self.spec_days = spec_days
+        self.spec_day_images = spec_day_images or {}
 
     def _is_spec_day(self, day: int, month: int) -> bool:
         """Check if day is a special day."""
@@ -33,15 +73,221 @@ class DayRenderer:
             return self.spec_days[date_key].get('background', '')
         return None
 
+    def _get_spec_day_image(self, day: int, month: int) -> np.ndarray | None:
+        """Get the in-memory background of a special day, if one was handed over."""
+        return self.spec_day_images.get(DateUtils.format_spec_day_date(day, month))
+
     def _get_day_config(self, day: int, month: int, weekday: int, config: dict) -> dict:
         """Get configuration for a day based on type."""
         if self._is_spec_day(day, month):
-            return config['spec_day']
+            # Per-date style compiled by the config loader, if any
+            date_key = DateUtils.format_spec_day_date(day, month)
+            return self.spec_days[date_key].get('style') or config['spec_day']
         elif DateUtils.is_weekend(weekday):
             return config['weekend']
         else:
             return config['regular_day']
 
+    def _get_label(self, day: int, month: int, cfg: dict) -> tuple[str, dict] | None:
+        """Get (text, label config) for a spec day whose style has a label box."""
+        label_cfg = cfg.get('label')
+        if not label_cfg:
+            return None
+        date_key = DateUtils.format_spec_day_date(day, month)
+        info = self.spec_days.get(date_key)
+        if info is None:
+            return None
+        template = label_cfg.get('text', '{name}')
+        text = format_label(template, info).strip()
+        return (text, label_cfg) if text else None
+
+    def _label_box(self, label_cfg: dict, cfg: dict) -> tuple[int, int, int, int]:
+        """Get the (x, y, width, height) label box, the whole cell by default."""
+        return tuple(label_cfg.get('box', (0, 0, cfg['width'], cfg['height'])))
+
+    def _label_font(self, text: str, label_cfg: dict, cfg: dict) -> tuple[str, int]:
+        """Get (font path, size) of a label, defaulting to the day text font."""
+        size = label_cfg.get('text_size', max(8, cfg['text_size'] // 3))
+        font_path = label_cfg.get('text_font', cfg.get('text_font', self.font_manager.default_font))
+        if label_cfg.get('autofit'):
+            _, _, box_w, box_h = self._label_box(label_cfg, cfg)
+            size = self.font_manager.fit_size(
+                font_path, text, (box_w, box_h), size,
+                label_cfg.get('min_text_size', DEFAULT_MIN_FONT_SIZE),
+                wrap=True, max_lines=label_cfg.get('max_lines'),
+                line_spacing=label_cfg.get('line_spacing', 1.0),
+                stroke=1 if label_cfg.get('outline', True) else 0,
+            )
+        return font_path, size
+
+    def _day_text_size(self, text: str, font_path: str, cfg: dict) -> int:
+        """Get the day number size, shrunk to fit its box when text_autofit is set."""
+        size = cfg['text_size']
+        if not cfg.get('text_autofit'):
+            return size
+        padding = cfg.get('padding', 0)
+        box = cfg.get('text_box', (cfg['width'] - 2 * padding, cfg['height'] - 2 * padding))
+        return self.font_manager.fit_size(font_path, text, tuple(box[-2:]), size,
+                                          cfg.get('min_text_size', DEFAULT_MIN_FONT_SIZE),
+                                          stroke=1)
+
+    def _layout_label(self, text: str, label_cfg: dict, cfg: dict) -> dict:
+        """
+        Wrap label text into its box.
+
+        Returns:
+            Dict with 'font', 'lines', 'line_height', 'align' and 'origin'
+            (anchor x, top y of the first line)
+        """
+        box_x, box_y, box_w, box_h = self._label_box(label_cfg, cfg)
+        font = self.font_manager.load_font(*self._label_font(text, label_cfg, cfg))
+
+        ascent, descent = font.getmetrics()
+        line_height = max(1, round((ascent + descent) * label_cfg.get('line_spacing', 1.0)))
+        max_lines = label_cfg.get('max_lines') or max(1, box_h // line_height)
+        lines = get_text_layout().wrap(font, text, box_w, max_lines,
+                                       label_cfg.get('ellipsis', '\u2026'))
+
+        align = label_cfg.get('text_align', 'center')
+        if align == 'center':
+            x = box_x + box_w // 2
+        elif align == 'right':
+            x = box_x + box_w
+        else:
+            x = box_x
+
+        block_height = len(lines) * line_height
+        valign = label_cfg.get('text_valign', 'bottom')
+        if valign == 'top':
+            y = box_y
+        elif valign == 'center':
+            y = box_y + (box_h - block_height) // 2
+        else:
+            y = box_y + box_h - block_height
+
+        return {'font': font, 'lines': lines, 'line_height': line_height,
+                'origin': (x, y), 'align': align}
+
+    def describe_day(self, day: int, month: int, weekday: int, config: dict) -> dict:
+        """
+        List what create_day_image would draw, without rasterizing anything.
+
+        Args:
+            day: Day of month
+            month: Month number
+            weekday: Weekday number
+            config: Full configuration dict
+
+        Returns:
+            Dict with 'width', 'height', 'images' (background paths overlaid
+            on the cell), 'memory_images' (in-memory backgrounds), 'font', 'size', 'text' and 'labels' (spec day
+            label texts with 'font' and 'size')
+        """
+        cfg = self._get_day_config(day, month, weekday, config)
+
+        # Same fallback as create_day_image: in-memory image, spec day
+        # background, else style background
+        images = []
+        memory_image = self._get_spec_day_image(day, month) is not None
+        if not memory_image:
+            for path in (self._get_spec_day_background(day, month), cfg.get('background')):
+                if path and Path(path).exists():
+                    images.append(path)
+                    break
+
+        labels = []
+        label = self._get_label(day, month, cfg)
+        if label:
+            text, label_cfg = label
+            font_path, size = self._label_font(text, label_cfg, cfg)
+            labels.append({'font': font_path, 'size': size, 'text': text})
+
+        text_font = cfg.get('text_font', self.font_manager.default_font)
+        return {
+            'width': cfg['width'],
+            'height': cfg['height'],
+            'images': images,
+            'memory_images': int(memory_image),
+            'font': text_font,
+            'size': self._day_text_size(str(day), text_font, cfg),
+            'text': str(day),
+            'labels': labels,
+        }
+
+    def day_ops(self, day: int, month: int, weekday: int, config: dict) -> dict:
+        """
+        List the drawing operations of create_day_image, for vector output.
+
+        Operations are dicts in cell pixel coordinates: {'type': 'rect',
+        'box', 'color'}, {'type': 'image', 'path' or 'pixels' (BGRA array),
+        'box'} and {'type': 'text', 'text', 'font', 'origin' (PIL draw
+        origin), 'color', 'outline'}. Colors are RGB as seen in the
+        rendered image.
+
+        Args:
+            day: Day of month
+            month: Month number
+            weekday: Weekday number
+            config: Full configuration dict
+
+        Returns:
+            Dict with 'width', 'height', 'opacity' and 'ops' (bottom to top)
+        """
+        cfg = self._get_day_config(day, month, weekday, config)
+        width, height = cfg['width'], cfg['height']
+        layout = get_text_layout()
+        ops = []
+
+        background_color = cfg.get('background_color')
+        if background_color:
+            ops.append({'type': 'rect', 'box': (0, 0, width, height),
+                        'color': tuple(background_color)})
+
+        # Same fallback as create_day_image: in-memory image, spec day
+        # background, else style background
+        memory_image = self._get_spec_day_image(day, month)
+        if memory_image is not None:
+            ops.append({'type': 'image', 'pixels': memory_image, 'box': (0, 0, width, height)})
+        else:
+            for path in (self._get_spec_day_background(day, month), cfg.get('background')):
+                if path and Path(path).exists():
+                    ops.append({'type': 'image', 'path': path, 'box': (0, 0, width, height)})
+                    break
+
+        border_width = cfg.get('border_width', 0)
+        if border_width > 0:
+            border_color = tuple(cfg.get('border_color', (0, 0, 0)))
+            for box in ((0, 0, width, border_width), (0, height - border_width, width, border_width),
+                        (0, 0, border_width, height), (width - border_width, 0, border_width, height)):
+                ops.append({'type': 'rect', 'box': box, 'color': border_color})
+
+        text_font = cfg.get('text_font', self.font_manager.default_font)
+        font = self.font_manager.load_font(text_font, self._day_text_size(str(day), text_font, cfg))
+        text_pos = tuple(cfg['text_position'])
+        origin = layout.aligned_position(font, str(day), text_pos[0], text_pos[1],
+                                         cfg.get('text_align', 'left'),
+                                         cfg.get('text_valign', 'bottom'))
+        ops.append({'type': 'text', 'text': str(day), 'font': font, 'origin': origin,
+                    'color': tuple(cfg['text_color']), 'outline': True})
+
+        label = self._get_label(day, month, cfg)
+        if label:
+            text, label_cfg = label
+            label_layout = self._layout_label(text, label_cfg, cfg)
+            x, y = label_layout['origin']
+            for i, line in enumerate(label_layout['lines']):
+                if not line:
+                    continue
+                origin = layout.aligned_position(label_layout['font'], line, x,
+                                                 y + i * label_layout['line_height'],
+                                                 label_layout['align'], 'top')
+                ops.append({'type': 'text', 'text': line, 'font': label_layout['font'],
+                            'origin': origin,
+                            'color': tuple(label_cfg.get('text_color', cfg['text_color'])),
+                            'outline': label_cfg.get('outline', True)})
+
+        return {'width': width, 'height': height, 'opacity': cfg.get('opacity', 1.0), 'ops': ops}
+
     def create_day_image(self, day: int, month: int, weekday: int,
                          config: dict) -> np.ndarray:
         """
@@ -59,14 +305,25 @@ class DayRenderer:
         cfg = self._get_day_config(day, month, weekday, config)
         width, height = cfg['width'], cfg['height']
 
-        # Create transparent background
-        day_img = ImageUtils.create_transparent_image(width, height)
+        # Create transparent (or solid color) background
+        background_color = cfg.get('background_color')
+        if background_color:
+            day_img = ImageUtils.create_color_image(width, height, background_color)
+        else:
+            day_img = ImageUtils.create_transparent_image(width, height)
 
-        # Check for special day background first
+        # Check for special day background first: handed over in memory, else a file
         spec_bg_path = self._get_spec_day_background(day, month)
+        spec_image = self._get_spec_day_image(day, month)
         background_loaded = False
 
-        if spec_bg_path:
+        if spec_image is not None:
+            if spec_image.shape[:2] != (height, width):
+                spec_image = cv2.resize(spec_image, (width, height),
+                                        interpolation=cv2.INTER_LANCZOS4)
+            day_img = ImageUtils.overlay_image(day_img, spec_image, 0, 0)
+            background_loaded = True
+        elif spec_bg_path:
             background = ImageUtils.load_background(spec_bg_path, width, height)
             if background is not None:
                 day_img = ImageUtils.overlay_image(day_img, background, 0, 0)
@@ -80,12 +337,18 @@ class DayRenderer:
                 if background is not None:
                     day_img = ImageUtils.overlay_image(day_img, background, 0, 0)
 
+        border_width = cfg.get('border_width', 0)
+        if border_width:
+            day_img = ImageUtils.draw_border(day_img, border_width,
+                                             cfg.get('border_color', (0, 0, 0)))
+
         # Draw day number
         text_color = tuple(cfg['text_color'])  # BGR
         text_pos = tuple(cfg['text_position'])
-        text_size = cfg['text_size']
         text_align = cfg.get('text_align', 'left')
+        text_valign = cfg.get('text_valign', 'bottom')
         text_font = cfg.get('text_font', self.font_manager.default_font)
+        text_size = self._day_text_size(str(day), text_font, cfg)
 
         # Get font
         font = self.font_manager.load_font(text_font, text_size)
@@ -95,7 +358,24 @@ class DayRenderer:
 
         day_img = ImageUtils.draw_text(
             day_img, str(day), text_pos, rgb_color,
-            font, text_align, outline=True
+            font, text_align, outline=True, valign=text_valign
         )
 
+        # Spec day name/description wrapped into the style's label box
+        label = self._get_label(day, month, cfg)
+        if label:
+            text, label_cfg = label
+            layout = self._layout_label(text, label_cfg, cfg)
+            label_color = tuple(label_cfg.get('text_color', cfg['text_color']))
+            day_img = ImageUtils.draw_text_lines(
+                day_img, layout['lines'], layout['origin'],
+                (label_color[2], label_color[1], label_color[0]),
+                layout['font'], layout['align'], layout['line_height'],
+                outline=label_cfg.get('outline', True)
+            )
+
+        opacity = cfg.get('opacity', 1.0)
+        if opacity < 1.0:
+            day_img[:, :, 3] = (day_img[:, :, 3] * opacity).astype(np.uint8)
+
         return day_img
@@ -1,5 +1,11 @@
 """Spec Days Generator feature."""
 
-from .window import SpecDaysGeneratorWindow
-
 __all__ = ["SpecDaysGeneratorWindow"]
+
+
+def __getattr__(name: str):
+    # The window needs PySide6; the renderer only imports .generator
+    if name == "SpecDaysGeneratorWindow":
+        from .window import SpecDaysGeneratorWindow
+        return SpecDaysGeneratorWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
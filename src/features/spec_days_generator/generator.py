@@ -1,54 +1,49 @@
-"""Generator for spec days images using OpenCV and PIL for text rendering."""
+"""Generator for spec days images on the raster backend (PIL fonts for text rendering)."""
 
 import cv2
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageFont
 
+from ...utils.font_index import get_font_index
+from ...utils.raster_backend import get_raster_backend
+from ...utils.text_layout import get_text_layout
 
-def load_background(path: str, width: int, height: int) -> Optional[Image.Image]:
+
+def load_background(path: str, width: int, height: int) -> Optional[np.ndarray]:
     """Load background image with transparency support.
     
     Returns:
-        PIL Image in RGBA mode, or None if no background specified.
+        BGRA array resized to the canvas, or None if no background specified.
     """
     if not path or not Path(path).exists():
         return None
 
-    try:
-        img = Image.open(path)
-        
-        # Convert to RGBA if needed
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        
-        # Resize to fit canvas
-        img = img.resize((width, height), Image.Resampling.LANCZOS)
-        return img
-    except Exception:
+    backend = get_raster_backend()
+    img = backend.decode(path)
+    if img is None:
         return None
 
+    # Resize to fit canvas
+    if img.shape[1] != width or img.shape[0] != height:
+        img = backend.resize(img, width, height, 'lanczos')
+    return img
+
+
+def to_bgra(color: tuple) -> tuple:
+    """RGB or RGBA color as a BGRA fill for the raster backend."""
+    alpha = color[3] if len(color) > 3 else 255
+    return (color[2], color[1], color[0], alpha)
+
 
 def get_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
-    """Load font from path or return default font."""
-    if font_path and Path(font_path).exists():
-        try:
-            return ImageFont.truetype(font_path, size)
-        except Exception:
-            pass
-    
-    # Try common fonts with Cyrillic support
-    common_fonts = [
-        "C:/Windows/Fonts/arial.ttf",
-        "C:/Windows/Fonts/times.ttf",
-        "C:/Windows/Fonts/cour.ttf",
-        "C:/Windows/Fonts/segoeui.ttf",
-        "C:/Windows/Fonts/seguiemj.ttf",
-    ]
-    
-    for font in common_fonts:
-        if Path(font).exists():
+    """Load font from path or family name, or return default font."""
+    index = get_font_index()
+
+    # Configured font first, then a common font with Cyrillic support
+    for font in (index.resolve(font_path), index.fallback()):
+        if font:
             try:
                 return ImageFont.truetype(font, size)
             except Exception:
@@ -59,11 +54,10 @@ def get_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
 
 
 def get_text_size(text: str, font: ImageFont.FreeTypeFont) -> tuple:
-    """Get text size using PIL."""
-    bbox = font.getbbox(text)
-    width = bbox[2] - bbox[0]
-    height = bbox[3] - bbox[1]
-    return width, height
+    """Get text size using the shared text layout cache."""
+    metrics = get_text_layout().measure(font, text)
+    line_bbox = metrics['lines'][0] if len(metrics['lines']) == 1 else metrics['bbox']
+    return line_bbox[2] - line_bbox[0], line_bbox[3] - line_bbox[1]
 
 
 def calculate_text_position(
@@ -77,41 +71,18 @@ def calculate_text_position(
     v_align: str
 ) -> tuple:
     """Calculate final text position based on alignment."""
-    text_width, text_height = get_text_size(text, font)
-
-    # Apply horizontal alignment
-    if h_align == "left":
-        pos_x = x
-    elif h_align == "center":
-        pos_x = x - text_width // 2
-    elif h_align == "right":
-        pos_x = x - text_width
-    else:
-        pos_x = x
-
-    # Apply vertical alignment
-    if v_align == "top":
-        pos_y = y
-    elif v_align == "center":
-        pos_y = y - text_height // 2
-    elif v_align == "bottom":
-        pos_y = y - text_height
-    else:
-        pos_y = y
-
-    return pos_x, pos_y
-
-
-def draw_text_with_outline(
-    draw: ImageDraw.ImageDraw,
+    return get_text_layout().aligned_position(font, text, x, y, h_align, v_align)
+
+
+def text_with_outline_runs(
     text: str,
     org: tuple,
     font: ImageFont.FreeTypeFont,
     fill: tuple,
     outline_color: tuple = (0, 0, 0),
     outline_width: int = 1
-) -> None:
-    """Draw text with outline for better visibility."""
+) -> List[tuple]:
+    """Raster backend text runs for text with outline for better visibility (RGB(A) colors)."""
     x, y = org
 
     # Draw outline (shadow) in 8 directions
@@ -121,22 +92,22 @@ def draw_text_with_outline(
         (-outline_width, outline_width),  (0, outline_width),  (outline_width, outline_width)
     ]
 
-    for dx, dy in offsets:
-        draw.text((x + dx, y + dy), text, font=font, fill=outline_color)
+    runs = [(text, (x + dx, y + dy), font, to_bgra(outline_color)) for dx, dy in offsets]
 
-    # Draw main text
-    draw.text(org, text, font=font, fill=fill)
+    # Main text
+    runs.append((text, org, font, to_bgra(fill)))
+    return runs
 
 
-def generate_spec_day_image(
+def render_spec_day(
     date_text: str,
     desc_text: str,
     date_settings: Dict,
     desc_settings: Dict,
     canvas_settings: Dict
-) -> Image.Image:
+) -> np.ndarray:
     """
-    Generate a spec day image with date and description on transparent background.
+    Render a spec day image with date and description on transparent background.
 
     Args:
         date_text: Text to display as date (e.g., "16.01")
@@ -146,21 +117,17 @@ def generate_spec_day_image(
         canvas_settings: Canvas settings (width, height, background)
 
     Returns:
-        Generated image as PIL Image in RGBA mode (transparent background)
+        Generated image as BGRA array (transparent background)
     """
     width = canvas_settings.get("width", 800)
     height = canvas_settings.get("height", 600)
     bg_path = canvas_settings.get("background", "")
 
-    # Create transparent background (RGBA)
-    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    
-    # Load and paste background image if specified
-    bg_image = load_background(bg_path, width, height)
-    if bg_image:
-        image = Image.alpha_composite(image, bg_image)
-    
-    draw = ImageDraw.Draw(image)
+    # Background image if specified, else a transparent canvas
+    image = load_background(bg_path, width, height)
+    if image is None:
+        image = np.zeros((height, width, 4), dtype=np.uint8)
+    runs = []
 
     # Load font for date
     date_font_size = date_settings.get("font_size", 24)
@@ -182,7 +149,7 @@ def generate_spec_day_image(
     date_color = tuple(date_settings.get("color", [255, 255, 255]))
     if len(date_color) == 3:
         date_color = (*date_color, 255)  # Add alpha channel
-    draw_text_with_outline(draw, date_text, date_org, date_font, date_color)
+    runs += text_with_outline_runs(date_text, date_org, date_font, date_color)
 
     # Draw description text (may be multiline)
     desc_color = tuple(desc_settings.get("color", [255, 255, 255]))
@@ -224,10 +191,35 @@ def generate_spec_day_image(
                 "top"
             )
 
-            draw_text_with_outline(draw, line, line_org, desc_font, desc_color)
+            runs += text_with_outline_runs(line, line_org, desc_font, desc_color)
             current_y += line_heights[i] + line_spacing
 
-    return image
+    # All outline and text passes in one backend call
+    return get_raster_backend().draw_text(image, runs)
+
+
+def generate_spec_day_image(
+    date_text: str,
+    desc_text: str,
+    date_settings: Dict,
+    desc_settings: Dict,
+    canvas_settings: Dict
+) -> Image.Image:
+    """
+    Generate a spec day image with date and description on transparent background.
+
+    Args:
+        date_text: Text to display as date (e.g., "16.01")
+        desc_text: Text to display as description (name(s))
+        date_settings: Settings for date text
+        desc_settings: Settings for description text
+        canvas_settings: Canvas settings (width, height, background)
+
+    Returns:
+        Generated image as PIL Image in RGBA mode (transparent background)
+    """
+    image = render_spec_day(date_text, desc_text, date_settings, desc_settings, canvas_settings)
+    return Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA))
 
 
 def save_spec_day_image(
@@ -263,6 +255,82 @@ def save_spec_day_image(
     return str(full_path)
 
 
+def spec_day_description(spec_day: Dict) -> str:
+    """Description text of a spec day: its name and description, one per line."""
+    # Use 'name' field for the main text (as per the corrected format)
+    name_text = spec_day.get("name", "")
+    desc_text = spec_day.get("desc", "")
+
+    # Combine name and desc if both exist
+    if name_text and desc_text and name_text != "День рождения":
+        return f"{name_text}\n{desc_text}"
+    return desc_text or name_text or ""
+
+
+def scale_text_settings(settings: Dict, scale_x: float, scale_y: float) -> Dict:
+    """Copy text settings with position and font size scaled to another canvas size."""
+    scaled = dict(settings)
+    if "x" in settings:
+        scaled["x"] = round(settings["x"] * scale_x)
+    if "y" in settings:
+        scaled["y"] = round(settings["y"] * scale_y)
+    # Glyphs are not stretched; the smaller factor keeps the text inside
+    scaled["font_size"] = max(1, round(settings.get("font_size", 24) * min(scale_x, scale_y)))
+    return scaled
+
+
+def render_spec_day_images(
+    spec_days: List[Dict],
+    date_settings: Dict,
+    desc_settings: Dict,
+    canvas_settings: Dict,
+    sizes: Dict[str, tuple],
+    output_dir: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Generate spec day images in memory at the size of their calendar cells.
+
+    Text positions and font sizes are scaled from the canvas settings to
+    each cell, and the background is resized once, straight to the cell, so
+    the day renderer can use the arrays without another resample.
+
+    Args:
+        spec_days: List of spec day dictionaries with 'date', 'name', 'desc' keys
+        date_settings: Settings for date text
+        desc_settings: Settings for description text
+        canvas_settings: Canvas settings (the design size the positions refer to)
+        sizes: Date ("DD.MM") -> (width, height) of its day cell; other dates are skipped
+        output_dir: Also save each image as spec_DD_MM.png there (optional)
+
+    Returns:
+        Date -> BGRA image array
+    """
+    canvas_width = canvas_settings.get("width", 800)
+    canvas_height = canvas_settings.get("height", 600)
+    images = {}
+
+    for spec_day in spec_days:
+        date_text = spec_day.get("date", "")
+        if date_text not in sizes:
+            continue
+        width, height = sizes[date_text]
+        scale_x, scale_y = width / canvas_width, height / canvas_height
+
+        image = render_spec_day(
+            date_text,
+            spec_day_description(spec_day),
+            scale_text_settings(date_settings, scale_x, scale_y),
+            scale_text_settings(desc_settings, scale_x, scale_y),
+            {**canvas_settings, "width": width, "height": height}
+        )
+        if output_dir:
+            save_spec_day_image(Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)),
+                                output_dir, date_text)
+        images[date_text] = image
+
+    return images
+
+
 def generate_all_spec_days(
     spec_days: List[Dict],
     date_settings: Dict,
@@ -287,23 +355,9 @@ def generate_all_spec_days(
 
     for spec_day in spec_days:
         date_text = spec_day.get("date", "")
-        # Use 'name' field for the main text (as per the corrected format)
-        name_text = spec_day.get("name", "")
-        desc_text = spec_day.get("desc", "")
-
-        # Combine name and desc if both exist
-        if name_text and desc_text and name_text != "День рождения":
-            full_desc = f"{name_text}\n{desc_text}"
-        elif desc_text:
-            full_desc = desc_text
-        elif name_text:
-            full_desc = name_text
-        else:
-            full_desc = ""
-
         image = generate_spec_day_image(
             date_text,
-            full_desc,
+            spec_day_description(spec_day),
             date_settings,
             desc_settings,
             canvas_settings
@@ -19,6 +19,8 @@ class SpecDaysGeneratorWindow(QWidget):
     
     # Signal emitted when generation is complete
     generationComplete = Signal(list)
+    # Signal emitted with generator settings for in-memory use by the calendar
+    settingsApplied = Signal(dict)
     
     def __init__(self, spec_days_data: list = None, parent=None):
         super().__init__(parent, Qt.Window)
@@ -73,6 +75,15 @@ class SpecDaysGeneratorWindow(QWidget):
         self._generate_btn.setStyleSheet("font-weight: bold; background-color: #4CAF50; color: white;")
         bottom_lay.addWidget(self._generate_btn)
         
+        self._apply_btn = QPushButton("В календарь")
+        self._apply_btn.setFixedWidth(150)
+        self._apply_btn.setToolTip(
+            "Рисовать изображения спец дней при генерации календаря, в размере ячейки, "
+            "без промежуточных файлов (в выходную папку — только если она выбрана)"
+        )
+        self._apply_btn.clicked.connect(self._apply_to_calendar)
+        bottom_lay.addWidget(self._apply_btn)
+        
         main_lay.addLayout(bottom_lay)
         
         self._output_dir = ""
@@ -366,6 +377,17 @@ class SpecDaysGeneratorWindow(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка генерации: {e}")
     
+    def _apply_to_calendar(self):
+        """Hand the current settings to the calendar for in-memory generation."""
+        settings = {
+            "date": self._date_settings.get_settings(),
+            "desc": self._desc_settings.get_settings(),
+            "canvas": self._canvas_settings.get_settings(),
+        }
+        if self._output_dir:
+            settings["save_dir"] = self._output_dir
+        self.settingsApplied.emit(settings)
+    
     def set_spec_days(self, spec_days: list):
         """Set spec days data from outside."""
         self._spec_days = spec_days
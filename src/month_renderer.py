@@ -1,13 +1,28 @@
 """Month rendering logic for calendar generation."""
 
-import numpy as np
+from __future__ import annotations
+
+import time
 from datetime import datetime
+from pathlib import Path
 
+from src.utils.lazy_import import lazy_import
 from src.utils.image_utils import ImageUtils
 from src.utils.font_manager import FontManager
 from src.utils.date_utils import DateUtils
+from src.utils.layer_cache import array_signature, file_signature, get_layer_cache, layer_key
+from src.utils.text_layout import DEFAULT_MIN_FONT_SIZE, get_text_layout
 from src.day_renderer import DayRenderer
 
+np = lazy_import('numpy')
+
+# Config sections that style day cells
+DAY_SECTIONS = ('regular_day', 'weekend', 'spec_day')
+
+# Geometry that places and sizes the day cells
+CELL_GEOMETRY = ('day_width', 'day_height', 'gap_x', 'gap_y', 'offset_x', 'offset_y',
+                 'month_header_height', 'dow_height')
+
 
 class MonthRenderer:
     """Renders calendar months."""
@@ -25,6 +40,32 @@ class MonthRenderer:
         self.spec_days = spec_days
         self.months_config = months_config or []
         self.day_renderer = DayRenderer(font_manager, spec_days)
+        # Names of the layers rasterized by the last month_layers call
+        self.rasterized: list[str] = []
+
+    def clear_caches(self):
+        """Drop rendered layers (after fonts or assets changed in place)."""
+        get_layer_cache().clear()
+
+    def day_renderer_for_year(self, year: int) -> DayRenderer:
+        """
+        Get a day renderer with the special days that apply in a year.
+
+        Spec days dated "DD.MM.YYYY" replace the yearly ones of that year.
+
+        Args:
+            year: Year
+
+        Returns:
+            self.day_renderer when no spec day is year-specific, else a
+            renderer for that year
+        """
+        day_renderer = self.day_renderer
+        if all(date.count('.') == 1 for date in day_renderer.spec_days):
+            return day_renderer
+        return DayRenderer(self.font_manager,
+                           DateUtils.spec_days_for_year(day_renderer.spec_days, year),
+                           DateUtils.spec_days_for_year(day_renderer.spec_day_images, year))
 
     def _get_month_config(self, month: int, base_config: dict) -> dict:
         """
@@ -58,6 +99,8 @@ class MonthRenderer:
             merged['text_align'] = month_cfg['text_align']
         if 'title_background' in month_cfg:
             merged['title_background'] = month_cfg['title_background']
+        if 'text_autofit' in month_cfg:
+            merged['text_autofit'] = month_cfg['text_autofit']
         if 'min_width' in month_cfg:
             merged['min_width'] = month_cfg['min_width']
         if 'min_height' in month_cfg:
@@ -74,20 +117,22 @@ class MonthRenderer:
             merged['padding_bottom'] = month_cfg['padding_bottom']
         if 'padding_left' in month_cfg:
             merged['padding_left'] = month_cfg['padding_left']
+        if 'background_color' in month_cfg:
+            merged['background_color'] = month_cfg['background_color']
 
         return merged
 
-    def create_month(self, year: int, month: int, config: dict) -> np.ndarray:
+    def get_month_geometry(self, month: int, config: dict) -> dict:
         """
-        Create calendar for a month.
+        Compute page layout for a month without rendering anything.
 
         Args:
-            year: Year
             month: Month (1-12)
             config: Configuration dict
 
         Returns:
-            BGRA image array
+            Dict with merged month config ('month_cfg') and page geometry:
+            total/content sizes, offsets, header heights, gap and cell size
         """
         day_cfg = config['regular_day']
         base_month_cfg = config['month']
@@ -98,6 +143,8 @@ class MonthRenderer:
         day_width = day_cfg['width']
         day_height = day_cfg['height']
         gap = month_cfg.get('gap', 10)
+        gap_x = month_cfg.get('gap_x', gap)
+        gap_y = month_cfg.get('gap_y', gap)
 
         # Grid: 7 columns (days of week), 6 rows (max weeks + headers)
         cols = 7
@@ -108,8 +155,8 @@ class MonthRenderer:
         dow_size = dow_cfg.get('text_size', 48)
 
         # Header heights with padding (font size + padding for baseline and spacing)
-        month_header_height = month_size + 40
-        dow_height = dow_size + 20
+        month_header_height = month_cfg.get('title_height', month_size + 40)
+        dow_height = dow_cfg.get('header_height', dow_size + 20)
 
         # Get padding from config (support individual sides)
         padding_top = month_cfg.get('padding_top', 0)
@@ -118,8 +165,8 @@ class MonthRenderer:
         padding_left = month_cfg.get('padding_left', 0)
 
         # Total dimensions (content size without padding)
-        content_width = cols * day_width + (cols + 1) * gap
-        content_height = month_header_height + dow_height + rows * day_height + (rows + 1) * gap
+        content_width = cols * day_width + (cols + 1) * gap_x
+        content_height = month_header_height + dow_height + rows * day_height + (rows + 1) * gap_y
 
         # Add padding to content dimensions
         padded_content_width = content_width + padding_left + padding_right
@@ -153,50 +200,105 @@ class MonthRenderer:
         else:  # center
             offset_y = (total_height - content_height) // 2
 
-        # Load month background if specified, otherwise create white background
-        month_bg_path = month_cfg.get('background')
-        if month_bg_path:
-            month_bg = ImageUtils.load_background(month_bg_path, total_width, total_height)
-            if month_bg is not None:
-                month_img = month_bg
-            else:
-                month_img = ImageUtils.create_white_image(total_width, total_height)
-        else:
-            month_img = ImageUtils.create_white_image(total_width, total_height)
-
-        # Draw month title
-        month_name = f"{DateUtils.get_month_name(month)} {year}"
-        month_color = tuple(month_cfg['text_color'])
-        month_font_path = month_cfg.get('text_font', self.font_manager.default_font)
-        month_font = self.font_manager.load_font(month_font_path, month_size)
+        offset_x += month_cfg.get('content_offset_x', 0)
+        offset_y += month_cfg.get('content_offset_y', 0)
+
+        return {
+            'month_cfg': month_cfg,
+            'day_width': day_width,
+            'day_height': day_height,
+            'gap': gap_x,
+            'gap_x': gap_x,
+            'gap_y': gap_y,
+            'month_size': month_size,
+            'dow_size': dow_size,
+            'month_header_height': month_header_height,
+            'dow_height': dow_height,
+            'content_width': content_width,
+            'content_height': content_height,
+            'total_width': total_width,
+            'total_height': total_height,
+            'offset_x': offset_x,
+            'offset_y': offset_y,
+        }
+
+    def _header_strip_key(self, geometry: dict, dow_cfg: dict) -> tuple[tuple, int, int]:
+        """
+        Get the cache key and glyph margins of a weekday header strip.
 
-        # Center title (relative to content area, with offset)
-        title_x = offset_x + content_width // 2
-        title_y = offset_y + month_header_height // 2 + month_size // 4
-        rgb_month_color = (month_color[2], month_color[1], month_color[0])
-        
-        # Draw month background if specified
-        month_title_bg_path = month_cfg.get('title_background')
-        if month_title_bg_path:
-            # Calculate title background area
-            title_bg_width = total_width
-            title_bg_height = month_header_height
-            title_bg = ImageUtils.load_background(month_title_bg_path, title_bg_width, title_bg_height)
-            if title_bg is not None:
-                month_img = ImageUtils.overlay_image(month_img, title_bg, 0, 0)
-        
-        month_img = ImageUtils.draw_text(
-            month_img, month_name, (title_x, title_y),
-            rgb_month_color, month_font, 'center'
+        Returns:
+            (key, margin_x, margin_y)
+        """
+        dow_size = geometry['dow_size']
+
+        # Margin for overhanging glyphs, clamped so the strip stays on the page
+        margin = dow_size // 2 + 2
+        margin_x = min(margin, geometry['offset_x'])
+        margin_y = min(margin, geometry['offset_y'] + geometry['month_header_height'])
+
+        background_color = dow_cfg.get('background_color')
+        key = (
+            dow_cfg.get('background'),
+            tuple(background_color) if background_color else None,
+            tuple(dow_cfg['text_color']),
+            dow_size, self.font_manager.default_font,
+            geometry['day_width'], geometry['dow_height'], geometry['gap'],
+            geometry['content_width'], margin_x, margin_y,
         )
+        return key, margin_x, margin_y
+
+    def _render_header_strip(self, geometry: dict, dow_cfg: dict,
+                             margin_x: int, margin_y: int) -> tuple[np.ndarray, int, int]:
+        """
+        Render the weekday header strip for a page layout.
 
-        # Draw days of week with background
+        The strip covers the content width and header height plus a margin
+        for glyphs and outline that overhang the header; it is transparent
+        outside the weekday backgrounds, cell colors and labels. It is identical for
+        every month sharing the same day_of_the_week style and cell width.
+
+        Args:
+            geometry: Month geometry from get_month_geometry
+            dow_cfg: day_of_the_week configuration
+            margin_x, margin_y: Glyph margins from _header_strip_key
+
+        Returns:
+            (strip, margin_x, margin_y): BGRA strip and the offset of the
+            header's top-left corner inside it
+        """
+        day_width = geometry['day_width']
+        gap = geometry['gap']
+        dow_size = geometry['dow_size']
+        dow_height = geometry['dow_height']
+        background_color = dow_cfg.get('background_color')
+
+        strip = ImageUtils.create_transparent_image(
+            geometry['content_width'] + 2 * margin_x, dow_height + 2 * margin_y
+        )
         dow_font = self.font_manager.get_font(dow_size)
 
+        if background_color:
+            cell = ImageUtils.create_color_image(day_width, dow_height, background_color)
+            for i in range(7):
+                strip = ImageUtils.overlay_layer(
+                    strip, cell, margin_x + gap + i * (day_width + gap), margin_y
+                )
+
+        # Day of week background is decoded and resized once per strip
+        dow_bg_path = dow_cfg.get('background')
+        dow_bg = None
+        if dow_bg_path:
+            dow_bg = ImageUtils.load_background(dow_bg_path, day_width, dow_height)
+        if dow_bg is not None:
+            for i in range(7):
+                strip = ImageUtils.overlay_layer(
+                    strip, dow_bg, margin_x + gap + i * (day_width + gap), margin_y
+                )
+
         for i in range(7):
             dow_name = DateUtils.get_weekday_name(i)
-            dow_x = offset_x + gap + i * (day_width + gap) + day_width // 2
-            dow_y = offset_y + month_header_height + dow_height // 2 + dow_size // 4
+            dow_x = margin_x + gap + i * (day_width + gap) + day_width // 2
+            dow_y = margin_y + dow_height // 2 + dow_size // 4
 
             # Weekends in red
             if i >= 5:
@@ -204,40 +306,639 @@ class MonthRenderer:
             else:
                 dow_color = tuple(reversed(dow_cfg['text_color']))  # BGR -> RGB
 
-            # Draw day of week background if specified
-            dow_bg_path = dow_cfg.get('background')
-            if dow_bg_path:
-                dow_bg_width = day_width
-                dow_bg_height = dow_height
-                dow_bg = ImageUtils.load_background(dow_bg_path, dow_bg_width, dow_bg_height)
-                if dow_bg is not None:
-                    dow_bg_x = offset_x + gap + i * (day_width + gap)
-                    dow_bg_y = offset_y + month_header_height
-                    month_img = ImageUtils.overlay_image(month_img, dow_bg, dow_bg_x, dow_bg_y)
-
-            month_img = ImageUtils.draw_text(
-                month_img, dow_name, (dow_x, dow_y),
+            strip = ImageUtils.draw_text_layer(
+                strip, dow_name, (dow_x, dow_y),
                 dow_color, dow_font, 'center'
             )
 
-        # Get first weekday and days in month
+        return strip, margin_x, margin_y
+
+    def _title_font_size(self, title: str, font_path: str, geometry: dict) -> int:
+        """Get the title size, shrunk to fit the title band when text_autofit is set."""
+        month_cfg = geometry['month_cfg']
+        size = geometry['month_size']
+        if not month_cfg.get('text_autofit'):
+            return size
+        box = (geometry['content_width'], geometry['month_header_height'])
+        return self.font_manager.fit_size(font_path, title, box, size,
+                                          month_cfg.get('min_text_size', DEFAULT_MIN_FONT_SIZE))
+
+    def describe_month(self, year: int, month: int, config: dict) -> dict:
+        """
+        List what create_month would draw, without rasterizing anything.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            config: Configuration dict
+
+        Returns:
+            Dict with 'geometry', 'header_key', 'header_strip' (width,
+            height), 'images' (page-level {'path', 'where', 'size'}), 'texts'
+            ({'font', 'size', 'text', 'where'}; weekday labels are tagged
+            'header') and 'cells' (describe_day results with 'x', 'y')
+        """
+        dow_cfg = config['day_of_the_week']
+        geometry = self.get_month_geometry(month, config)
+        month_cfg = geometry['month_cfg']
+        total_width = geometry['total_width']
+        total_height = geometry['total_height']
+
+        images = []
+        if month_cfg.get('background') and Path(month_cfg['background']).exists():
+            images.append({'path': month_cfg['background'], 'where': 'page',
+                           'size': (total_width, total_height)})
+        if month_cfg.get('title_background') and Path(month_cfg['title_background']).exists():
+            images.append({'path': month_cfg['title_background'], 'where': 'title',
+                           'size': (total_width, geometry['month_header_height'])})
+        dow_bg = dow_cfg.get('background')
+        if dow_bg and Path(dow_bg).exists():
+            images.append({'path': dow_bg, 'where': 'header',
+                           'size': (geometry['day_width'], geometry['dow_height'])})
+
+        month_font = month_cfg.get('text_font', self.font_manager.default_font)
+        month_name = f"{DateUtils.get_month_name(month)} {year}"
+        texts = [{'font': month_font, 'text': month_name, 'where': 'title',
+                  'size': self._title_font_size(month_name, month_font, geometry)}]
+        for i in range(7):
+            texts.append({'font': self.font_manager.default_font, 'size': geometry['dow_size'],
+                          'text': DateUtils.get_weekday_name(i), 'where': 'header'})
+
+        key, margin_x, margin_y = self._header_strip_key(geometry, dow_cfg)
+
+        cells = []
+        day_renderer = self.day_renderer_for_year(year)
+        for day, weekday, x, y in self._day_positions(year, month, geometry):
+            cell = day_renderer.describe_day(day, month, weekday, config)
+            cell['x'] = x
+            cell['y'] = y
+            cells.append(cell)
+
+        return {
+            'geometry': geometry,
+            'header_key': key,
+            'header_strip': (geometry['content_width'] + 2 * margin_x,
+                             geometry['dow_height'] + 2 * margin_y),
+            'images': images,
+            'texts': texts,
+            'cells': cells,
+        }
+
+    def month_assets(self, pages: list[tuple[int, int]], config: dict) -> list[tuple[str, int, int]]:
+        """
+        List the backgrounds create_month loads for some pages, for prefetching.
+
+        Args:
+            pages: (year, month) in render order
+            config: Configuration dict
+
+        Returns:
+            (path, width, height) resize targets in first-use order
+        """
+        assets = {}
+        for year, month in pages:
+            description = self.describe_month(year, month, config)
+            for image in description['images']:
+                assets.setdefault((image['path'], *image['size']), None)
+            for cell in description['cells']:
+                for path in cell['images']:
+                    assets.setdefault((path, cell['width'], cell['height']), None)
+        return list(assets)
+
+    def page_ops(self, year: int, month: int, config: dict) -> dict:
+        """
+        List the drawing operations of create_month, for vector output.
+
+        Page-level operations use the formats of DayRenderer.day_ops in page
+        pixel coordinates; each day cell is one {'type': 'cell', 'box',
+        'opacity', 'ops'} entry whose ops are relative to the cell.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            config: Configuration dict
+
+        Returns:
+            Dict with 'width', 'height' and 'ops' (bottom to top)
+        """
+        dow_cfg = config['day_of_the_week']
+        geometry = self.get_month_geometry(month, config)
+        month_cfg = geometry['month_cfg']
+        total_width = geometry['total_width']
+        month_header_height = geometry['month_header_height']
+        offset_x = geometry['offset_x']
+        offset_y = geometry['offset_y']
+        layout = get_text_layout()
+        ops = []
+
+        month_bg_path = month_cfg.get('background')
+        if month_bg_path and Path(month_bg_path).exists():
+            ops.append({'type': 'image', 'path': month_bg_path,
+                        'box': (0, 0, total_width, geometry['total_height'])})
+        elif month_cfg.get('background_color'):
+            ops.append({'type': 'rect', 'box': (0, 0, total_width, geometry['total_height']),
+                        'color': tuple(month_cfg['background_color'])})
+
+        title_bg_path = month_cfg.get('title_background')
+        if title_bg_path and Path(title_bg_path).exists():
+            ops.append({'type': 'image', 'path': title_bg_path,
+                        'box': (0, 0, total_width, month_header_height)})
+
+        month_name = f"{DateUtils.get_month_name(month)} {year}"
+        month_font_path = month_cfg.get('text_font', self.font_manager.default_font)
+        font = self.font_manager.load_font(
+            month_font_path, self._title_font_size(month_name, month_font_path, geometry))
+        title_y = (offset_y + month_header_height // 2 + geometry['month_size'] // 4
+                   + month_cfg.get('title_offset_y', 0))
+        ops.append({'type': 'text', 'text': month_name, 'font': font,
+                    'origin': layout.aligned_position(
+                        font, month_name, offset_x + geometry['content_width'] // 2, title_y,
+                        'center', 'bottom'),
+                    'color': tuple(month_cfg['text_color']), 'outline': True})
+
+        # Weekday header, as _render_header_strip draws it
+        day_width = geometry['day_width']
+        dow_height = geometry['dow_height']
+        dow_size = geometry['dow_size']
+        dow_font = self.font_manager.get_font(dow_size)
+        dow_bg_path = dow_cfg.get('background')
+        header_y = offset_y + month_header_height
+        for i in range(7):
+            cell_x = offset_x + geometry['gap'] + i * (day_width + geometry['gap'])
+            if dow_cfg.get('background_color'):
+                ops.append({'type': 'rect', 'box': (cell_x, header_y, day_width, dow_height),
+                            'color': tuple(dow_cfg['background_color'])})
+            if dow_bg_path and Path(dow_bg_path).exists():
+                ops.append({'type': 'image', 'path': dow_bg_path,
+                            'box': (cell_x, header_y, day_width, dow_height)})
+        for i in range(7):
+            dow_name = DateUtils.get_weekday_name(i)
+            dow_x = offset_x + geometry['gap'] + i * (day_width + geometry['gap']) + day_width // 2
+            dow_y = header_y + dow_height // 2 + dow_size // 4
+            # The strip takes colors in image channel order; weekends come out blue
+            color = (0, 0, 255) if i >= 5 else tuple(dow_cfg['text_color'])
+            ops.append({'type': 'text', 'text': dow_name, 'font': dow_font,
+                        'origin': layout.aligned_position(dow_font, dow_name, dow_x, dow_y,
+                                                          'center', 'bottom'),
+                        'color': color, 'outline': True})
+
+        day_renderer = self.day_renderer_for_year(year)
+        for day, weekday, x, y in self._day_positions(year, month, geometry):
+            cell = day_renderer.day_ops(day, month, weekday, config)
+            ops.append({'type': 'cell', 'box': (x, y, cell['width'], cell['height']),
+                        'opacity': cell['opacity'], 'ops': cell['ops']})
+
+        return {'width': total_width, 'height': geometry['total_height'], 'ops': ops}
+
+    def _layer(self, name: str, inputs, render) -> tuple[str, object]:
+        """
+        Get a layer from the layer cache, rasterizing it on a miss.
+
+        Args:
+            name: Layer name
+            inputs: Everything the layer depends on (hashed into its key)
+            render: Function returning the raster (None for an empty layer)
+
+        Returns:
+            (key, raster)
+        """
+        cache = get_layer_cache()
+        key = layer_key(name, inputs)
+        raster = cache.get(key)
+        if raster is None:
+            start = time.perf_counter()
+            raster = render()
+            if raster is not None:
+                cache.put(key, raster, cost=time.perf_counter() - start)
+                self.rasterized.append(name)
+        return key, raster
+
+    def month_layers(self, year: int, month: int, config: dict,
+                     cells: dict | None = None) -> dict:
+        """
+        Get a month as named layers, rasterizing only those whose inputs changed.
+
+        Layers are, bottom to top: 'background', 'title_background',
+        'title_text' (glyph masks; the color is applied when flattening),
+        'header' (weekday strip) and 'cells' (day tiles). Each is cached by a
+        hash of its own inputs, so e.g. a new title color re-renders nothing
+        and a new cell style leaves the page layers untouched. The names of
+        layers rasterized by this call are left in self.rasterized.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            config: Configuration dict
+            cells: 'cells' layer to use instead of this renderer's own, e.g.
+                another config's with the same day styles and CELL_GEOMETRY
+
+        Returns:
+            Dict with 'geometry' and, per layer name, {'key', 'raster'};
+            'title_text' also has 'color' and 'header' has 'position'
+        """
+        self.rasterized = []
+        dow_cfg = config['day_of_the_week']
+        geometry = self.get_month_geometry(month, config)
+        month_cfg = geometry['month_cfg']
+        month_size = geometry['month_size']
+        month_header_height = geometry['month_header_height']
+        content_width = geometry['content_width']
+        total_width = geometry['total_width']
+        total_height = geometry['total_height']
+        offset_x = geometry['offset_x']
+        offset_y = geometry['offset_y']
+        layers = {'geometry': geometry}
+
+        # Month background if specified, otherwise a plain page
+        month_bg_path = month_cfg.get('background')
+        page_color = month_cfg.get('background_color')
+
+        def render_background():
+            month_img = None
+            if month_bg_path:
+                month_img = ImageUtils.load_background(month_bg_path, total_width, total_height)
+            if month_img is None:
+                if page_color:
+                    month_img = ImageUtils.create_color_image(total_width, total_height, page_color)
+                else:
+                    month_img = ImageUtils.create_white_image(total_width, total_height)
+            return month_img
+
+        key, raster = self._layer(
+            'background', [file_signature(month_bg_path), page_color, total_width, total_height],
+            render_background
+        )
+        layers['background'] = {'key': key, 'raster': raster}
+
+        # Title background across the title band
+        title_bg_path = month_cfg.get('title_background')
+        key, raster = self._layer(
+            'title_background', [file_signature(title_bg_path), total_width, month_header_height],
+            lambda: (ImageUtils.load_background(title_bg_path, total_width, month_header_height)
+                     if title_bg_path else None)
+        )
+        layers['title_background'] = {'key': key, 'raster': raster}
+
+        # Month title, centered on the content area (with offset)
+        month_name = f"{DateUtils.get_month_name(month)} {year}"
+        month_color = tuple(month_cfg['text_color'])
+        month_font_path = month_cfg.get('text_font', self.font_manager.default_font)
+        title_size = self._title_font_size(month_name, month_font_path, geometry)
+        title_x = offset_x + content_width // 2
+        title_y = (offset_y + month_header_height // 2 + month_size // 4
+                   + month_cfg.get('title_offset_y', 0))
+        key, raster = self._layer(
+            'title_text',
+            [month_name, month_font_path, title_size, title_x, title_y, total_width, total_height],
+            lambda: ImageUtils.text_masks(
+                (total_width, total_height), month_name, (title_x, title_y),
+                self.font_manager.load_font(month_font_path, title_size), 'center'
+            )
+        )
+        layers['title_text'] = {'key': key, 'raster': raster,
+                                'color': (month_color[2], month_color[1], month_color[0])}
+
+        # Days of week: one strip blitted in a single operation
+        strip_key, margin_x, margin_y = self._header_strip_key(geometry, dow_cfg)
+        key, raster = self._layer(
+            'header', [strip_key, file_signature(dow_cfg.get('background'))],
+            lambda: self._render_header_strip(geometry, dow_cfg, margin_x, margin_y)
+        )
+        layers['header'] = {'key': key, 'raster': raster,
+                            'position': (offset_x - margin_x,
+                                         offset_y + month_header_height - margin_y)}
+
+        if cells is not None:
+            layers['cells'] = cells
+            return layers
+        cell_inputs = self._cell_inputs(year, month, config, geometry)
+        key, raster = self._layer(
+            'cells', cell_inputs,
+            lambda: self._render_cells(year, month, config, geometry, cell_inputs)
+        )
+        layers['cells'] = {'key': key, 'raster': raster}
+        return layers
+
+    def _render_cells(self, year: int, month: int, config: dict, geometry: dict,
+                      cell_inputs: list) -> list[tuple]:
+        """
+        Render the day tiles of a month for the 'cells' layer.
+
+        A tile depends on the weekday only through weekend styling, so
+        tiles are cached individually and months with another grid pattern
+        (other years) reuse them.
+        """
+        cache = get_layer_cache()
+        shared = cell_inputs[1:]
+        cells = []
+        for day, weekday, x, y in self._day_positions(year, month, geometry):
+            tile = cache.get_or_create(
+                layer_key('cell', [shared, day, DateUtils.is_weekend(weekday)]),
+                lambda: self.day_renderer.create_day_image(day, month, weekday, config))
+            cells.append((day, weekday, tile, x, y))
+        return cells
+
+    def _cell_inputs(self, year: int, month: int, config: dict, geometry: dict) -> list:
+        """
+        Everything the day cells of a month depend on, for the 'cells' layer key.
+
+        The year only enters through the grid pattern (first weekday and
+        length, the first item), so years sharing it share the layer. Year-specific special
+        days are not part of it; create_month redraws them on top.
+        """
+        suffix = f".{month:02d}"
+        spec_days = {date: info for date, info in self.day_renderer.spec_days.items()
+                     if date.endswith(suffix)}
+        sections = {name: config.get(name) for name in DAY_SECTIONS}
+        files = [file_signature(cfg.get('background')) for cfg in sections.values() if cfg]
+        for info in spec_days.values():
+            files.append(file_signature(info.get('background')))
+            files.append(file_signature(info.get('style', {}).get('background')))
+        images = {date: array_signature(image)
+                  for date, image in self.day_renderer.spec_day_images.items()
+                  if date.endswith(suffix)}
+        cell_geometry = [geometry[name] for name in CELL_GEOMETRY]
+        pattern = [DateUtils.get_first_weekday(year, month), DateUtils.get_days_in_month(year, month)]
+        return [pattern, month, sections, spec_days, files, images, cell_geometry,
+                self.font_manager.default_font]
+
+    def flatten_page(self, layers: dict) -> np.ndarray:
+        """
+        Composite the layers under the day cells into one page.
+
+        The result is cached by the keys of its layers (and the title
+        color), so re-rendering a month whose cells alone changed starts
+        from a finished page.
+
+        Args:
+            layers: month_layers result
+
+        Returns:
+            BGRA image array (shared, do not modify)
+        """
+        title = layers['title_text']
+        header = layers['header']
+        inputs = [layers['background']['key'], layers['title_background']['key'],
+                  title['key'], title['color'], header['key'], header['position']]
+
+        def render():
+            month_img = layers['background']['raster']
+            title_bg = layers['title_background']['raster']
+            if title_bg is not None:
+                month_img = ImageUtils.overlay_image(month_img, title_bg, 0, 0)
+            month_img = ImageUtils.apply_text_masks(month_img, title['raster'], title['color'])
+            strip, _, _ = header['raster']
+            return ImageUtils.overlay_image(month_img, strip, *header['position'])
+
+        return get_layer_cache().get_or_create(layer_key('page', inputs), render)
+
+    def flatten(self, layers: dict) -> np.ndarray:
+        """
+        Composite all layers of a month.
+
+        Args:
+            layers: month_layers result
+
+        Returns:
+            BGRA image array
+        """
+        placements = [(tile, x, y) for _, _, tile, x, y in layers['cells']['raster']]
+        return ImageUtils.composite_batch(self.flatten_page(layers), placements)
+
+    def _day_positions(self, year: int, month: int,
+                       geometry: dict) -> list[tuple[int, int, int, int]]:
+        """
+        Get grid placement of every day of a month.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            geometry: get_month_geometry result
+
+        Returns:
+            List of (day, weekday, x, y) for days 1..N
+        """
         first_weekday = DateUtils.get_first_weekday(year, month)
         days_in_month = DateUtils.get_days_in_month(year, month)
-
-        # Draw days
-        start_y = offset_y + month_header_height + dow_height + gap
+        gap_x = geometry['gap_x']
+        gap_y = geometry['gap_y']
+        day_width = geometry['day_width']
+        day_height = geometry['day_height']
+        offset_x = geometry['offset_x']
+        start_y = (geometry['offset_y'] + geometry['month_header_height']
+                   + geometry['dow_height'] + gap_y)
+
+        positions = []
         for day in range(1, days_in_month + 1):
             weekday = datetime(year, month, day).weekday()
             week_num = (first_weekday + day - 1) // 7
             day_num = (first_weekday + day - 1) % 7
 
-            x = offset_x + gap + day_num * (day_width + gap)
-            y = start_y + week_num * (day_height + gap)
+            x = offset_x + gap_x + day_num * (day_width + gap_x)
+            y = start_y + week_num * (day_height + gap_y)
+            positions.append((day, weekday, x, y))
+        return positions
+
+    def under_cells(self, layers: dict) -> np.ndarray:
+        """
+        Composite the page layers under the day cells, leaving out the title.
+
+        Cached by the keys of its layers, none of which depend on the year.
+
+        Args:
+            layers: month_layers result
+
+        Returns:
+            BGRA image array (shared, do not modify)
+        """
+        header = layers['header']
+        inputs = [layers['background']['key'], layers['title_background']['key'],
+                  header['key'], header['position']]
+
+        def render():
+            month_img = layers['background']['raster']
+            title_bg = layers['title_background']['raster']
+            if title_bg is not None:
+                month_img = ImageUtils.overlay_image(month_img, title_bg, 0, 0)
+            strip, _, _ = header['raster']
+            return ImageUtils.overlay_image(month_img, strip, *header['position'])
+
+        return get_layer_cache().get_or_create(layer_key('under_cells', inputs), render)
+
+    def grid_page(self, layers: dict) -> np.ndarray | None:
+        """
+        Get the month page with its day cells but without the title.
+
+        Cached by the keys of its layers, so years whose month starts on the
+        same weekday and has the same length render the grid once and only
+        stamp their own title (see stamp_title). Drawing the title last gives
+        the same pixels as drawing it under the header and cells only when
+        it overlaps neither.
+
+        Args:
+            layers: month_layers result
+
+        Returns:
+            BGRA image array (shared, do not modify), or None if the title
+            reaches into the weekday header or a cell
+        """
+        header = layers['header']
+        strip, _, _ = header['raster']
+        hx, hy = header['position']
+        boxes = [(hx, hy, hx + strip.shape[1], hy + strip.shape[0])]
+        boxes += [(x, y, x + tile.shape[1], y + tile.shape[0])
+                  for _, _, tile, x, y in layers['cells']['raster']]
+        for _, (left, top, right, bottom), _ in layers['title_text']['raster']:
+            if any(left < x1 and x0 < right and top < y1 and y0 < bottom
+                   for x0, y0, x1, y1 in boxes):
+                return None
+
+        inputs = [layers['background']['key'], layers['title_background']['key'],
+                  header['key'], header['position'], layers['cells']['key']]
+
+        def render():
+            self.rasterized.append('grid')
+            placements = [(tile, x, y) for _, _, tile, x, y in layers['cells']['raster']]
+            return ImageUtils.composite_batch(self.under_cells(layers), placements)
+
+        return get_layer_cache().get_or_create(layer_key('grid', inputs), render)
+
+    @staticmethod
+    def stamp_title(grid: np.ndarray, title: dict) -> np.ndarray:
+        """
+        Draw the title onto a copy of a grid page.
+
+        Only the band the title masks cover goes through PIL.
 
-            # Create day image
-            day_img = self.day_renderer.create_day_image(day, month, weekday, config)
+        Args:
+            grid: grid_page result
+            title: The 'title_text' entry of month_layers
+
+        Returns:
+            New BGRA image array
+        """
+        page = grid.copy()
+        masks = title['raster']
+        if not masks:
+            return page
+        left = min(box[0] for _, box, _ in masks)
+        top = min(box[1] for _, box, _ in masks)
+        right = max(box[2] for _, box, _ in masks)
+        bottom = max(box[3] for _, box, _ in masks)
+        shifted = [(is_outline, (box[0] - left, box[1] - top, box[2] - left, box[3] - top), mask)
+                   for is_outline, box, mask in masks]
+        page[top:bottom, left:right] = ImageUtils.apply_text_masks(
+            page[top:bottom, left:right], shifted, title['color'])
+        return page
 
-            # Overlay on month
-            month_img = ImageUtils.overlay_image(month_img, day_img, x, y)
+    def create_month(self, year: int, month: int, config: dict) -> np.ndarray:
+        """
+        Create calendar for a month.
+
+        Only layers whose inputs changed since they were last rendered are
+        rasterized; the rest come from the layer cache (see month_layers).
+        The finished grid is cached across years (see grid_page), and days
+        with a year-specific special day ("DD.MM.YYYY") are redrawn on top.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            config: Configuration dict
 
-        return month_img
+        Returns:
+            BGRA image array
+        """
+        layers = self.month_layers(year, month, config)
+        days = DateUtils.year_specific_days(self.day_renderer.spec_days, year, month)
+        grid = self.grid_page(layers)
+        if grid is None:
+            # The title overlaps the header or cells: draw in page order
+            page = self.flatten_page(layers)
+            base = self._month_base(layers, page) if days else None
+            placements = [(tile, x, y) for _, _, tile, x, y in layers['cells']['raster']]
+            # Release page layers the cache did not keep before compositing cells
+            del layers
+            page = ImageUtils.composite_batch(page, placements)
+        else:
+            base = self._month_base(layers, self.under_cells(layers)) if days else None
+            page = self.stamp_title(grid, layers['title_text'])
+        if not days:
+            return page
+        base['page'] = page
+        return self.recomposite_days(base, month, days, config, self.day_renderer_for_year(year))
+
+    @staticmethod
+    def _month_base(layers: dict, under_cells: np.ndarray) -> dict:
+        """create_month_base-style dict (without 'page') for recomposite_days."""
+        cells = {day: (weekday, x, y, tile.shape[1], tile.shape[0])
+                 for day, weekday, tile, x, y in layers['cells']['raster']}
+        return {'under_cells': under_cells, 'cells': cells}
+
+    def create_month_base(self, year: int, month: int, config: dict,
+                          cells: dict | None = None) -> dict:
+        """
+        Render a month and keep what is needed to swap single cells later.
+
+        Like create_month, the cached grid is used when the title overlaps
+        no cell, so a config that differs only in its title layers (with
+        the cells of another config passed in) re-renders just the title.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            config: Configuration dict
+            cells: 'cells' layer to reuse (see month_layers)
+
+        Returns:
+            Dict with 'page' (finished month), 'under_cells' (the page before
+            cells were composited), 'cells' (day -> (weekday, x, y, width,
+            height)) and 'cells_layer' (the month's 'cells' layer)
+        """
+        layers = self.month_layers(year, month, config, cells)
+        grid = self.grid_page(layers)
+        if grid is None:
+            base = self._month_base(layers, self.flatten_page(layers))
+            base['page'] = self.flatten(layers)
+        else:
+            base = self._month_base(layers, self.under_cells(layers))
+            base['page'] = self.stamp_title(grid, layers['title_text'])
+        base['cells_layer'] = layers['cells']
+        days = DateUtils.year_specific_days(self.day_renderer.spec_days, year, month)
+        if days:
+            base['page'] = self.recomposite_days(base, month, days, config,
+                                                 self.day_renderer_for_year(year))
+        return base
+
+    def recomposite_days(self, base: dict, month: int, days: list[int], config: dict,
+                         day_renderer: DayRenderer) -> np.ndarray:
+        """
+        Redraw some cells of a month rendered by create_month_base.
+
+        Each cell area is restored from the page under the cells and the new
+        cell is blended onto it, so the result matches a full render with
+        day_renderer's special days (cells do not overlap their neighbours).
+
+        Args:
+            base: create_month_base result
+            month: Month (1-12)
+            days: Day numbers to redraw
+            config: Configuration dict
+            day_renderer: Renderer holding the replacement special days
+
+        Returns:
+            BGRA image array (base is left unchanged)
+        """
+        page = base['page'].copy()
+        under_cells = base['under_cells']
+        page_h, page_w = page.shape[:2]
+        for day in days:
+            weekday, x, y, old_w, old_h = base['cells'][day]
+            page[y:y + old_h, x:x + old_w] = under_cells[y:y + old_h, x:x + old_w]
+
+            day_img = day_renderer.create_day_image(day, month, weekday, config)
+            h = min(day_img.shape[0], page_h - y)
+            w = min(day_img.shape[1], page_w - x)
+            page[y:y + h, x:x + w] = ImageUtils.overlay_image(
+                under_cells[y:y + h, x:x + w], day_img, 0, 0
+            )
+        return page
@@ -0,0 +1,211 @@
+"""Vector PDF export of month pages, driven by the renderers' layout."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from src.utils.lazy_import import lazy_import
+from src.utils.cache_registry import file_signature
+from src.utils.layer_cache import array_signature
+from src.utils.image_utils import ImageUtils
+from src.utils.pdf_writer import PdfCanvas, PdfWriter
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+
+# Pixels per inch of the page geometry (2480x3508 px pages become A4)
+PDF_DPI = 300
+
+# Width of the white text outline in pixels (the raster outline is 1 px)
+OUTLINE_WIDTH = 1
+
+
+def load_image_source(path: str) -> tuple | None:
+    """
+    Read an image file for embedding.
+
+    Baseline and progressive JPEGs in RGB or grayscale are embedded as
+    they are (no decode, no re-encode); anything else is decoded to pixels
+    at its own resolution.
+
+    Args:
+        path: Image file path
+
+    Returns:
+        ('jpeg', data, width, height, channels), ('pixels', BGRA/BGR
+        array) or None if the file cannot be read
+    """
+    try:
+        with Image.open(path) as img:
+            if img.format == 'JPEG' and img.mode in ('RGB', 'L'):
+                return ('jpeg', Path(path).read_bytes(), img.width, img.height,
+                        1 if img.mode == 'L' else 3)
+    except Exception:
+        pass
+    pixels = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if pixels is None:
+        return None
+    return ('pixels', ImageUtils.ensure_bgra(pixels))
+
+
+class PdfExporter:
+    """
+    Writes months as vector PDF pages.
+
+    Text is set in the embedded (subset) font files at the positions the
+    raster renderer uses, so it stays sharp at any zoom and can be
+    searched and copied. Each distinct background file is embedded once as
+    an image XObject at its own resolution and referenced by every cell
+    that shows it. Fonts that cannot be embedded (no file, or a license
+    that forbids it) fall back to rasterized glyph masks.
+    """
+
+    def __init__(self, generator, dpi: float = PDF_DPI):
+        """
+        Initialize PDF exporter.
+
+        Args:
+            generator: CalendarGenerator providing config and renderers
+            dpi: Pixels per inch of the page geometry
+        """
+        self.generator = generator
+        self.dpi = dpi
+        self.writer = PdfWriter()
+        self.pages = 0
+        self.text_ops = 0
+        self.raster_text_ops = 0
+        self.image_draws = 0
+
+    def add_month(self, year: int, month: int):
+        """
+        Add one page for a month.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+        """
+        generator = self.generator
+        page = generator.month_renderer.page_ops(year, month, generator.config)
+        canvas = PdfCanvas()
+        self._draw_ops(canvas, page['ops'], 0, 0, (page['width'], page['height']))
+        self.writer.add_page(canvas, page['width'], page['height'], self.dpi)
+        self.pages += 1
+
+    def _draw_ops(self, canvas: PdfCanvas, ops: list[dict], dx: int, dy: int,
+                  page_size: tuple[int, int]):
+        for op in ops:
+            kind = op['type']
+            if kind == 'rect':
+                x, y, w, h = op['box']
+                canvas.rect(x + dx, y + dy, w, h, op['color'])
+            elif kind == 'image':
+                self._draw_image(canvas, op, dx, dy)
+            elif kind == 'text':
+                self._draw_text(canvas, op, dx, dy, page_size)
+            elif kind == 'cell':
+                self._draw_cell(canvas, op, page_size)
+
+    def _draw_image(self, canvas: PdfCanvas, op: dict, dx: int, dy: int):
+        if 'pixels' in op:
+            pixels = op['pixels']
+            name = self.writer.image(('pixels', array_signature(pixels)), lambda: ('pixels', pixels))
+        else:
+            path = op['path']
+            name = self.writer.image(('file', file_signature(path)), lambda: load_image_source(path))
+        if name is not None:
+            x, y, w, h = op['box']
+            canvas.image(name, x + dx, y + dy, w, h)
+            self.image_draws += 1
+
+    def _draw_cell(self, canvas: PdfCanvas, op: dict, page_size: tuple[int, int]):
+        """Draw a day cell clipped to its box, as a transparency group if translucent."""
+        x, y, w, h = op['box']
+        target = canvas if op['opacity'] >= 1.0 else PdfCanvas()
+        target.save()
+        target.clip(x, y, w, h)
+        self._draw_ops(target, op['ops'], x, y, page_size)
+        target.restore()
+        if target is not canvas:
+            form = self.writer.form(target, op['box'])
+            canvas.form(form, self.writer.alpha_state(round(op['opacity'], 4)))
+
+    def _draw_text(self, canvas: PdfCanvas, op: dict, dx: int, dy: int,
+                   page_size: tuple[int, int]):
+        font = op['font']
+        text = op['text']
+        x, y = op['origin'][0] + dx, op['origin'][1] + dy
+        path = getattr(font, 'path', None)
+        embedded = self.writer.font(path, getattr(font, 'index', 0)) if isinstance(path, str) else None
+        if embedded is None:
+            self._draw_text_masks(canvas, op, x, y, page_size)
+            return
+
+        # PIL's pen positions (hinted advances and kerning) for each character
+        positions = [font.getlength(text[:i]) for i in range(len(text))]
+        ascent, _ = font.getmetrics()
+        canvas.text(embedded, font.size, x, y + ascent, text, positions, op['color'],
+                    OUTLINE_WIDTH if op['outline'] else 0)
+        self.text_ops += 1
+
+    def _draw_text_masks(self, canvas: PdfCanvas, op: dict, x: int, y: int,
+                         page_size: tuple[int, int]):
+        """Fallback for fonts without an embeddable file: glyph coverage as images."""
+        masks = ImageUtils.text_masks(page_size, op['text'], (x, y), op['font'],
+                                      'left', op['outline'], 'top')
+        for is_outline, box, mask in masks:
+            color = (255, 255, 255) if is_outline else op['color']
+            pixels = np.empty((mask.height, mask.width, 4), dtype=np.uint8)
+            pixels[:, :, :3] = color[2], color[1], color[0]
+            pixels[:, :, 3] = np.asarray(mask)
+            key = ('mask', op['text'], id(op['font']), box, is_outline, tuple(color))
+            name = self.writer.image(key, lambda: ('pixels', pixels))
+            canvas.image(name, box[0], box[1], box[2] - box[0], box[3] - box[1])
+        self.raster_text_ops += 1
+
+    def save(self, path: str) -> int:
+        """
+        Write the PDF.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            File size in bytes
+        """
+        return self.writer.save(path)
+
+
+def export_pdf(generator, year: int, path: str, months: list[int] | None = None,
+               dpi: float = PDF_DPI) -> dict:
+    """
+    Export months as one vector PDF, one page per month.
+
+    Args:
+        generator: CalendarGenerator
+        year: Year
+        path: Output PDF path
+        months: Month numbers (all twelve if None)
+        dpi: Pixels per inch of the page geometry
+
+    Returns:
+        Dict with 'path', 'pages', 'bytes', 'images' (distinct embedded
+        images), 'image_draws', 'text_ops', 'raster_text_ops' and 'seconds'
+    """
+    start = time.perf_counter()
+    exporter = PdfExporter(generator, dpi)
+    for month in months or range(1, 13):
+        exporter.add_month(year, month)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    size = exporter.save(path)
+    return {
+        'path': path,
+        'pages': exporter.pages,
+        'bytes': size,
+        'images': exporter.writer.image_count,
+        'image_draws': exporter.image_draws,
+        'text_ops': exporter.text_ops,
+        'raster_text_ops': exporter.raster_text_ops,
+        'seconds': time.perf_counter() - start,
+    }
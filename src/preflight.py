@@ -0,0 +1,210 @@
+"""Pre-flight validation of assets and fonts referenced by a config."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.utils.lazy_import import lazy_import
+from src.utils.font_index import get_font_index
+from src.month_renderer import DAY_SECTIONS, MonthRenderer
+
+Image = lazy_import('PIL.Image')
+
+# Source is resized up by more than this factor -> visibly soft output
+MAX_UPSCALE = 2.0
+# Relative aspect ratio change above this -> visibly stretched output
+MAX_ASPECT_DISTORTION = 0.15
+
+
+def collect_assets(config: dict, month_renderer: MonthRenderer | None = None) -> list[dict]:
+    """
+    Collect every image and font a render of this config will use.
+
+    Image targets use the same geometry as MonthRenderer, so sizes are the
+    actual resize targets.
+
+    Args:
+        config: Configuration dict
+        month_renderer: Renderer used for page geometry (created if None)
+
+    Returns:
+        List of refs: {'kind': 'image'|'font', 'path', 'where', 'size'}
+        where 'size' is the (width, height) target for images, else None
+    """
+    if month_renderer is None:
+        month_renderer = MonthRenderer(None, {}, config.get('months', []))
+
+    refs = []
+
+    def add_image(path, where, width, height):
+        if path:
+            refs.append({'kind': 'image', 'path': path, 'where': where,
+                         'size': (width, height)})
+
+    def add_font(path, where):
+        if path:
+            refs.append({'kind': 'font', 'path': path, 'where': where, 'size': None})
+
+    # Month pages: background, title background, weekday header
+    dow_cfg = config.get('day_of_the_week', {})
+    for month in range(1, 13):
+        geometry = month_renderer.get_month_geometry(month, config)
+        month_cfg = geometry['month_cfg']
+        where = f"months[{month - 1}]"
+        add_image(month_cfg.get('background'), f"{where}.background",
+                  geometry['total_width'], geometry['total_height'])
+        add_image(month_cfg.get('title_background'), f"{where}.title_background",
+                  geometry['total_width'], geometry['month_header_height'])
+        add_image(dow_cfg.get('background'), 'day_of_the_week.background',
+                  geometry['day_width'], geometry['dow_height'])
+        add_font(month_cfg.get('text_font'), f"{where}.text_font")
+
+    # Day cells
+    for section in DAY_SECTIONS:
+        cfg = config.get(section, {})
+        add_image(cfg.get('background'), f"{section}.background",
+                  cfg.get('width', 0), cfg.get('height', 0))
+        add_font(cfg.get('text_font'), f"{section}.text_font")
+        add_font(cfg.get('label', {}).get('text_font'), f"{section}.label.text_font")
+
+    # Spec days drawn from in-memory images do not read their background files
+    spec_cfg = config.get('spec_day', {})
+    in_memory = month_renderer.day_renderer.spec_day_images
+    for i, spec_day in enumerate(config.get('spec_days', [])):
+        if spec_day.get('date') in in_memory:
+            continue
+        add_image(spec_day.get('background'),
+                  f"spec_days[{i}] ({spec_day.get('date', '?')}).background",
+                  spec_cfg.get('width', 0), spec_cfg.get('height', 0))
+
+    return refs
+
+
+def read_image_header(path: str) -> dict:
+    """
+    Read image dimensions and mode without decoding pixel data.
+
+    Args:
+        path: Path to image file
+
+    Returns:
+        Dict with 'exists', 'error', 'width', 'height', 'mode', 'alpha'
+    """
+    info = {'exists': False, 'error': None, 'width': 0, 'height': 0,
+            'mode': None, 'alpha': False}
+    if not Path(path).is_file():
+        return info
+    info['exists'] = True
+    try:
+        # Image.open only parses the header; pixels load on first access
+        with Image.open(path) as img:
+            info['width'], info['height'] = img.size
+            info['mode'] = img.mode
+            info['alpha'] = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+    except Exception as e:
+        info['error'] = str(e)
+    return info
+
+
+def _check_image(ref: dict, header: dict) -> list[dict]:
+    """Evaluate one image reference against its header."""
+    path, where = ref['path'], ref['where']
+    if not header['exists']:
+        return [_issue('error', 'missing', ref, f"{where}: file not found: {path}")]
+    if header['error']:
+        return [_issue('error', 'unreadable', ref,
+                       f"{where}: cannot read {path}: {header['error']}")]
+
+    issues = []
+    src_w, src_h = header['width'], header['height']
+    dst_w, dst_h = ref['size']
+    if src_w <= 0 or src_h <= 0 or dst_w <= 0 or dst_h <= 0:
+        return issues
+
+    upscale = max(dst_w / src_w, dst_h / src_h)
+    if upscale > MAX_UPSCALE:
+        issues.append(_issue(
+            'warning', 'upscale', ref,
+            f"{where}: {path} is {src_w}x{src_h}, upscaled x{upscale:.1f} to {dst_w}x{dst_h}"
+        ))
+
+    distortion = (src_w / src_h) / (dst_w / dst_h) - 1.0
+    if abs(distortion) > MAX_ASPECT_DISTORTION:
+        issues.append(_issue(
+            'warning', 'aspect', ref,
+            f"{where}: {path} aspect {src_w}x{src_h} stretched to {dst_w}x{dst_h} "
+            f"({distortion:+.0%})"
+        ))
+    return issues
+
+
+def _check_font(ref: dict) -> list[dict]:
+    """Evaluate one font reference against the font index."""
+    resolved = get_font_index().resolve(ref['path'])
+    if resolved is None:
+        return [_issue('warning', 'font', ref,
+                       f"{ref['where']}: font not found, default font used: {ref['path']}")]
+    return []
+
+
+def _issue(severity: str, kind: str, ref: dict, message: str) -> dict:
+    return {'severity': severity, 'kind': kind, 'path': ref['path'],
+            'where': ref['where'], 'message': message}
+
+
+def run_preflight(config: dict, month_renderer: MonthRenderer | None = None,
+                  max_workers: int = 8) -> list[dict]:
+    """
+    Check every asset and font referenced by a config in one pass.
+
+    Image headers are read in parallel, once per distinct file.
+
+    Args:
+        config: Configuration dict
+        month_renderer: Renderer used for page geometry (created if None)
+        max_workers: Thread pool size for header reads
+
+    Returns:
+        List of issues: {'severity': 'error'|'warning', 'kind', 'path',
+        'where', 'message'}, deduplicated, errors first
+    """
+    refs = collect_assets(config, month_renderer)
+
+    image_paths = sorted({r['path'] for r in refs if r['kind'] == 'image'})
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(image_paths)))) as pool:
+        headers = dict(zip(image_paths, pool.map(read_image_header, image_paths)))
+
+    issues = []
+    seen = set()
+    for ref in refs:
+        if ref['kind'] == 'image':
+            found = _check_image(ref, headers[ref['path']])
+        else:
+            found = _check_font(ref)
+        for issue in found:
+            if issue['message'] not in seen:
+                seen.add(issue['message'])
+                issues.append(issue)
+
+    issues.sort(key=lambda i: i['severity'] != 'error')
+    return issues
+
+
+def format_preflight_report(issues: list[dict]) -> str:
+    """
+    Format pre-flight issues for console output.
+
+    Args:
+        issues: Issues returned by run_preflight
+
+    Returns:
+        Multi-line report
+    """
+    if not issues:
+        return "Pre-flight: all assets OK"
+    errors = sum(1 for i in issues if i['severity'] == 'error')
+    lines = [f"Pre-flight: {errors} error(s), {len(issues) - errors} warning(s)"]
+    for issue in issues:
+        lines.append(f"  [{issue['severity'].upper()}] {issue['message']}")
+    return "\n".join(lines)
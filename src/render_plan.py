@@ -0,0 +1,227 @@
+"""Dry-run render plans: predicted memory, pixel work, asset reads and fonts."""
+
+from __future__ import annotations
+
+from src.preflight import read_image_header
+from src.utils.image_utils import BATCH_BLEND_BYTES, ImageUtils
+
+BYTES_PER_PIXEL = 4  # BGRA uint8
+FLOAT_BYTES = 8  # float64 scratch used by alpha blending
+# float64 arrays alive at once inside ImageUtils._blend_into (measured)
+BLEND_SCRATCH_ARRAYS = 7
+
+MODE_CHANNELS = {'1': 1, 'L': 1, 'P': 1, 'LA': 2, 'PA': 2, 'I;16': 2,
+                 'RGB': 3, 'YCbCr': 3, 'RGBA': 4, 'CMYK': 4}
+
+
+def _decoded_size(path: str, header: dict, size) -> tuple[int, int]:
+    """Source dimensions as decoded for a target size (reduced JPEG decode)."""
+    factor = ImageUtils.reduced_decode_factor(path, size[0], size[1])
+    # libjpeg rounds scaled dimensions up
+    return -(-header['width'] // factor), -(-header['height'] // factor)
+
+
+def _decode_bytes(header: dict, width: int, height: int) -> int:
+    """Bytes of a decoded source image before BGRA conversion."""
+    channels = MODE_CHANNELS.get(header['mode'], 4)
+    return width * height * channels
+
+
+def plan_month(description: dict, headers: dict[str, dict],
+               header_cached: bool = False) -> dict:
+    """
+    Predict the cost of rendering one month from its description.
+
+    Peak memory is the largest of the render phases, assuming cold caches:
+    page background decode and resize, title drawing (the page is copied to
+    PIL and back), header blit, and batch compositing of the day cells. It
+    counts image buffers only, not the interpreter and library baseline.
+
+    Args:
+        description: MonthRenderer.describe_month result
+        headers: Image path -> read_image_header result
+        header_cached: Whether the weekday header strip is already rendered
+
+    Returns:
+        Dict with 'canvas' (width, height), 'peak_bytes', 'composites',
+        'text_draws', 'cells' and 'phases' (bytes per phase)
+    """
+    geometry = description['geometry']
+    width, height = geometry['total_width'], geometry['total_height']
+    page = width * height * BYTES_PER_PIXEL
+
+    def load_cost(path, size):
+        header = headers.get(path)
+        target = size[0] * size[1] * BYTES_PER_PIXEL
+        if not header or not header['exists']:
+            return target
+        decoded_w, decoded_h = _decoded_size(path, header, size)
+        # imread result + BGRA copy + resized target
+        return (_decode_bytes(header, decoded_w, decoded_h)
+                + decoded_w * decoded_h * BYTES_PER_PIXEL + target)
+
+    images = {image['where']: image for image in description['images']}
+    phases = {'background': page}
+    if 'page' in images:
+        phases['background'] = load_cost(images['page']['path'], images['page']['size'])
+
+    title_bg = 0
+    if 'title' in images:
+        title_bg = load_cost(images['title']['path'], images['title']['size'])
+    phases['title'] = max(page + title_bg, 3 * page)
+
+    strip_w, strip_h = description['header_strip']
+    strip = strip_w * strip_h * BYTES_PER_PIXEL
+    header_build = 0
+    if not header_cached:
+        header_build = 2 * strip
+        if 'header' in images:
+            header_build += load_cost(images['header']['path'], images['header']['size'])
+    phases['header'] = page + strip + max(page, header_build)
+
+    cells = description['cells']
+    tiles = sum(c['width'] * c['height'] for c in cells) * BYTES_PER_PIXEL
+    cell_load = max((load_cost(path, (c['width'], c['height']))
+                     for c in cells for path in c['images']), default=0)
+    scratch = 0
+    if cells:
+        tile_pixels = cells[0]['width'] * cells[0]['height']
+        chunk = max(1, BATCH_BLEND_BYTES // (tile_pixels * BYTES_PER_PIXEL * FLOAT_BYTES))
+        chunk_pixels = min(chunk, len(cells)) * tile_pixels
+        # Gathered roi and tile copies plus float64 blend arrays per chunk
+        scratch = chunk_pixels * (2 * BYTES_PER_PIXEL + BLEND_SCRATCH_ARRAYS * FLOAT_BYTES)
+    # Tiles are held until the batch composite, which copies the page and
+    # stacks the tiles once more
+    phases['cells'] = page + tiles + max(cell_load, page + tiles + scratch)
+
+    page_composites = len([w for w in images if w == 'title']) + 1  # title bg, header blit
+    cell_composites = sum(len(c['images']) + c['memory_images'] for c in cells) + len(cells)
+    header_composites = 0 if header_cached else 7 * ('header' in images)
+
+    texts = description['texts']
+    text_draws = sum(1 for t in texts if t['where'] != 'header' or not header_cached)
+    text_draws += len(cells) + sum(len(c['labels']) for c in cells)
+
+    return {
+        'canvas': (width, height),
+        'peak_bytes': max(phases.values()),
+        'composites': page_composites + cell_composites + header_composites,
+        'text_draws': text_draws,
+        'cells': len(cells),
+        'phases': phases,
+    }
+
+
+def build_render_plan(generator, year: int, months: list[int] | None = None) -> dict:
+    """
+    Lay out the requested months and predict their cost without rendering.
+
+    Args:
+        generator: CalendarGenerator with the config loaded
+        year: Year
+        months: Month numbers (all twelve if None)
+
+    Returns:
+        Dict with 'year', 'months' (per-month plans with 'month'),
+        'peak_bytes' (largest month), 'assets' and 'fonts'
+    """
+    months = months or list(range(1, 13))
+    renderer = generator.month_renderer
+    descriptions = {m: renderer.describe_month(year, m, generator.config) for m in months}
+
+    # Distinct assets with every target size they are resized to
+    assets: dict[str, dict] = {}
+
+    def add_asset(path, size):
+        entry = assets.setdefault(path, {'path': path, 'targets': set(), 'uses': 0})
+        entry['targets'].add(tuple(size))
+        entry['uses'] += 1
+
+    fonts: dict[str, dict] = {}
+
+    def add_font(font, size):
+        resolved = generator.font_manager.resolve_path(font) or font
+        entry = fonts.setdefault(resolved, {'path': resolved, 'requested': set(), 'sizes': set()})
+        entry['requested'].add(font)
+        entry['sizes'].add(size)
+
+    for description in descriptions.values():
+        for image in description['images']:
+            add_asset(image['path'], image['size'])
+        for text in description['texts']:
+            add_font(text['font'], text['size'])
+        for cell in description['cells']:
+            for path in cell['images']:
+                add_asset(path, (cell['width'], cell['height']))
+            add_font(cell['font'], cell['size'])
+            for label in cell['labels']:
+                add_font(label['font'], label['size'])
+
+    headers = {path: read_image_header(path) for path in assets}
+    for path, entry in assets.items():
+        header = headers[path]
+        entry['source'] = (header['width'], header['height'])
+        entry['targets'] = sorted(entry['targets'])
+        # Each target size is decoded separately, large JPEGs at reduced scale
+        entry['decoded'] = [_decoded_size(path, header, target) for target in entry['targets']]
+        entry['decode_bytes'] = sum(w * h * BYTES_PER_PIXEL for w, h in entry['decoded'])
+        entry['target_bytes'] = sum(w * h * BYTES_PER_PIXEL for w, h in entry['targets'])
+
+    month_plans = []
+    seen_headers = set()
+    for month, description in descriptions.items():
+        cached = description['header_key'] in seen_headers
+        seen_headers.add(description['header_key'])
+        plan = plan_month(description, headers, header_cached=cached)
+        plan['month'] = month
+        month_plans.append(plan)
+
+    for entry in fonts.values():
+        entry['requested'] = sorted(entry['requested'])
+        entry['sizes'] = sorted(entry['sizes'])
+
+    return {
+        'year': year,
+        'months': month_plans,
+        'peak_bytes': max(p['peak_bytes'] for p in month_plans),
+        'assets': sorted(assets.values(), key=lambda a: a['path']),
+        'fonts': sorted(fonts.values(), key=lambda f: f['path']),
+    }
+
+
+def _mb(value: int) -> str:
+    return f"{value / 1024 / 1024:.1f} MB"
+
+
+def format_render_plan(plan: dict) -> str:
+    """
+    Format a render plan for console output.
+
+    Args:
+        plan: Result of build_render_plan
+
+    Returns:
+        Multi-line report
+    """
+    lines = [f"Render plan for {plan['year']} ({len(plan['months'])} months)",
+             f"{'month':>5} {'canvas':>11} {'peak':>10} {'composites':>10} {'text draws':>10}"]
+    for p in plan['months']:
+        canvas = f"{p['canvas'][0]}x{p['canvas'][1]}"
+        lines.append(f"{p['month']:>5} {canvas:>11} {_mb(p['peak_bytes']):>10} "
+                     f"{p['composites']:>10} {p['text_draws']:>10}")
+    lines.append(f"Peak memory per month: {_mb(plan['peak_bytes'])}")
+
+    decode_total = sum(a['decode_bytes'] for a in plan['assets'])
+    lines.append(f"Assets: {len(plan['assets'])} distinct, {_mb(decode_total)} decoded")
+    for a in plan['assets']:
+        targets = ", ".join(
+            f"{w}x{h}" + (f" (from {dw}x{dh})" if (dw, dh) != tuple(a['source']) else "")
+            for (w, h), (dw, dh) in zip(a['targets'], a['decoded']))
+        lines.append(f"  {a['path']}: {a['source'][0]}x{a['source'][1]} "
+                     f"({_mb(a['decode_bytes'])}) -> {targets}")
+
+    lines.append(f"Fonts: {len(plan['fonts'])}")
+    for f in plan['fonts']:
+        sizes = ", ".join(str(s) for s in f['sizes'])
+        lines.append(f"  {f['path']}: sizes {sizes}")
+    return "\n".join(lines)
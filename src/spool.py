@@ -0,0 +1,489 @@
+"""Resumable on-disk render queue: inbox, worker pool, status files, retries."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.config_loader import ConfigError
+
+SPOOL_DIRS = ('inbox', 'claimed', 'done', 'failed', 'status', 'output', 'tmp')
+
+DEFAULT_WORKERS = 2
+DEFAULT_INTERVAL = 1.0
+DEFAULT_MAX_ATTEMPTS = 3
+# Delay before the n-th retry of a month (seconds), last value repeats
+RETRY_DELAYS = (1.0, 5.0, 15.0)
+# Claims not touched for this long are requeued even if owned by another host
+DEFAULT_STALE_AFTER = 30 * 60
+
+# Errors worth retrying: I/O on the shared directory, memory pressure
+TRANSIENT_ERRORS = (OSError, MemoryError)
+# Errors that will fail the same way on every attempt
+PERMANENT_ERRORS = (ConfigError, ValueError, KeyError, TypeError)
+
+
+def _now() -> str:
+    """Current UTC time as ISO 8601."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _write_json(path: Path, data: dict, tmp_dir: Path):
+    """Write JSON atomically (temporary file in tmp_dir, then rename)."""
+    tmp = tmp_dir / f"{path.name}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a local process exists (zombies count as gone)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except (OSError, IndexError):
+        return True
+
+
+class JobSpool:
+    """
+    Render jobs exchanged through a shared directory.
+
+    A job is a JSON file in inbox/ with 'config' (path or inline dict),
+    'years' (or 'year'), and optionally 'months' and 'output'. Workers claim
+    a job by renaming it into claimed/ with their host and pid in the name;
+    the rename is atomic, so exactly one worker wins. Progress is recorded in
+    status/<job>.json after every month, so a job requeued after a crash
+    skips the months it already wrote. Finished jobs move to done/, jobs
+    with permanent errors or too many attempts to failed/.
+    """
+
+    def __init__(self, root: str | Path, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 stale_after: float = DEFAULT_STALE_AFTER):
+        """
+        Initialize job spool.
+
+        Args:
+            root: Spool directory (subdirectories are created)
+            max_attempts: Claims per job and tries per month before failing
+            stale_after: Seconds after which a claim of another host is requeued
+        """
+        self.root = Path(root)
+        self.max_attempts = max_attempts
+        self.stale_after = stale_after
+        self.host = socket.gethostname()
+        for name in SPOOL_DIRS:
+            (self.root / name).mkdir(parents=True, exist_ok=True)
+
+    def dir(self, name: str) -> Path:
+        """Path of a spool subdirectory."""
+        return self.root / name
+
+    def submit(self, config: str | dict, years: list[int], months: list[int] | None = None,
+               job_id: str | None = None, output: str | None = None) -> str:
+        """
+        Put a job into the inbox.
+
+        The file is written to tmp/ first and renamed into inbox/, so
+        workers never see a partial job.
+
+        Args:
+            config: Config file path or config dict
+            years: Years to render
+            months: Month numbers (all twelve if None)
+            job_id: Job name (defaults to a timestamp)
+            output: Output directory (defaults to <spool>/output/<job_id>)
+
+        Returns:
+            Job id
+        """
+        job_id = job_id or datetime.now().strftime('job_%Y%m%d_%H%M%S_%f')
+        job = {'config': config, 'years': list(years)}
+        if months:
+            job['months'] = list(months)
+        if output:
+            job['output'] = output
+        _write_json(self.dir('inbox') / f"{job_id}.json", job, self.dir('tmp'))
+        return job_id
+
+    def _claim_name(self, job_id: str) -> str:
+        return f"{job_id}@{self.host}@{os.getpid()}.json"
+
+    @staticmethod
+    def _job_id(claim: Path) -> str:
+        return claim.name.split('@', 1)[0].removesuffix('.json')
+
+    def claim(self) -> Path | None:
+        """
+        Claim the first due job in the inbox (by name; default ids are timestamps).
+
+        Returns:
+            Path of the claimed job file, or None if no job is due
+        """
+        now = time.time()
+        for job in sorted(self.dir('inbox').glob('*.json')):
+            try:
+                if job.stat().st_mtime > now:
+                    continue  # requeued with a delay
+            except FileNotFoundError:
+                continue
+            target = self.dir('claimed') / self._claim_name(job.stem)
+            try:
+                os.rename(job, target)
+            except FileNotFoundError:
+                continue  # another worker was faster
+            return target
+        return None
+
+    def next_due(self) -> float | None:
+        """
+        Time at which the next delayed job in the inbox may be claimed.
+
+        Returns:
+            Earliest modification time of the inbox jobs, or None if the
+            inbox is empty
+        """
+        due = []
+        for job in self.dir('inbox').glob('*.json'):
+            try:
+                due.append(job.stat().st_mtime)
+            except FileNotFoundError:
+                continue
+        return min(due, default=None)
+
+    def recover_stale(self) -> list[str]:
+        """
+        Requeue claims whose worker is gone.
+
+        A claim is stale if its worker ran on this host and the process no
+        longer exists, or if it was not touched for stale_after seconds.
+
+        Returns:
+            Requeued job ids
+        """
+        requeued = []
+        for claim in self.dir('claimed').glob('*.json'):
+            parts = claim.stem.split('@')
+            if len(parts) != 3:
+                continue
+            job_id, host, pid = parts
+            try:
+                idle = time.time() - claim.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            dead = host == self.host and pid.isdigit() and not _pid_alive(int(pid))
+            if dead or idle > self.stale_after:
+                try:
+                    self.requeue(claim)
+                except FileNotFoundError:
+                    continue
+                requeued.append(job_id)
+        return requeued
+
+    def read_status(self, job_id: str) -> dict | None:
+        """Read a job's status file, or None if there is none."""
+        try:
+            with open(self.dir('status') / f"{job_id}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_status(self, job_id: str, status: dict):
+        """Write a job's status file atomically."""
+        status['updated'] = _now()
+        _write_json(self.dir('status') / f"{job_id}.json", status, self.dir('tmp'))
+
+    def requeue(self, claim: Path, delay: float = 0.0) -> Path:
+        """
+        Return a claimed job to the inbox.
+
+        Args:
+            claim: Claimed job file
+            delay: Seconds before the job may be claimed again (stored as a
+                future modification time)
+
+        Returns:
+            New job file path
+        """
+        target = self.dir('inbox') / f"{self._job_id(claim)}.json"
+        if delay:
+            due = time.time() + delay
+            os.utime(claim, (due, due))
+        os.replace(claim, target)
+        return target
+
+    def finish(self, claim: Path, state: str) -> Path:
+        """
+        Move a claimed job to done/ or failed/.
+
+        Args:
+            claim: Claimed job file
+            state: 'done' or 'failed'
+
+        Returns:
+            New job file path
+        """
+        target = self.dir(state) / f"{self._job_id(claim)}.json"
+        os.replace(claim, target)
+        return target
+
+
+class SpoolWorker:
+    """
+    Processes spool jobs one at a time with warm caches.
+
+    The generator is kept between jobs and switched with set_config, so
+    fonts, the asset cache and cached month layers carry over to the next
+    job using the same template.
+    """
+
+    def __init__(self, spool: JobSpool, name: str = 'worker'):
+        """
+        Initialize spool worker.
+
+        Args:
+            spool: Spool to take jobs from
+            name: Name used in log lines and status files
+        """
+        self.spool = spool
+        self.name = name
+        self.generator = None
+        self._config_key = None
+
+    def _generator_for(self, config: dict):
+        """Get the warm generator switched to config."""
+        from src.calendar_generator import CalendarGenerator
+
+        key = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+        if self.generator is None:
+            self.generator = CalendarGenerator(config=config)
+        elif key != self._config_key:
+            self.generator.set_config(config)
+        self._config_key = key
+        return self.generator
+
+    def _render_month(self, generator, year: int, month: int, output_dir: str) -> str:
+        """Render and save one month, retrying transient errors."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                month_img = generator.create_month(year, month)
+                filename = generator.save_month(month_img, year, month, output_dir)
+                if not os.path.exists(filename):
+                    raise OSError(f"Could not write {filename}")
+                return filename
+            except TRANSIENT_ERRORS as e:
+                if attempt >= self.spool.max_attempts:
+                    raise
+                delay = RETRY_DELAYS[min(attempt, len(RETRY_DELAYS)) - 1]
+                print(f"[{self.name}] {year}-{month:02d} failed ({e}), retry in {delay:.0f}s")
+                time.sleep(delay)
+
+    def process(self, claim: Path) -> str:
+        """
+        Run a claimed job to completion.
+
+        Args:
+            claim: Claimed job file
+
+        Transient errors that outlast the per-month retries put the job back
+        into the inbox until it has used max_attempts claims.
+
+        Returns:
+            Resulting state ('done', 'failed' or 'queued')
+        """
+        spool = self.spool
+        job_id = spool._job_id(claim)
+        status = spool.read_status(job_id) or {'job': job_id, 'completed': {}, 'attempts': 0,
+                                                'created': _now()}
+        status.update(state='running', worker=f"{spool.host}:{os.getpid()}:{self.name}",
+                      attempts=status.get('attempts', 0) + 1, error=None)
+        spool.write_status(job_id, status)
+
+        # Jobs that keep killing their worker are not retried forever
+        if status['attempts'] > spool.max_attempts:
+            return self._fail(claim, job_id, status, 'Too many attempts')
+
+        try:
+            with open(claim, 'r', encoding='utf-8') as f:
+                job = json.load(f)
+            config = job['config']
+            if not isinstance(config, dict):
+                with open(config, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            years = job.get('years') or [job['year']]
+            months = job.get('months') or list(range(1, 13))
+            output_dir = job.get('output') or str(spool.dir('output') / job_id)
+            generator = self._generator_for(config)
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+            status['output'] = output_dir
+            for year in years:
+                done = status['completed'].setdefault(str(year), [])
+                for month in months:
+                    filename = os.path.join(output_dir, f"calendar_{year}_{month:02d}.png")
+                    if month in done and os.path.exists(filename):
+                        continue
+                    start = time.perf_counter()
+                    self._render_month(generator, year, month, output_dir)
+                    done.append(month)
+                    spool.write_status(job_id, status)
+                    # Touching the claim doubles as a heartbeat for recover_stale
+                    os.utime(claim)
+                    print(f"[{self.name}] {job_id}: {year}-{month:02d} "
+                          f"({time.perf_counter() - start:.2f}s)")
+        except TRANSIENT_ERRORS as e:
+            error = f"{type(e).__name__}: {e}"
+            if status['attempts'] >= spool.max_attempts:
+                return self._fail(claim, job_id, status, error)
+            status.update(state='queued', error=error)
+            spool.write_status(job_id, status)
+            spool.requeue(claim, RETRY_DELAYS[min(status['attempts'], len(RETRY_DELAYS)) - 1])
+            print(f"[{self.name}] {job_id}: requeued ({error})")
+            return 'queued'
+        except PERMANENT_ERRORS as e:
+            traceback.print_exc()
+            return self._fail(claim, job_id, status, f"{type(e).__name__}: {e}")
+
+        status['state'] = 'done'
+        status['finished'] = _now()
+        spool.write_status(job_id, status)
+        spool.finish(claim, 'done')
+        print(f"[{self.name}] {job_id}: done")
+        return 'done'
+
+    def _fail(self, claim: Path, job_id: str, status: dict, error: str) -> str:
+        """Record an error and move the job to failed/."""
+        status.update(state='failed', error=error, finished=_now())
+        self.spool.write_status(job_id, status)
+        self.spool.finish(claim, 'failed')
+        print(f"[{self.name}] {job_id}: failed ({error})")
+        return 'failed'
+
+    def run(self, once: bool = False, interval: float = DEFAULT_INTERVAL):
+        """
+        Take jobs until stopped.
+
+        Args:
+            once: Return when the inbox is empty instead of polling (jobs
+                requeued with a retry delay are waited for)
+            interval: Polling interval in seconds
+        """
+        while True:
+            claim = self.spool.claim()
+            if claim is None:
+                if once:
+                    due = self.spool.next_due()
+                    if due is None:
+                        return
+                    time.sleep(min(interval, max(0.0, due - time.time())))
+                    continue
+                time.sleep(interval)
+                continue
+            self.process(claim)
+
+
+def _worker_main(root: str, name: str, once: bool, interval: float, max_attempts: int):
+    """Worker process entry point."""
+    spool = JobSpool(root, max_attempts=max_attempts)
+    SpoolWorker(spool, name).run(once=once, interval=interval)
+
+
+def run_pool(root: str, workers: int = DEFAULT_WORKERS, once: bool = False,
+             interval: float = DEFAULT_INTERVAL, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+    """
+    Run a pool of worker processes on a spool directory.
+
+    Crashed workers are replaced and their claimed jobs requeued; the job
+    then resumes from its status file.
+
+    Args:
+        root: Spool directory
+        workers: Number of worker processes
+        once: Stop once the inbox is empty
+        interval: Polling interval in seconds
+        max_attempts: Claims per job and tries per month before failing
+    """
+    spool = JobSpool(root, max_attempts=max_attempts)
+    requeued = spool.recover_stale()
+    if requeued:
+        print(f"Requeued after crash: {', '.join(requeued)}")
+
+    def start(i):
+        process = multiprocessing.Process(
+            target=_worker_main, name=f"worker-{i}",
+            args=(str(root), f"worker-{i}", once, interval, max_attempts),
+        )
+        process.start()
+        return process
+
+    processes = {i: start(i) for i in range(1, max(1, workers) + 1)}
+    print(f"Spool {root}: {len(processes)} workers")
+    try:
+        while processes:
+            time.sleep(interval)
+            for i, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                if process.exitcode == 0:
+                    del processes[i]
+                    continue
+                requeued = spool.recover_stale()
+                print(f"worker-{i} exited with {process.exitcode}; "
+                      f"requeued: {', '.join(requeued) or 'none'}")
+                processes[i] = start(i)
+            if not once:
+                spool.recover_stale()
+    except KeyboardInterrupt:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
+        spool.recover_stale()
+        print("\nSpool stopped")
+
+
+def main(argv: list[str] | None = None):
+    """Submit jobs to or run workers on a spool directory."""
+    parser = argparse.ArgumentParser(
+        description='Render calendar jobs from a shared spool directory.'
+    )
+    parser.add_argument('spool', help='Spool directory')
+    parser.add_argument('--submit', metavar='CONFIG',
+                        help='Queue a job for CONFIG instead of running workers')
+    parser.add_argument('--years', type=int, nargs='+', default=[2026],
+                        help='With --submit, years to render (default: 2026)')
+    parser.add_argument('--job-id', help='With --submit, job name')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Worker processes (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--once', action='store_true',
+                        help='Exit when the inbox is empty')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f'Attempts per job and month (default: {DEFAULT_MAX_ATTEMPTS})')
+    args = parser.parse_args(argv)
+
+    if args.submit:
+        job_id = JobSpool(args.spool).submit(os.path.abspath(args.submit), args.years,
+                                             job_id=args.job_id)
+        print(f"Queued {job_id}")
+        return
+    run_pool(args.spool, args.workers, once=args.once, max_attempts=args.max_attempts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Per-month thumbnails and a proof contact sheet for rendered calendars."""
+
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.utils.lazy_import import lazy_import
+from src.preflight import read_image_header
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+# Long edge of each thumbnail size, largest first
+THUMBNAIL_SIZES = (1024, 512, 256)
+
+CONTACT_COLUMNS = 4
+CONTACT_GAP = 16
+THUMBNAIL_QUALITY = 85
+
+
+def reduced_read_flag(path: str, min_long_edge: int) -> tuple[int, int]:
+    """
+    Pick the strongest reduced decode that still covers the target size.
+
+    JPEG sources are decoded directly at 1/2, 1/4 or 1/8 scale (DCT
+    scaling); for other formats OpenCV still returns the smaller image, so
+    the area resample that follows starts from fewer pixels.
+
+    Args:
+        path: Image file path
+        min_long_edge: Smallest acceptable long edge after decoding
+
+    Returns:
+        (cv2 imread flag, scale factor)
+    """
+    header = read_image_header(path)
+    long_edge = max(header['width'], header['height'])
+    for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                         (4, cv2.IMREAD_REDUCED_COLOR_4),
+                         (2, cv2.IMREAD_REDUCED_COLOR_2)):
+        if long_edge and long_edge // factor >= min_long_edge:
+            return flag, factor
+    return cv2.IMREAD_COLOR, 1
+
+
+def _to_bgr(image: np.ndarray) -> np.ndarray:
+    """Flatten a BGRA image onto white; BGR images pass through."""
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 3:
+        return image
+    if image[:, :, 3].min() == 255:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    alpha = image[:, :, 3:4].astype(np.uint16)
+    bgr = image[:, :, :3].astype(np.uint16)
+    return ((bgr * alpha + 255 * (255 - alpha) + 127) // 255).astype(np.uint8)
+
+
+def make_thumbnails(image: np.ndarray, sizes: tuple[int, ...] = THUMBNAIL_SIZES) -> dict[int, np.ndarray]:
+    """
+    Downsample an image to several long-edge sizes.
+
+    Each size is area-resampled from the previous (larger) one, so only the
+    first step touches the full-resolution pixels. Large steps first shrink
+    by a whole factor, which OpenCV's area filter handles on a fast path.
+
+    Args:
+        image: BGR or BGRA image
+        sizes: Target long edges
+
+    Returns:
+        Dict of long edge -> BGR thumbnail
+    """
+    # Opaque pages drop alpha up front so every resample moves 3 channels
+    if image.ndim == 3 and image.shape[2] == 4 and image[:, :, 3].min() == 255:
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+
+    thumbs = {}
+    current = image
+    for size in sorted(sizes, reverse=True):
+        height, width = current.shape[:2]
+        scale = size / max(width, height)
+        factor = int(1 / scale) if scale < 1.0 else 1
+        if factor >= 2:
+            current = cv2.resize(current, (max(1, width // factor), max(1, height // factor)),
+                                 interpolation=cv2.INTER_AREA)
+            height, width = current.shape[:2]
+            scale = size / max(width, height)
+        if scale < 1.0:
+            current = cv2.resize(current, (max(1, round(width * scale)), max(1, round(height * scale))),
+                                 interpolation=cv2.INTER_AREA)
+        thumbs[size] = _to_bgr(current)
+    return thumbs
+
+
+def load_reduced(path: str, min_long_edge: int) -> np.ndarray | None:
+    """
+    Decode an image at the smallest reduced scale covering min_long_edge.
+
+    Args:
+        path: Image file path
+        min_long_edge: Smallest acceptable long edge
+
+    Returns:
+        BGR image or None if unreadable
+    """
+    flag, _ = reduced_read_flag(path, min_long_edge)
+    return cv2.imread(str(path), flag)
+
+
+def contact_sheet(images: list[np.ndarray], columns: int = CONTACT_COLUMNS,
+                  gap: int = CONTACT_GAP, labels: list[str] | None = None) -> np.ndarray:
+    """
+    Arrange thumbnails on a white proof grid.
+
+    Args:
+        images: BGR thumbnails (cells are sized to the largest one)
+        columns: Thumbnails per row
+        gap: Spacing around cells in pixels
+        labels: Optional caption per image, drawn under it
+
+    Returns:
+        BGR contact sheet
+    """
+    if not images:
+        return np.full((gap * 2, gap * 2, 3), 255, dtype=np.uint8)
+
+    cell_w = max(img.shape[1] for img in images)
+    cell_h = max(img.shape[0] for img in images)
+    label_h = 30 if labels else 0
+    rows = (len(images) + columns - 1) // columns
+    sheet = np.full((rows * (cell_h + label_h + gap) + gap,
+                     columns * (cell_w + gap) + gap, 3), 255, dtype=np.uint8)
+
+    for i, img in enumerate(images):
+        row, col = divmod(i, columns)
+        x = gap + col * (cell_w + gap) + (cell_w - img.shape[1]) // 2
+        y = gap + row * (cell_h + label_h + gap) + (cell_h - img.shape[0]) // 2
+        sheet[y:y + img.shape[0], x:x + img.shape[1]] = img
+        if labels:
+            cv2.putText(sheet, labels[i], (gap + col * (cell_w + gap),
+                                           gap + row * (cell_h + label_h + gap) + cell_h + 22),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1, cv2.LINE_AA)
+    return sheet
+
+
+def _save_outputs(thumbs_by_month: dict[int, dict[int, np.ndarray]], year: int,
+                  output_dir: str) -> list[str]:
+    """Write per-month thumbnails and the contact sheet (smallest size)."""
+    thumb_dir = Path(output_dir) / 'thumbnails'
+    thumb_dir.mkdir(parents=True, exist_ok=True)
+    params = [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_QUALITY]
+
+    filenames = []
+    for month, thumbs in sorted(thumbs_by_month.items()):
+        for size, thumb in thumbs.items():
+            filename = thumb_dir / f"calendar_{year}_{month:02d}_{size}.jpg"
+            cv2.imwrite(str(filename), thumb, params)
+            filenames.append(str(filename))
+
+    months = sorted(thumbs_by_month)
+    smallest = [min(thumbs_by_month[m].items())[1] for m in months]
+    sheet = contact_sheet(smallest, labels=[f"{year}-{m:02d}" for m in months])
+    filename = thumb_dir / f"calendar_{year}_contact_sheet.jpg"
+    cv2.imwrite(str(filename), sheet, params)
+    filenames.append(str(filename))
+    return filenames
+
+
+def thumbnails_from_arrays(months: list[np.ndarray], year: int, output_dir: str = 'output',
+                           sizes: tuple[int, ...] = THUMBNAIL_SIZES) -> list[str]:
+    """
+    Build thumbnails from month images still in memory after rendering.
+
+    Args:
+        months: Month images (January first)
+        year: Year
+        output_dir: Output directory (thumbnails go to <output_dir>/thumbnails)
+        sizes: Thumbnail long edges
+
+    Returns:
+        List of written files
+    """
+    thumbs = {i + 1: make_thumbnails(img, sizes) for i, img in enumerate(months)}
+    return _save_outputs(thumbs, year, output_dir)
+
+
+def thumbnails_from_files(paths: dict[int, str], year: int, output_dir: str = 'output',
+                          sizes: tuple[int, ...] = THUMBNAIL_SIZES,
+                          max_workers: int = 4) -> list[str]:
+    """
+    Build thumbnails from saved month images using reduced decoding.
+
+    Files are decoded in parallel, each at the smallest reduced scale that
+    still covers the largest thumbnail size.
+
+    Args:
+        paths: Month number -> saved month image path
+        year: Year
+        output_dir: Output directory (thumbnails go to <output_dir>/thumbnails)
+        sizes: Thumbnail long edges
+        max_workers: Decode threads
+
+    Returns:
+        List of written files
+    """
+    def load(path):
+        image = load_reduced(path, max(sizes))
+        return make_thumbnails(image, sizes) if image is not None else None
+
+    months = sorted(paths)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(months)))) as pool:
+        results = list(pool.map(load, [paths[m] for m in months]))
+
+    thumbs = {}
+    for month, result in zip(months, results):
+        if result is None:
+            print(f"Cannot read {paths[month]}, skipped")
+            continue
+        thumbs[month] = result
+    return _save_outputs(thumbs, year, output_dir) if thumbs else []
+
+
+def main(argv: list[str] | None = None):
+    """Build thumbnails and a contact sheet for already saved months."""
+    parser = argparse.ArgumentParser(
+        description='Create thumbnails and a contact sheet from saved calendar months.'
+    )
+    parser.add_argument('output', nargs='?', default='output',
+                        help='Directory with calendar_<year>_<MM>.png files (default: output)')
+    parser.add_argument('--year', type=int, default=2026,
+                        help='Year of the saved months (default: 2026)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Decode threads (default: 4)')
+    args = parser.parse_args(argv)
+
+    paths = {int(p.stem[-2:]): str(p)
+             for p in Path(args.output).glob(f"calendar_{args.year}_[0-9][0-9].png")}
+    if not paths:
+        raise SystemExit(f"No calendar_{args.year}_MM.png files in {args.output}")
+
+    start = time.perf_counter()
+    filenames = thumbnails_from_files(paths, args.year, args.output, max_workers=args.workers)
+    print(f"Created {len(filenames)} files in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
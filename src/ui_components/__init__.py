@@ -1,74 +1,55 @@
-"""UI components for Calendar Config Editor."""
+"""UI components for Calendar Config Editor.
 
-# Constants
-from .constants import (
-    DAYS_OF_WEEK,
-    FONT_PRESETS,
-    ALIGN_OPTIONS,
-    WIDTH_POS_OPTIONS,
-    HEIGHT_POS_OPTIONS,
-)
+Submodules are imported on first attribute access, so importing the package
+does not pull in every tab, the preview renderer or the default config.
+"""
 
-# Helpers
-from .helpers import (
-    color_from_list,
-    list_from_color,
-    color_swatch,
-)
+import importlib
 
-# Widgets
-from .widgets import (
-    ColorPickerWidget,
-    ImagePickerWidget,
-    FontPickerWidget,
-    PreviewLabel,
-)
-
-# Tabs
-from .tabs import (
-    DaySectionTab,
-    SpecDaysTab,
-    MonthsTab,
-)
-
-# Preview
-from .preview import (
-    get_day_preview,
-    get_month_preview,
-)
-
-# Main window
-from .main_window import (
-    MainWindow,
-    STYLESHEET,
-    DEFAULT_CONFIG,
-)
-
-__all__ = [
+# Exported name -> submodule that defines it
+_EXPORTS = {
     # Constants
-    "DAYS_OF_WEEK",
-    "FONT_PRESETS",
-    "ALIGN_OPTIONS",
-    "WIDTH_POS_OPTIONS",
-    "HEIGHT_POS_OPTIONS",
+    "DAYS_OF_WEEK": ".constants",
+    "FONT_PRESETS": ".constants",
+    "ALIGN_OPTIONS": ".constants",
+    "WIDTH_POS_OPTIONS": ".constants",
+    "HEIGHT_POS_OPTIONS": ".constants",
     # Helpers
-    "color_from_list",
-    "list_from_color",
-    "color_swatch",
+    "color_from_list": ".helpers",
+    "list_from_color": ".helpers",
+    "color_swatch": ".helpers",
     # Widgets
-    "ColorPickerWidget",
-    "ImagePickerWidget",
-    "FontPickerWidget",
-    "PreviewLabel",
+    "ColorPickerWidget": ".widgets",
+    "ImagePickerWidget": ".widgets",
+    "FontPickerWidget": ".widgets",
+    "PreviewLabel": ".widgets",
     # Tabs
-    "DaySectionTab",
-    "SpecDaysTab",
-    "MonthsTab",
+    "DaySectionTab": ".tabs",
+    "SpecDaysTab": ".tabs",
+    "MonthsTab": ".tabs",
     # Preview
-    "get_day_preview",
-    "get_month_preview",
-    # Main
-    "MainWindow",
-    "STYLESHEET",
-    "DEFAULT_CONFIG",
-]
+    "get_day_preview": ".preview",
+    "get_month_preview": ".preview",
+    # Main window
+    "MainWindow": ".main_window",
+    "STYLESHEET": ".main_window",
+    "DEFAULT_CONFIG": ".main_window",
+    "load_default_config": ".main_window",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    value = getattr(module, name)
+    # DEFAULT_CONFIG is read from disk on demand and must stay a live lookup
+    if name != "DEFAULT_CONFIG":
+        globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,6 +3,7 @@
 import sys
 import json
 import copy
+import functools
 from pathlib import Path
 
 from PySide6.QtWidgets import (
@@ -12,7 +13,6 @@ from PySide6.QtWidgets import (
 
 from .tabs import DaySectionTab, SpecDaysTab, MonthsTab, DaysTab
 from .preview import get_day_preview, get_month_preview
-from ..calendar_generator import main 
 
 # ---------------------------------------------------------------------------
 # Stylesheet
@@ -142,62 +142,76 @@ QMessageBox {
 
 DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "settings.json"
 
-try:
-    DEFAULT_CONFIG = json.load(open(DEFAULT_CONFIG_PATH, encoding="utf-8"))
-except Exception:
-    DEFAULT_CONFIG = {
-        "day_of_the_week": {
-            "width": 200, "height": 50, "text_color": [0, 0, 0],
-            "text_position": [40, 40], "text_size": 48, "text_align": "center",
-            "text_font": "C:/Windows/Fonts/arial.ttf",
-            "background": "assets/img/day_background.png"
-        },
-        "month": {
-            "gap": 30, "text_color": [0, 0, 0], "text_position": [40, 40],
-            "text_size": 98, "text_font": "C:/Windows/Fonts/mistral.ttf",
-            "text_align": "center", "month_text_height": 200,
-            "padding_top": 80, "padding_right": 80, "padding_bottom": 80, "padding_left": 80,
-            "background": "assets/img/test_bg (1).jpg"
-        },
-        "regular_day": {
-            "width": 200, "height": 200, "text_color": [0, 0, 0],
-            "text_position": [40, 40], "text_size": 48, "text_align": "center",
-            "padding": 20, "text_font": "C:/Windows/Fonts/arial.ttf",
-            "background": "assets/img/day_background.png"
-        },
-        "spec_day": {
-            "width": 200, "height": 200, "text_color": [255, 0, 255],
-            "text_position": [40, 40], "text_size": 48, "text_align": "center",
-            "padding": 20, "text_font": "C:/Windows/Fonts/arial.ttf",
-            "background": "assets/img/test.jpg"
-        },
-        "weekend": {
-            "width": 200, "height": 200, "text_color": [255, 0, 0],
-            "text_position": [40, 40], "text_size": 48, "padding": 20,
-            "text_align": "center", "text_font": "C:/Windows/Fonts/arial.ttf",
-            "background": "assets/img/day_weekend_background.png"
-        },
-        "spec_days": [
-            {"date": "07.12", "desc": "", "name": "День рождения Макс", "background": "assets/img/spec_day1.png", "text_color": [255, 0, 0]},
-            {"date": "08.03", "desc": "", "name": "Международный женский день", "background": "assets/img/spec_day2.png", "text_color": [255, 0, 0]},
-            {"date": "23.02", "desc": "", "name": "День защитника Отечества", "background": "assets/img/d(6).jpg", "text_color": [255, 0, 0]},
-            {"date": "14.02", "desc": "", "name": "День святого Валентина", "text_color": [255, 0, 0]}
-        ],
-        "months": [
-            {"name": "Январь", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "center"},
-            {"name": "February", "background": "assets/img/test_bg (1).jpg", "text_color": [255, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "bottom"},
-            {"name": "Март", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top", "padding_top": 800},
-            {"name": "Апрель", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "right", "height_pos": "center"},
-            {"name": "Май", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "right", "height_pos": "bottom"},
-            {"name": "Июнь", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "right", "height_pos": "top"},
-            {"name": "Июль", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "left", "height_pos": "center"},
-            {"name": "Август", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "left", "height_pos": "bottom"},
-            {"name": "Сентябрь", "background": "assets/img/test.jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "left", "height_pos": "top"},
-            {"name": "Октябрь", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/arial.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top"},
-            {"name": "Ноябрь", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/arial.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top"},
-            {"name": "Декабрь", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/arial.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top"}
-        ]
-    }
+_FALLBACK_CONFIG = {
+    "day_of_the_week": {
+        "width": 200, "height": 50, "text_color": [0, 0, 0],
+        "text_position": [40, 40], "text_size": 48, "text_align": "center",
+        "text_font": "C:/Windows/Fonts/arial.ttf",
+        "background": "assets/img/day_background.png"
+    },
+    "month": {
+        "gap": 30, "text_color": [0, 0, 0], "text_position": [40, 40],
+        "text_size": 98, "text_font": "C:/Windows/Fonts/mistral.ttf",
+        "text_align": "center", "month_text_height": 200,
+        "padding_top": 80, "padding_right": 80, "padding_bottom": 80, "padding_left": 80,
+        "background": "assets/img/test_bg (1).jpg"
+    },
+    "regular_day": {
+        "width": 200, "height": 200, "text_color": [0, 0, 0],
+        "text_position": [40, 40], "text_size": 48, "text_align": "center",
+        "padding": 20, "text_font": "C:/Windows/Fonts/arial.ttf",
+        "background": "assets/img/day_background.png"
+    },
+    "spec_day": {
+        "width": 200, "height": 200, "text_color": [255, 0, 255],
+        "text_position": [40, 40], "text_size": 48, "text_align": "center",
+        "padding": 20, "text_font": "C:/Windows/Fonts/arial.ttf",
+        "background": "assets/img/test.jpg"
+    },
+    "weekend": {
+        "width": 200, "height": 200, "text_color": [255, 0, 0],
+        "text_position": [40, 40], "text_size": 48, "padding": 20,
+        "text_align": "center", "text_font": "C:/Windows/Fonts/arial.ttf",
+        "background": "assets/img/day_weekend_background.png"
+    },
+    "spec_days": [
+        {"date": "07.12", "desc": "", "name": "День рождения Макс", "background": "assets/img/spec_day1.png", "text_color": [255, 0, 0]},
+        {"date": "08.03", "desc": "", "name": "Международный женский день", "background": "assets/img/spec_day2.png", "text_color": [255, 0, 0]},
+        {"date": "23.02", "desc": "", "name": "День защитника Отечества", "background": "assets/img/d(6).jpg", "text_color": [255, 0, 0]},
+        {"date": "14.02", "desc": "", "name": "День святого Валентина", "text_color": [255, 0, 0]}
+    ],
+    "months": [
+        {"name": "Январь", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "center"},
+        {"name": "February", "background": "assets/img/test_bg (1).jpg", "text_color": [255, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "bottom"},
+        {"name": "Март", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top", "padding_top": 800},
+        {"name": "Апрель", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "right", "height_pos": "center"},
+        {"name": "Май", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "right", "height_pos": "bottom"},
+        {"name": "Июнь", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "right", "height_pos": "top"},
+        {"name": "Июль", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "left", "height_pos": "center"},
+        {"name": "Август", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "left", "height_pos": "bottom"},
+        {"name": "Сентябрь", "background": "assets/img/test.jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/mistral.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "left", "height_pos": "top"},
+        {"name": "Октябрь", "background": "assets/img/test_bg (2).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/arial.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top"},
+        {"name": "Ноябрь", "background": "assets/img/test_bg (1).jpg", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/arial.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top"},
+        {"name": "Декабрь", "text_color": [0, 0, 0], "text_font": "C:/Windows/Fonts/arial.ttf", "min_width": 2000, "min_height": 3000, "width_pos": "center", "height_pos": "top"}
+    ]
+}
+
+
+@functools.cache
+def load_default_config() -> dict:
+    """Load the default config from settings.json on first use."""
+    try:
+        with open(DEFAULT_CONFIG_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return copy.deepcopy(_FALLBACK_CONFIG)
+
+
+def __getattr__(name: str):
+    # Keep DEFAULT_CONFIG importable without reading settings.json at import time
+    if name == "DEFAULT_CONFIG":
+        return load_default_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ---------------------------------------------------------------------------
@@ -300,11 +314,17 @@ class MainWindow(QMainWindow):
         
         # Connect to update spec days when generation is complete
         self._spec_gen_window.generationComplete.connect(self._on_spec_days_generated)
+        self._spec_gen_window.settingsApplied.connect(self._on_spec_days_settings)
 
     def _on_spec_days_generated(self, paths: list):
         """Handle completion of spec days generation."""
         self._status.setText(f"Сгенерировано {len(paths)} изображений спец дней.")
 
+    def _on_spec_days_settings(self, settings: dict):
+        """Render spec day images in memory with these settings from now on."""
+        self._config["spec_days_generator"] = settings
+        self._status.setText("Изображения спец дней будут созданы при генерации календаря.")
+
     def _collect_config(self) -> dict:
         cfg = copy.deepcopy(self._config)
         if self._day_of_week_tab:
@@ -317,6 +337,8 @@ class MainWindow(QMainWindow):
             cfg["months"] = self._months_tab.get_data()
         return cfg
     def _render_calendar(self):
+        from ..calendar_generator import main
+
         cfg = self._collect_config()
         with open("temp_config.json", "w", encoding="utf-8") as f:
             json.dump(cfg, f, ensure_ascii=False, indent=4)
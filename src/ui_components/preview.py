@@ -1,16 +1,20 @@
 """Preview functions for Calendar Config Editor."""
 
-import cv2
-import numpy as np
+from __future__ import annotations
+
 from datetime import datetime
 from pathlib import Path
 
 from PySide6.QtGui import QPixmap, QImage
 
+from src.utils.lazy_import import lazy_import
 from src.utils.font_manager import FontManager
 from src.day_renderer import DayRenderer
 from src.month_renderer import MonthRenderer
 
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
 
 # ---------------------------------------------------------------------------
 # Global instances for preview rendering (cached to avoid re-initialization)
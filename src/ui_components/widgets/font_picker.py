@@ -3,6 +3,8 @@
 from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QPushButton, QFileDialog
 
+from src.utils.font_index import get_font_index, system_font_dirs
+
 from ..constants import FONT_PRESETS
 
 
@@ -18,6 +20,8 @@ class FontPickerWidget(QWidget):
         self._combo = QComboBox()
         self._combo.setEditable(True)
         self._combo.addItems(FONT_PRESETS)
+        # Installed fonts by name; the shared index is scanned once per process
+        self._combo.addItems(get_font_index().display_names())
         self._combo.setCurrentText(value or "")
         self._browse = QPushButton("…")
         self._browse.setFixedWidth(32)
@@ -27,8 +31,9 @@ class FontPickerWidget(QWidget):
         lay.addWidget(self._browse)
 
     def _pick(self):
+        start_dir = next((str(d) for d in system_font_dirs() if d.is_dir()), "")
         path, _ = QFileDialog.getOpenFileName(
-            self, "Выбрать шрифт", "C:/Windows/Fonts", "Fonts (*.ttf *.otf)"
+            self, "Выбрать шрифт", start_dir, "Fonts (*.ttf *.otf)"
         )
         if path:
             self._combo.setCurrentText(path)
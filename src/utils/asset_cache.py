@@ -0,0 +1,228 @@
+"""Persistent content-addressed cache of decoded and resized assets."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from src.utils.cache_dir import get_cache_dir
+from src.utils.lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+# Bump when the decode/resize pipeline changes so stale entries are ignored
+CACHE_VERSION = 2
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+# Locks older than this are assumed to belong to a crashed process
+STALE_LOCK_SECONDS = 60
+
+
+class AssetCache:
+    """
+    On-disk cache of resized BGRA images stored as raw .npy files.
+
+    Entries are keyed by the source file's content hash plus target size
+    and interpolation, so renamed or copied sources still hit and edited
+    sources never return stale pixels. Writes go through a temporary file
+    and os.replace, so concurrent worker processes and threads only ever
+    see complete entries. Total size is capped with least-recently-used
+    eviction. The directory is scanned once on the first write; after that
+    a running total of written bytes decides when to rescan and evict, so
+    writes by other processes are only seen at the next rescan.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize asset cache.
+
+        Args:
+            cache_dir: Cache directory (defaults to the user cache dir)
+            max_bytes: Size cap; least recently used entries are evicted above it
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir('assets')
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._hashes: dict[tuple[str, int, int], str] = {}
+        # Estimated bytes on disk; None until the first write scans the directory
+        self._size: int | None = None
+        self._size_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _content_hash(self, path: str) -> str:
+        """Hash source file content, memoized per (path, mtime, size)."""
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        digest = self._hashes.get(memo_key)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._hashes[memo_key] = digest
+        return digest
+
+    def _entry_path(self, path: str, width: int, height: int, interpolation: int,
+                    variant: str = '') -> Path:
+        digest = self._content_hash(path)
+        suffix = f"_{variant}" if variant else ''
+        return self.cache_dir / f"{digest}_{width}x{height}_i{interpolation}{suffix}_v{CACHE_VERSION}.npy"
+
+    def get(self, path: str, width: int, height: int,
+            interpolation: int, variant: str = '') -> np.ndarray | None:
+        """
+        Look up a resized image.
+
+        Args:
+            path: Source image path
+            width: Target width
+            height: Target height
+            interpolation: cv2 interpolation flag used for the resize
+            variant: Raster backend cache tag ('' for the default backends)
+
+        Returns:
+            BGRA image or None on miss
+        """
+        try:
+            entry = self._entry_path(path, width, height, interpolation, variant)
+            image = np.load(entry, allow_pickle=False)
+        except (OSError, ValueError, EOFError):
+            self.misses += 1
+            return None
+
+        # Refresh mtime so eviction sees this entry as recently used
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        self.hits += 1
+        return image
+
+    def put(self, path: str, width: int, height: int, interpolation: int,
+            image: np.ndarray, variant: str = ''):
+        """
+        Store a resized image.
+
+        Args:
+            path: Source image path
+            width: Target width
+            height: Target height
+            interpolation: cv2 interpolation flag used for the resize
+            image: Resized BGRA image
+            variant: Raster backend cache tag ('' for the default backends)
+        """
+        try:
+            entry = self._entry_path(path, width, height, interpolation, variant)
+            tmp = entry.with_name(f"{entry.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, 'wb') as f:
+                np.save(f, image, allow_pickle=False)
+            os.replace(tmp, entry)
+            written = entry.stat().st_size
+        except OSError as e:
+            print(f"Asset cache write failed: {e}")
+            return
+        with self._size_lock:
+            if self._size is None:
+                self._size = self._scan()[1]
+            else:
+                self._size += written
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _scan(self) -> tuple[list[tuple[float, int, str]], int]:
+        """List cache entries as (mtime, size, path) with their total size."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.npy'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        lock = self.cache_dir / '.evict.lock'
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # Another process is evicting; clear the lock only if it is stale
+            try:
+                if time.time() - lock.stat().st_mtime > STALE_LOCK_SECONDS:
+                    lock.unlink()
+            except OSError:
+                pass
+            return
+        except OSError:
+            return
+
+        try:
+            entries, total = self._scan()
+            entries.sort()
+            for _, size, entry_path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(entry_path)
+                    total -= size
+                except OSError:
+                    continue
+            with self._size_lock:
+                self._size = total
+        finally:
+            os.close(fd)
+            try:
+                lock.unlink()
+            except OSError:
+                pass
+
+    def clear(self):
+        """Delete all cache entries."""
+        with self._size_lock:
+            self._size = None
+        for entry in self.cache_dir.glob('*.npy'):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+_asset_cache: AssetCache | None = None
+_asset_cache_disabled = False
+
+
+def get_asset_cache() -> AssetCache | None:
+    """
+    Get the process-wide asset cache.
+
+    Disabled with $CALENDAR_MAKER_ASSET_CACHE=0; size cap in megabytes
+    via $CALENDAR_MAKER_ASSET_CACHE_MB.
+
+    Returns:
+        Asset cache, or None if disabled or the cache dir is unusable
+    """
+    global _asset_cache, _asset_cache_disabled
+    if _asset_cache is None and not _asset_cache_disabled:
+        if os.environ.get('CALENDAR_MAKER_ASSET_CACHE', '1') == '0':
+            _asset_cache_disabled = True
+            return None
+        max_mb = os.environ.get('CALENDAR_MAKER_ASSET_CACHE_MB')
+        max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        try:
+            _asset_cache = AssetCache(max_bytes=max_bytes)
+        except OSError as e:
+            print(f"Asset cache disabled: {e}")
+            _asset_cache_disabled = True
+    return _asset_cache
@@ -0,0 +1,29 @@
+"""Location of persistent on-disk caches."""
+
+import os
+from pathlib import Path
+
+
+def get_cache_dir(name: str = '') -> Path:
+    """
+    Get (and create) the cache directory for Calendar Maker.
+
+    Uses $CALENDAR_MAKER_CACHE_DIR if set, otherwise $XDG_CACHE_HOME or
+    ~/.cache, with a `calendar_maker` subfolder.
+
+    Args:
+        name: Optional subdirectory for a specific cache
+
+    Returns:
+        Path to existing cache directory
+    """
+    root = os.environ.get('CALENDAR_MAKER_CACHE_DIR')
+    if root:
+        path = Path(root)
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        path = Path(base) / 'calendar_maker'
+    if name:
+        path = path / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,334 @@
+"""Process-wide registry of in-memory caches sharing one byte budget."""
+
+from __future__ import annotations
+
+import heapq
+import os
+import sys
+import threading
+import time
+from typing import Callable
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Creation cost assumed for entries stored without one (seconds)
+MIN_COST = 1e-6
+
+
+def file_signature(path: str | None) -> tuple | None:
+    """
+    Identify a file version for cache keys.
+
+    Args:
+        path: File path (None or empty for no file)
+
+    Returns:
+        (absolute path, mtime_ns, size), (path, None, None) if missing, or None
+    """
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def estimate_bytes(value) -> int:
+    """
+    Approximate memory held by a cached value.
+
+    Numpy arrays and PIL images count their pixel buffers; containers are
+    summed recursively; anything else uses sys.getsizeof.
+
+    Args:
+        value: Cached value
+
+    Returns:
+        Size in bytes
+    """
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if hasattr(value, 'getbands') and hasattr(value, 'size'):
+        return value.size[0] * value.size[1] * len(value.getbands())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v)
+                                          for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class MemoryCache:
+    """
+    One named cache in a CacheRegistry.
+
+    Behaves like a dict with get/put, keeps its own hit, miss and eviction
+    counters, and leaves memory accounting and eviction to the registry.
+    Cached values are shared; callers must not modify them.
+    """
+
+    def __init__(self, registry: CacheRegistry, name: str):
+        """
+        Initialize memory cache.
+
+        Args:
+            registry: Owning registry
+            name: Cache name used in statistics
+        """
+        self.registry = registry
+        self.name = name
+        # key -> [value, nbytes, cost, priority, seq]
+        self._entries: dict = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Look up a value, refreshing its priority on a hit.
+
+        Args:
+            key: Hashable key
+
+        Returns:
+            Cached value or None
+        """
+        with self.registry.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.registry._touch(self, key, entry)
+            return entry[0]
+
+    def put(self, key, value, cost: float = 0.0, nbytes: int | None = None):
+        """
+        Store a value, evicting across all caches if the budget is exceeded.
+
+        Args:
+            key: Hashable key
+            value: Value (treat as read-only once stored)
+            cost: Seconds it took to produce the value; expensive entries
+                survive longer per byte
+            nbytes: Size in bytes (estimated if None)
+        """
+        nbytes = estimate_bytes(value) if nbytes is None else nbytes
+        with self.registry.lock:
+            self._remove(key)
+            if nbytes > self.registry.max_bytes:
+                return
+            entry = [value, nbytes, max(cost, MIN_COST), 0.0, 0]
+            self._entries[key] = entry
+            self.bytes += nbytes
+            self.registry.bytes += nbytes
+            self.registry._touch(self, key, entry)
+            self.registry._evict()
+
+    def get_or_create(self, key, create: Callable[[], object]):
+        """
+        Get a value, creating and storing it on a miss.
+
+        The time create takes is recorded as the entry's cost. None results
+        are returned but not stored.
+
+        Args:
+            key: Hashable key
+            create: Function producing the value
+
+        Returns:
+            Cached or new value
+        """
+        value = self.get(key)
+        if value is None:
+            start = time.perf_counter()
+            value = create()
+            if value is not None:
+                self.put(key, value, cost=time.perf_counter() - start)
+        return value
+
+    def pop(self, key):
+        """Remove an entry; returns its value or None."""
+        with self.registry.lock:
+            entry = self._remove(key)
+            return entry[0] if entry else None
+
+    def _remove(self, key) -> list | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+            self.registry.bytes -= entry[1]
+        return entry
+
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with 'hits', 'misses', 'evictions', 'entries', 'bytes' and
+            'hit_rate' (0..1)
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        with self.registry.lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+class CacheRegistry:
+    """
+    Named in-memory caches with one shared byte budget.
+
+    Eviction is cost-aware LRU (GreedyDual-Size): an entry's priority is
+    the running inflation value plus its creation cost per byte, refreshed
+    on every hit. Above the budget the lowest-priority entry of any cache is
+    dropped and the inflation value rises to its priority, so entries that
+    were cheap to create, large, or long unused go first.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize cache registry.
+
+        Args:
+            max_bytes: Budget for all caches together
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.lock = threading.RLock()
+        self._caches: dict[str, MemoryCache] = {}
+        self._heap: list[tuple[float, int, str, object]] = []
+        self._seq = 0
+        self._inflation = 0.0
+
+    def cache(self, name: str) -> MemoryCache:
+        """
+        Get or create a named cache.
+
+        Args:
+            name: Cache name
+
+        Returns:
+            Memory cache
+        """
+        with self.lock:
+            cache = self._caches.get(name)
+            if cache is None:
+                cache = self._caches[name] = MemoryCache(self, name)
+            return cache
+
+    def _touch(self, cache: MemoryCache, key, entry: list):
+        """Give an entry a fresh priority (stale heap items are skipped later)."""
+        self._seq += 1
+        entry[3] = self._inflation + entry[2] / max(entry[1], 1)
+        entry[4] = self._seq
+        heapq.heappush(self._heap, (entry[3], self._seq, cache.name, key))
+        if len(self._heap) > 2 * sum(len(c) for c in self._caches.values()) + 1024:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        self._heap = [(e[3], e[4], c.name, k)
+                      for c in self._caches.values() for k, e in c._entries.items()]
+        heapq.heapify(self._heap)
+
+    def _evict(self):
+        """Drop lowest-priority entries until the budget holds."""
+        while self.bytes > self.max_bytes and self._heap:
+            priority, seq, name, key = heapq.heappop(self._heap)
+            cache = self._caches[name]
+            entry = cache._entries.get(key)
+            if entry is None or entry[4] != seq:
+                continue
+            cache._remove(key)
+            cache.evictions += 1
+            self._inflation = priority
+
+    def set_budget(self, max_bytes: int):
+        """Change the byte budget, evicting at once if it shrank."""
+        with self.lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Get counters of every cache plus a 'total' row.
+
+        Returns:
+            Dict of cache name -> MemoryCache.stats result
+        """
+        with self.lock:
+            stats = {name: cache.stats() for name, cache in sorted(self._caches.items())}
+        total = {key: sum(s[key] for s in stats.values())
+                 for key in ('hits', 'misses', 'evictions', 'entries', 'bytes')}
+        lookups = total['hits'] + total['misses']
+        total['hit_rate'] = total['hits'] / lookups if lookups else 0.0
+        stats['total'] = total
+        return stats
+
+    def clear(self):
+        """Drop every cache's entries and reset counters."""
+        with self.lock:
+            for cache in self._caches.values():
+                cache.clear()
+            self._heap.clear()
+            self._inflation = 0.0
+
+
+def format_cache_stats(stats: dict[str, dict], max_bytes: int | None = None) -> str:
+    """
+    Format CacheRegistry.stats for console output.
+
+    Args:
+        stats: CacheRegistry.stats result
+        max_bytes: Budget to show in the header (optional)
+
+    Returns:
+        Multi-line table
+    """
+    header = "Memory caches"
+    if max_bytes is not None:
+        header += f" (budget {max_bytes / 1024 / 1024:.0f} MB)"
+    lines = [header, f"{'cache':<14} {'hits':>8} {'misses':>8} {'hit rate':>8} "
+                     f"{'evicted':>8} {'entries':>8} {'MB':>8}"]
+    for name, s in stats.items():
+        lines.append(f"{name:<14} {s['hits']:>8} {s['misses']:>8} {s['hit_rate']:>8.0%} "
+                     f"{s['evictions']:>8} {s['entries']:>8} {s['bytes'] / 1024 / 1024:>8.1f}")
+    return "\n".join(lines)
+
+
+_cache_registry: CacheRegistry | None = None
+
+
+def get_cache_registry() -> CacheRegistry:
+    """
+    Get the process-wide cache registry.
+
+    The budget in megabytes can be set with $CALENDAR_MAKER_CACHE_MB.
+    """
+    global _cache_registry
+    if _cache_registry is None:
+        max_mb = os.environ.get('CALENDAR_MAKER_CACHE_MB')
+        max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        _cache_registry = CacheRegistry(max_bytes)
+    return _cache_registry
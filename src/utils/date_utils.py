@@ -103,13 +103,52 @@ class DateUtils:
     @staticmethod
     def parse_spec_day_date(date_str: str) -> tuple[int, int]:
         """
-        Parse DD.MM string to day and month.
+        Parse DD.MM (or DD.MM.YYYY) string to day and month.
 
         Args:
-            date_str: Date string in DD.MM format
+            date_str: Date string in DD.MM or DD.MM.YYYY format
 
         Returns:
             Tuple of (day, month)
         """
         parts = date_str.split('.')
         return int(parts[0]), int(parts[1])
+
+    @staticmethod
+    def spec_days_for_year(entries: dict, year: int) -> dict:
+        """
+        Select the special days that apply in one year.
+
+        Keys are "DD.MM" (every year) or "DD.MM.YYYY" (that year only); a
+        dated entry replaces the yearly one of the same day.
+
+        Args:
+            entries: Dict keyed by spec day date (spec days or their images)
+            year: Year
+
+        Returns:
+            Dict keyed by "DD.MM"
+        """
+        suffix = f".{year}"
+        selected = {date: value for date, value in entries.items() if date.count('.') == 1}
+        for date, value in entries.items():
+            if date.count('.') == 2 and date.endswith(suffix):
+                selected[date[:-len(suffix)]] = value
+        return selected
+
+    @staticmethod
+    def year_specific_days(entries: dict, year: int, month: int) -> list[int]:
+        """
+        Days of a month with a "DD.MM.YYYY" special day for this year.
+
+        Args:
+            entries: Dict keyed by spec day date
+            year: Year
+            month: Month number
+
+        Returns:
+            Sorted day numbers
+        """
+        suffix = f".{month:02d}.{year}"
+        return sorted(DateUtils.parse_spec_day_date(date)[0] for date in entries
+                      if date.count('.') == 2 and date.endswith(suffix))
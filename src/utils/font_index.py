@@ -0,0 +1,245 @@
+"""Persistent index of installed fonts with file and family-name lookup."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path, PureWindowsPath
+
+from src.utils.cache_dir import get_cache_dir
+from src.utils.lazy_import import lazy_import
+
+ImageFont = lazy_import('PIL.ImageFont')
+
+FONT_EXTENSIONS = {'.ttf', '.otf', '.ttc'}
+
+# Fonts shipped with the project
+PROJECT_FONT_DIR = Path(__file__).resolve().parent.parent.parent / 'assets' / 'fonts'
+
+# Metric-compatible or visually close substitutes for fonts configs
+# reference by Windows path (file stem -> candidate family names)
+FONT_SUBSTITUTES = {
+    'arial': ['Arial', 'Liberation Sans', 'Arimo', 'DejaVu Sans'],
+    'times': ['Times New Roman', 'Liberation Serif', 'Tinos', 'DejaVu Serif'],
+    'cour': ['Courier New', 'Liberation Mono', 'Cousine', 'DejaVu Sans Mono'],
+    'calibri': ['Calibri', 'Carlito', 'DejaVu Sans'],
+    'georgia': ['Georgia', 'Gelasio', 'DejaVu Serif'],
+    'segoeui': ['Segoe UI', 'Noto Sans', 'DejaVu Sans'],
+    'mistral': ['Mistral', 'URW Chancery L', 'Z003', 'DejaVu Serif'],
+}
+
+# Families with Cyrillic coverage used when nothing else matches
+FALLBACK_FAMILIES = ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Noto Sans', 'FreeSans']
+
+INDEX_VERSION = 1
+
+
+def system_font_dirs() -> list[Path]:
+    """
+    Get platform font directories plus the project font folder.
+
+    Extra directories can be added with $CALENDAR_MAKER_FONT_DIRS
+    (separated by os.pathsep).
+
+    Returns:
+        List of font directories (not necessarily existing)
+    """
+    home = Path.home()
+    if sys.platform.startswith('win'):
+        windir = os.environ.get('WINDIR', 'C:/Windows')
+        dirs = [Path(windir) / 'Fonts']
+        local = os.environ.get('LOCALAPPDATA')
+        if local:
+            dirs.append(Path(local) / 'Microsoft' / 'Windows' / 'Fonts')
+    elif sys.platform == 'darwin':
+        dirs = [Path('/System/Library/Fonts'), Path('/Library/Fonts'),
+                home / 'Library' / 'Fonts']
+    else:
+        dirs = [Path('/usr/share/fonts'), Path('/usr/local/share/fonts'),
+                home / '.local' / 'share' / 'fonts', home / '.fonts']
+
+    extra = os.environ.get('CALENDAR_MAKER_FONT_DIRS', '')
+    dirs.extend(Path(p) for p in extra.split(os.pathsep) if p)
+    dirs.append(PROJECT_FONT_DIR)
+    return dirs
+
+
+def _display_name(family: str, style: str) -> str:
+    """Human-readable font name, e.g. 'DejaVu Sans Bold'."""
+    if not style or style.lower() in ('regular', 'normal', 'book', 'roman'):
+        return family
+    return f"{family} {style}"
+
+
+class FontIndex:
+    """Index of font files keyed by file name and family/style name."""
+
+    def __init__(self, font_dirs: list[Path] | None = None,
+                 cache_path: Path | None = None):
+        """
+        Initialize font index, loading it from cache or scanning directories.
+
+        Args:
+            font_dirs: Directories to scan (defaults to system_font_dirs())
+            cache_path: Index cache file (defaults to the user cache dir)
+        """
+        self.font_dirs = [Path(d) for d in (font_dirs or system_font_dirs())]
+        self.cache_path = Path(cache_path) if cache_path else (
+            get_cache_dir() / 'font_index.json'
+        )
+        self.entries: list[dict] = []
+        self._by_file: dict[str, str] = {}
+        self._by_name: dict[str, str] = {}
+        self._resolved: dict[str, str | None] = {}
+        self._load()
+
+    def _dir_mtimes(self) -> dict[str, float]:
+        """Collect modification times of every scanned directory."""
+        mtimes = {}
+        for root in self.font_dirs:
+            if not root.is_dir():
+                continue
+            for dirpath, _, _ in os.walk(root):
+                try:
+                    mtimes[dirpath] = os.stat(dirpath).st_mtime
+                except OSError:
+                    continue
+        return mtimes
+
+    def _load(self):
+        """Load the index from cache, rescanning if any directory changed."""
+        mtimes = self._dir_mtimes()
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == INDEX_VERSION and cached.get('dirs') == mtimes:
+                self.entries = cached['fonts']
+                self._build_lookup()
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self.entries = self._scan(mtimes)
+        self._build_lookup()
+        self._save(mtimes)
+
+    def _scan(self, mtimes: dict[str, float]) -> list[dict]:
+        """Read family and style names from every font file."""
+        entries = []
+        for dirpath in mtimes:
+            try:
+                names = sorted(os.listdir(dirpath))
+            except OSError:
+                continue
+            for name in names:
+                if Path(name).suffix.lower() not in FONT_EXTENSIONS:
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    family, style = ImageFont.truetype(path, 12).getname()
+                except Exception:
+                    continue
+                entries.append({'path': path, 'family': family or '', 'style': style or ''})
+        return entries
+
+    def _save(self, mtimes: dict[str, float]):
+        """Write the index atomically so concurrent readers never see partial JSON."""
+        data = {'version': INDEX_VERSION, 'dirs': mtimes, 'fonts': self.entries}
+        tmp_path = self.cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Font index cache not saved: {e}")
+
+    def _build_lookup(self):
+        """Build O(1) lookup tables from index entries."""
+        self._by_file.clear()
+        self._by_name.clear()
+        self._resolved.clear()
+        for entry in self.entries:
+            path = entry['path']
+            file_name = Path(path).name.lower()
+            self._by_file.setdefault(file_name, path)
+            self._by_name.setdefault(Path(path).stem.lower(), path)
+            family, style = entry['family'], entry['style']
+            self._by_name.setdefault(_display_name(family, style).lower(), path)
+            self._by_name.setdefault(f"{family} {style}".lower(), path)
+        # Bare family name prefers the regular face
+        for entry in self.entries:
+            if _display_name(entry['family'], entry['style']) == entry['family']:
+                self._by_name[entry['family'].lower()] = entry['path']
+        for entry in self.entries:
+            self._by_name.setdefault(entry['family'].lower(), entry['path'])
+
+    def resolve(self, font: str) -> str | None:
+        """
+        Resolve a font path or family name to an existing font file.
+
+        Tries the path as given, then the file name, then family/style
+        names, then known substitutes for common Windows fonts.
+
+        Args:
+            font: Font path (any OS) or family name, e.g. 'DejaVu Sans Bold'
+
+        Returns:
+            Path to font file, or None if nothing matches
+        """
+        if not font:
+            return None
+        if font in self._resolved:
+            return self._resolved[font]
+
+        path = None
+        if Path(font).is_file():
+            path = font
+        else:
+            # PureWindowsPath splits on both '/' and '\\'
+            name = PureWindowsPath(font).name.lower()
+            stem = name.rsplit('.', 1)[0] if Path(name).suffix.lower() in FONT_EXTENSIONS else name
+            path = (self._by_file.get(name)
+                    or self._by_name.get(font.strip().lower())
+                    or self._by_name.get(stem))
+            if path is None:
+                for family in FONT_SUBSTITUTES.get(stem, []):
+                    path = self._by_name.get(family.lower())
+                    if path:
+                        break
+
+        self._resolved[font] = path
+        return path
+
+    def fallback(self) -> str | None:
+        """
+        Get a general-purpose font with Cyrillic coverage.
+
+        Returns:
+            Path to font file, or None if the index is empty
+        """
+        for family in FALLBACK_FAMILIES:
+            path = self._by_name.get(family.lower())
+            if path:
+                return path
+        return self.entries[0]['path'] if self.entries else None
+
+    def display_names(self) -> list[str]:
+        """
+        Get sorted unique font names suitable for configs and pickers.
+
+        Returns:
+            List of names like 'DejaVu Sans' or 'DejaVu Sans Bold'
+        """
+        return sorted({_display_name(e['family'], e['style']) for e in self.entries})
+
+
+_font_index: FontIndex | None = None
+
+
+def get_font_index() -> FontIndex:
+    """Get the process-wide font index (built or loaded on first use)."""
+    global _font_index
+    if _font_index is None:
+        _font_index = FontIndex()
+    return _font_index
@@ -1,7 +1,18 @@
 """Font management utilities."""
 
-from pathlib import Path
-from PIL import ImageFont
+from __future__ import annotations
+
+import time
+
+from src.utils.lazy_import import lazy_import
+from src.utils.cache_registry import get_cache_registry
+from src.utils.font_index import get_font_index
+from src.utils.text_layout import DEFAULT_MIN_FONT_SIZE, get_text_layout
+
+ImageFont = lazy_import('PIL.ImageFont')
+
+# Approximate memory of a loaded FreeType face and its glyph cache
+FONT_ENTRY_BYTES = 32 * 1024
 
 
 class FontManager:
@@ -15,31 +26,24 @@ class FontManager:
             default_font: Path to default font file
         """
         self.default_font = default_font
+        self.font_index = get_font_index()
         self.font_cache: dict[int, ImageFont.FreeTypeFont] = {}
+        self._file_font_cache = get_cache_registry().cache('fonts')
+        self._default_path: str | None = None
         self._init_fonts()
 
     def _init_fonts(self):
         """Initialize fonts for common sizes."""
-        font_path = self.default_font
-
-        # Check if font file exists
-        if not Path(font_path).exists():
-            # Try alternative fonts
-            alt_fonts = [
-                'C:/Windows/Fonts/arial.ttf',
-                'C:/Windows/Fonts/times.ttf',
-                'C:/Windows/Fonts/calibri.ttf',
-                'C:/Windows/Fonts/consola.ttf',
-            ]
-            for alt in alt_fonts:
-                if Path(alt).exists():
-                    font_path = alt
-                    break
+        # Resolve config path or family name through the system font index
+        font_path = (self.font_index.resolve(self.default_font)
+                     or self.font_index.fallback()
+                     or self.default_font)
 
         try:
             # Cache fonts for different sizes
             for size in [24, 32, 48, 64, 78]:
                 self.font_cache[size] = ImageFont.truetype(font_path, size)
+            self._default_path = font_path
             print(f"Fonts loaded: {font_path}")
         except Exception as e:
             print(f"Font loading error: {e}")
@@ -47,6 +51,12 @@ class FontManager:
             for size in [24, 32, 48, 64, 78]:
                 self.font_cache[size] = ImageFont.load_default()
 
+    def reload(self):
+        """Drop loaded fonts and load them again (after font files changed)."""
+        self.font_cache.clear()
+        self._file_font_cache.clear()
+        self._init_fonts()
+
     def get_font(self, size: int) -> ImageFont.FreeTypeFont:
         """
         Get font of nearest size.
@@ -65,20 +75,63 @@ class FontManager:
         closest = min(sizes, key=lambda x: abs(x - size))
         return self.font_cache[closest]
 
+    def resolve_path(self, font_path: str) -> str | None:
+        """
+        Get the font file load_font uses for a path or family name.
+
+        Args:
+            font_path: Path to font file or font family name
+
+        Returns:
+            Font file path, or None if neither it nor the default resolves
+        """
+        # Unknown fonts use the default face at the exact requested size
+        return self.font_index.resolve(font_path) or self._default_path
+
+    def fit_size(self, font_path: str, text: str, box: tuple[int, int], max_size: int,
+                 min_size: int = DEFAULT_MIN_FONT_SIZE, **options) -> int:
+        """
+        Find the largest size of a font at which text fits a box.
+
+        Args:
+            font_path: Path to font file or font family name
+            text: Text to fit
+            box: (width, height) available
+            max_size: Largest size to consider (usually the configured size)
+            min_size: Smallest size returned
+            **options: wrap, max_lines, line_spacing, stroke (see TextLayout.fit_size)
+
+        Returns:
+            Font size
+        """
+        return get_text_layout().fit_size(
+            lambda size: self.load_font(font_path, size), self.resolve_path(font_path) or font_path,
+            text, box, max_size, min_size, **options
+        )
+
     def load_font(self, font_path: str, size: int) -> ImageFont.FreeTypeFont:
         """
         Load a specific font file.
 
         Args:
-            font_path: Path to font file
+            font_path: Path to font file or font family name
             size: Font size
 
         Returns:
             Font object
         """
-        if Path(font_path).exists():
+        resolved = self.resolve_path(font_path)
+        if resolved:
+            key = (resolved, size)
+            font = self._file_font_cache.get(key)
+            if font is not None:
+                return font
             try:
-                return ImageFont.truetype(font_path, size)
+                start = time.perf_counter()
+                font = ImageFont.truetype(resolved, size)
+                self._file_font_cache.put(key, font, cost=time.perf_counter() - start,
+                                          nbytes=FONT_ENTRY_BYTES)
+                return font
             except Exception:
                 pass
         return self.get_font(size)
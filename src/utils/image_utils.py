@@ -1,10 +1,34 @@
 """Image manipulation utilities."""
 
-import cv2
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from __future__ import annotations
+
+import time
 from pathlib import Path
 
+from src.utils.lazy_import import lazy_import
+from src.utils.asset_cache import get_asset_cache
+from src.utils.cache_registry import file_signature, get_cache_registry
+from src.utils.prefetch import get_attached_prefetcher
+from src.utils.raster_backend import Cv2Backend, get_raster_backend
+from src.utils.shared_assets import get_attached_store
+from src.utils.text_layout import get_text_layout
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+
+# Upper bound for float64 scratch memory of one batched blend chunk
+BATCH_BLEND_BYTES = 64 * 1024 * 1024
+
+# JPEG DCT scaling factors OpenCV can decode at, strongest first
+REDUCED_DECODE_FLAGS = ((8, 'IMREAD_REDUCED_COLOR_8'),
+                        (4, 'IMREAD_REDUCED_COLOR_4'),
+                        (2, 'IMREAD_REDUCED_COLOR_2'))
+
+JPEG_MAGIC = b'\xff\xd8\xff'
+
 
 class ImageUtils:
     """Utility class for image operations."""
@@ -40,6 +64,12 @@ class ImageUtils:
         Returns:
             Composite image
         """
+        return get_raster_backend().composite(background, [(foreground, x, y)])
+
+    @staticmethod
+    def _overlay_image(background: np.ndarray, foreground: np.ndarray,
+                       x: int, y: int) -> np.ndarray:
+        """overlay_image with numpy (the cv2 backend's composite of one tile)."""
         bg = background.copy()
         fg = ImageUtils.ensure_bgra(foreground)
 
@@ -58,30 +88,191 @@ class ImageUtils:
         fg_cropped = fg[:fg_h, :fg_w]
         roi = bg[y:y_end, x:x_end]
 
-        # Alpha blending
-        alpha = fg_cropped[:, :, 3].astype(float) / 255.0
+        ImageUtils._blend_into(roi, fg_cropped)
+        return bg
+
+    @staticmethod
+    def _blend_into(roi: np.ndarray, fg: np.ndarray):
+        """
+        Alpha-blend foreground into roi in place ("over" operator).
+
+        Works on any leading dimensions (single tile or a stack of tiles);
+        the last axis is BGRA.
+        """
+        alpha = fg[..., 3].astype(float) / 255.0
         alpha_inv = 1.0 - alpha
 
         for c in range(3):
-            fg_channel = fg_cropped[:, :, c].astype(float)
-            roi_channel = roi[:, :, c].astype(float)
-            roi[:, :, c] = (alpha * fg_channel + alpha_inv * roi_channel).astype(np.uint8)
+            fg_channel = fg[..., c].astype(float)
+            roi_channel = roi[..., c].astype(float)
+            roi[..., c] = (alpha * fg_channel + alpha_inv * roi_channel).astype(np.uint8)
 
         # Blend alpha channel as well
-        bg_alpha = roi[:, :, 3].astype(float) / 255.0
-        fg_alpha = fg_cropped[:, :, 3].astype(float) / 255.0
-        new_alpha = fg_alpha + bg_alpha * (1 - fg_alpha)
-        roi[:, :, 3] = (new_alpha * 255).astype(np.uint8)
+        bg_alpha = roi[..., 3].astype(float) / 255.0
+        new_alpha = alpha + bg_alpha * (1 - alpha)
+        roi[..., 3] = (new_alpha * 255).astype(np.uint8)
 
-        bg[y:y_end, x:x_end] = roi
-        return bg
+    @staticmethod
+    def _over_into(roi: np.ndarray, fg: np.ndarray):
+        """
+        Straight-alpha Porter-Duff "over" in place.
+
+        Unlike _blend_into, this weights the destination color by its own
+        alpha, so it is correct on transparent destinations. On opaque
+        destinations both give the same result up to rounding.
+        """
+        fg_alpha = fg[..., 3].astype(float) / 255.0
+        bg_weight = roi[..., 3].astype(float) / 255.0 * (1.0 - fg_alpha)
+        out_alpha = fg_alpha + bg_weight
+        safe_alpha = np.where(out_alpha > 0, out_alpha, 1.0)
+
+        for c in range(3):
+            color = (fg_alpha * fg[..., c] + bg_weight * roi[..., c]) / safe_alpha
+            roi[..., c] = np.rint(color).astype(np.uint8)
+        roi[..., 3] = np.rint(out_alpha * 255).astype(np.uint8)
+
+    @staticmethod
+    def overlay_layer(background: np.ndarray, foreground: np.ndarray,
+                      x: int, y: int) -> np.ndarray:
+        """
+        Overlay foreground onto a possibly transparent layer.
+
+        Use this to build layers that are composited onto a page later;
+        use overlay_image to composite onto opaque pages.
+
+        Args:
+            background: Layer image (BGRA, may be transparent)
+            foreground: Foreground image (BGRA)
+            x, y: Top-left corner position (must be non-negative)
+
+        Returns:
+            Composite layer
+        """
+        layer = background.copy()
+        fg = ImageUtils.ensure_bgra(foreground)
+        bh, bw = layer.shape[:2]
+        if x >= bw or y >= bh:
+            return layer
+        roi = layer[y:min(y + fg.shape[0], bh), x:min(x + fg.shape[1], bw)]
+        ImageUtils._over_into(roi, fg[:roi.shape[0], :roi.shape[1]])
+        return layer
+
+    @staticmethod
+    def _grid_view(image: np.ndarray, placements: list[tuple[np.ndarray, int, int]]):
+        """
+        Map placements onto a strided (rows, cols, h, w, 4) view of image.
+
+        Returns:
+            (view, row_indices, col_indices), or None if the placements are
+            not equally sized, fully inside, non-overlapping cells of one
+            regular grid
+        """
+        h, w = placements[0][0].shape[:2]
+        bh, bw = image.shape[:2]
+        xs = sorted({x for _, x, _ in placements})
+        ys = sorted({y for _, _, y in placements})
+        pitch_x = xs[1] - xs[0] if len(xs) > 1 else w
+        pitch_y = ys[1] - ys[0] if len(ys) > 1 else h
+        x0, y0 = xs[0], ys[0]
+        if pitch_x < w or pitch_y < h or x0 < 0 or y0 < 0:
+            return None
+        if xs[-1] + w > bw or ys[-1] + h > bh:
+            return None
+
+        rows, cols, seen = [], [], set()
+        for tile, x, y in placements:
+            if tile.shape[:2] != (h, w):
+                return None
+            if (x - x0) % pitch_x or (y - y0) % pitch_y:
+                return None
+            cell = ((y - y0) // pitch_y, (x - x0) // pitch_x)
+            if cell in seen:
+                return None
+            seen.add(cell)
+            rows.append(cell[0])
+            cols.append(cell[1])
+
+        s_row, s_col, s_ch = image.strides
+        n_rows = (ys[-1] - y0) // pitch_y + 1
+        n_cols = (xs[-1] - x0) // pitch_x + 1
+        view = np.lib.stride_tricks.as_strided(
+            image[y0:, x0:],
+            shape=(n_rows, n_cols, h, w, 4),
+            strides=(pitch_y * s_row, pitch_x * s_col, s_row, s_col, s_ch),
+        )
+        return view, np.array(rows), np.array(cols)
+
+    @staticmethod
+    def composite_batch(background: np.ndarray,
+                        placements: list[tuple[np.ndarray, int, int]]) -> np.ndarray:
+        """
+        Overlay many tiles on a background in one pass.
+
+        Equivalent to calling overlay_image for each (tile, x, y) in order,
+        but copies the background once. Equally sized tiles on a regular
+        grid (e.g. day cells) are gathered through a strided view and
+        blended as stacked arrays, a chunk of tiles at a time. Other
+        placements fall back to per-tile blending.
+
+        Args:
+            background: Background image (BGRA)
+            placements: List of (tile, x, y) with BGRA tiles
+
+        Returns:
+            Composite image
+        """
+        return get_raster_backend().composite(background, placements)
+
+    @staticmethod
+    def _composite_batch(background: np.ndarray,
+                         placements: list[tuple[np.ndarray, int, int]]) -> np.ndarray:
+        """composite_batch with numpy (the cv2 backend's composite)."""
+        result = background.copy()
+        if not placements:
+            return result
+        placements = [(ImageUtils.ensure_bgra(t), x, y) for t, x, y in placements]
+
+        grid = ImageUtils._grid_view(result, placements)
+        if grid is None:
+            for tile, x, y in placements:
+                bh, bw = result.shape[:2]
+                if x >= bw or y >= bh:
+                    continue
+                th, tw = tile.shape[:2]
+                roi = result[y:min(y + th, bh), x:min(x + tw, bw)]
+                ImageUtils._blend_into(roi, tile[:roi.shape[0], :roi.shape[1]])
+            return result
+
+        view, rows, cols = grid
+
+        # Blend in chunks to bound float64 scratch memory
+        h, w = placements[0][0].shape[:2]
+        chunk = max(1, BATCH_BLEND_BYTES // (h * w * 4 * 8))
+        for start in range(0, len(placements), chunk):
+            sel = slice(start, start + chunk)
+            r, c = rows[sel], cols[sel]
+            roi = view[r, c]
+            ImageUtils._blend_into(roi, np.stack([tile for tile, _, _ in placements[sel]]))
+            view[r, c] = roi
+        return result
+
+    # 1px white outline drawn around text for contrast
+    OUTLINE_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+    @staticmethod
+    def _text_origin(text: str, pos: tuple, font: ImageFont.FreeTypeFont,
+                     align: str, valign: str = 'bottom') -> tuple[int, int]:
+        """Convert an aligned anchor position to PIL's draw origin."""
+        # By default pos is the bottom edge of the text box (adjusted for PIL baseline)
+        return get_text_layout().aligned_position(font, text, pos[0], pos[1], align, valign)
 
     @staticmethod
     def draw_text(img: np.ndarray, text: str, pos: tuple,
                   color: tuple, font: ImageFont.FreeTypeFont,
-                  align: str = 'left', outline: bool = True) -> np.ndarray:
+                  align: str = 'left', outline: bool = True,
+                  valign: str = 'bottom') -> np.ndarray:
         """
-        Draw text on image using PIL (supports Cyrillic).
+        Draw text on image with the raster backend (PIL fonts, supports Cyrillic).
 
         Args:
             img: Image to draw on (BGRA numpy array)
@@ -91,49 +282,184 @@ class ImageUtils:
             font: PIL font object
             align: Text alignment ('left', 'center', 'right')
             outline: Add white outline for contrast
+            valign: Vertical anchor of pos ('top', 'center', 'bottom')
 
         Returns:
             Image with text
         """
-        # Convert numpy array to PIL Image
-        img_pil = Image.fromarray(img)
-        draw = ImageDraw.Draw(img_pil)
+        x, y = ImageUtils._text_origin(text, pos, font, align, valign)
+        return get_raster_backend().draw_text(img, ImageUtils._text_runs(text, x, y, color,
+                                                                         font, outline))
 
-        # Get text dimensions for alignment
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+    @staticmethod
+    def _text_runs(text: str, x: int, y: int, color: tuple,
+                   font: ImageFont.FreeTypeFont, outline: bool) -> list[tuple]:
+        """Raster backend runs for one text: white outline passes, then the text."""
+        runs = []
+        # Draw outline (white) for contrast
+        if outline:
+            runs = [(text, (x + dx, y + dy), font, (255, 255, 255))
+                    for dx, dy in ImageUtils.OUTLINE_OFFSETS]
+        runs.append((text, (x, y), font, color))
+        return runs
 
-        x, y = pos
+    @staticmethod
+    def text_masks(size: tuple[int, int], text: str, pos: tuple,
+                   font: ImageFont.FreeTypeFont, align: str = 'left',
+                   outline: bool = True, valign: str = 'bottom') -> list[tuple]:
+        """
+        Rasterize draw_text's glyph coverage without drawing it.
 
-        # Horizontal alignment
-        if align == 'center':
-            x = x - text_width // 2
-        elif align == 'right':
-            x = x - text_width
+        Each outline pass and the main pass becomes one cropped 'L' mask.
+        Filling them in order with apply_text_masks gives exactly the pixels
+        draw_text would, for any color and any image underneath.
 
-        # Adjust y for PIL baseline
-        y = y - text_height
+        Args:
+            size: (width, height) of the target image (masks are clipped to it)
+            text: Text to draw
+            pos: Position (x, y)
+            font: PIL font object
+            align: Text alignment ('left', 'center', 'right')
+            outline: Add white outline passes
+            valign: Vertical anchor of pos ('top', 'center', 'bottom')
 
-        # Draw outline (white) for contrast
-        if outline:
-            outline_color = (255, 255, 255)
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx != 0 or dy != 0:
-                        draw.text((x + dx, y + dy), text, fill=outline_color, font=font)
+        Returns:
+            List of (is_outline, box, mask) in drawing order
+        """
+        x, y = ImageUtils._text_origin(text, pos, font, align, valign)
+        passes = [(True, (x + dx, y + dy)) for dx, dy in ImageUtils.OUTLINE_OFFSETS] if outline else []
+        passes.append((False, (x, y)))
+
+        # Rasterize on a canvas around the text (plus outline), clipped to the image
+        bbox = get_text_layout().measure(font, text)['bbox']
+        left, top = max(0, x + bbox[0] - 2), max(0, y + bbox[1] - 2)
+        right, bottom = min(size[0], x + bbox[2] + 2), min(size[1], y + bbox[3] + 2)
+        if right <= left or bottom <= top:
+            return []
+
+        canvas = Image.new('L', (right - left, bottom - top), 0)
+        draw = ImageDraw.Draw(canvas)
+        masks = []
+        for is_outline, (ox, oy) in passes:
+            canvas.paste(0, (0, 0, *canvas.size))
+            draw.text((ox - left, oy - top), text, fill=255, font=font)
+            box = canvas.getbbox()
+            if box:
+                masks.append((is_outline, (box[0] + left, box[1] + top, box[2] + left, box[3] + top),
+                              canvas.crop(box)))
+        return masks
 
-        # Draw main text
-        draw.text((x, y), text, fill=color, font=font)
+    @staticmethod
+    def apply_text_masks(img: np.ndarray, masks: list[tuple], color: tuple) -> np.ndarray:
+        """
+        Fill text_masks results onto an image.
 
-        # Convert back to numpy array
+        Args:
+            img: Image to draw on (BGRA numpy array)
+            masks: text_masks result
+            color: RGB color tuple (outline passes are white)
+
+        Returns:
+            Image with text
+        """
+        img_pil = Image.fromarray(img)
+        for is_outline, box, mask in masks:
+            img_pil.paste((255, 255, 255) if is_outline else tuple(color), box, mask)
         return np.array(img_pil)
 
+    @staticmethod
+    def draw_text_lines(img: np.ndarray, lines: list[str], pos: tuple,
+                        color: tuple, font: ImageFont.FreeTypeFont,
+                        align: str = 'left', line_height: int = 0,
+                        outline: bool = True) -> np.ndarray:
+        """
+        Draw several lines of text in one raster backend call.
+
+        Args:
+            img: Image to draw on (BGRA numpy array)
+            lines: Lines of text, top to bottom
+            pos: (x, y) where x is the anchor for align and y the top of the first line
+            color: RGB color tuple
+            font: PIL font object
+            align: Horizontal alignment of each line ('left', 'center', 'right')
+            line_height: Distance between line tops (font ascent + descent if 0)
+            outline: Add white outline for contrast
+
+        Returns:
+            Image with text
+        """
+        if not any(lines):
+            return img
+        if not line_height:
+            ascent, descent = font.getmetrics()
+            line_height = ascent + descent
+
+        layout = get_text_layout()
+        runs = []
+        for i, line in enumerate(lines):
+            if not line:
+                continue
+            x, y = layout.aligned_position(font, line, pos[0], pos[1] + i * line_height,
+                                           align, 'top')
+            runs += ImageUtils._text_runs(line, x, y, color, font, outline)
+        return get_raster_backend().draw_text(img, runs)
+
+    @staticmethod
+    def draw_text_layer(img: np.ndarray, text: str, pos: tuple,
+                        color: tuple, font: ImageFont.FreeTypeFont,
+                        align: str = 'left', outline: bool = True) -> np.ndarray:
+        """
+        Draw text like draw_text, blending glyph coverage as straight alpha.
+
+        PIL paints anti-aliased edges directly into RGBA pixels, which darkens
+        them on transparent images. This variant renders coverage masks and
+        composites them with a straight-alpha "over", so the result is correct
+        on transparent layers that are composited later (e.g. cached header
+        strips).
+
+        Args:
+            img: Image to draw on (BGRA numpy array, may be transparent)
+            text: Text to draw
+            pos: Position (x, y)
+            color: Color tuple in the image's channel order, as for draw_text
+            font: PIL font object
+            align: Text alignment ('left', 'center', 'right')
+            outline: Add white outline for contrast
+
+        Returns:
+            Image with text
+        """
+        h, w = img.shape[:2]
+        result = img.copy()
+
+        def blend_mask(fill: tuple, offsets: list[tuple[int, int]]):
+            mask_img = Image.new('L', (w, h), 0)
+            draw = ImageDraw.Draw(mask_img)
+            x, y = ImageUtils._text_origin(text, pos, font, align)
+            for dx, dy in offsets:
+                draw.text((x + dx, y + dy), text, fill=255, font=font)
+            layer = np.empty((h, w, 4), dtype=np.uint8)
+            layer[..., :3] = fill[:3]
+            layer[..., 3] = np.asarray(mask_img)
+            ImageUtils._over_into(result, layer)
+
+        if outline:
+            blend_mask((255, 255, 255), ImageUtils.OUTLINE_OFFSETS)
+        blend_mask(tuple(color), [(0, 0)])
+        return result
+
     @staticmethod
     def load_background(path: str, width: int, height: int) -> np.ndarray | None:
         """
         Load and resize background image.
 
+        Worker processes read from the attached shared store first (a
+        read-only view, never modify it in place). On a miss of the
+        in-memory cache, an attached AssetPrefetcher hands over its decode
+        of the image if it has one. Resized results are kept
+        in the 'backgrounds' registry cache (read-only arrays) and in the
+        persistent asset cache, so repeated loads skip both decode and resize.
+
         Args:
             path: Path to image file
             width: Target width
@@ -145,15 +471,128 @@ class ImageUtils:
         if not path or not Path(path).exists():
             return None
 
-        background = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        store = get_attached_store()
+        if store is not None:
+            shared = store.get(path, width, height)
+            if shared is not None:
+                return shared
+
+        interpolation = cv2.INTER_LANCZOS4
+        # Other decode/resize backends give slightly different pixels
+        variant = get_raster_backend().cache_tag('decode', 'resize')
+        memory = get_cache_registry().cache('backgrounds')
+        memory_key = (file_signature(path), width, height, interpolation, variant)
+        background = memory.get(memory_key)
+        if background is not None:
+            return background
+
+        prefetcher = get_attached_prefetcher()
+        loaded = prefetcher.take(path, width, height) if prefetcher is not None else None
+        if loaded is None:
+            loaded = ImageUtils.load_background_uncached(path, width, height)
+        background, cost = loaded
         if background is None:
             return None
 
-        background = ImageUtils.ensure_bgra(background)
-        background = cv2.resize(background, (width, height),
-                                interpolation=cv2.INTER_LANCZOS4)
+        background.flags.writeable = False
+        memory.put(memory_key, background, cost=cost)
         return background
 
+    @staticmethod
+    def load_background_uncached(path: str, width: int, height: int) -> tuple:
+        """
+        Load a resized background from the persistent asset cache or by decoding it.
+
+        The part of load_background below the in-memory cache; safe to call
+        from worker threads (the asset prefetcher does).
+
+        Args:
+            path: Path to image file
+            width: Target width
+            height: Target height
+
+        Returns:
+            (BGRA image or None if loading failed, seconds taken)
+        """
+        start = time.perf_counter()
+        interpolation = cv2.INTER_LANCZOS4
+        variant = get_raster_backend().cache_tag('decode', 'resize')
+        cache = get_asset_cache()
+        background = (cache.get(path, width, height, interpolation, variant)
+                      if cache is not None else None)
+        if background is None:
+            background = ImageUtils.decode_background(path, width, height, interpolation)
+            if background is not None and cache is not None:
+                cache.put(path, width, height, interpolation, background, variant)
+        return background, time.perf_counter() - start
+
+    @staticmethod
+    def reduced_decode_factor(path: str, width: int, height: int) -> int:
+        """
+        Pick the strongest reduced JPEG decode that still covers a target size.
+
+        Only the header is read. Sources that are not opaque JPEGs always
+        decode at full size: OpenCV would decode those fully anyway and its
+        reduced modes drop alpha.
+
+        Args:
+            path: Path to image file
+            width: Target width
+            height: Target height
+
+        Returns:
+            Scale factor (1, 2, 4 or 8)
+        """
+        try:
+            # Skip the header parse for anything that is not a JPEG
+            with open(path, 'rb') as f:
+                if f.read(3) != JPEG_MAGIC:
+                    return 1
+            with Image.open(path) as img:
+                if img.format != 'JPEG' or img.mode not in ('RGB', 'L'):
+                    return 1
+                src_w, src_h = img.size
+        except Exception:
+            return 1
+        for factor, _ in REDUCED_DECODE_FLAGS:
+            if src_w // factor >= width and src_h // factor >= height:
+                return factor
+        return 1
+
+    @staticmethod
+    def decode_background(path: str, width: int, height: int,
+                          interpolation: int | None = None,
+                          reduce: bool = True) -> np.ndarray | None:
+        """
+        Decode an image file and resize it to a target size (no caching).
+
+        Large JPEGs are decoded at 1/2, 1/4 or 1/8 scale through DCT
+        scaling, never below the target size, so a 24-megapixel photo for a
+        small cell costs a fraction of the full decode time and memory; the
+        remaining (less than 2x) downscale is done with interpolation.
+
+        Args:
+            path: Path to image file
+            width: Target width
+            height: Target height
+            interpolation: cv2 interpolation flag (Lanczos if None); decode and
+                resize go through the raster backend
+            reduce: Allow reduced-resolution decoding
+
+        Returns:
+            BGRA image or None if decoding failed
+        """
+        if interpolation is None:
+            interpolation = cv2.INTER_LANCZOS4
+        backend = get_raster_backend()
+        factor = ImageUtils.reduced_decode_factor(path, width, height) if reduce else 1
+        image = backend.decode(path, factor)
+        if image is None:
+            return None
+        if image.shape[1] == width and image.shape[0] == height:
+            return image
+        return backend.resize(image, width, height, Cv2Backend.interpolation_name(interpolation))
+
     @staticmethod
     def create_transparent_image(width: int, height: int) -> np.ndarray:
         """
@@ -182,6 +621,45 @@ class ImageUtils:
         """
         return np.full((height, width, 4), 255, dtype=np.uint8)
 
+    @staticmethod
+    def create_color_image(width: int, height: int, color: tuple) -> np.ndarray:
+        """
+        Create opaque single-color BGRA image.
+
+        Args:
+            width: Image width
+            height: Image height
+            color: RGB color tuple
+
+        Returns:
+            BGRA image filled with color
+        """
+        img = np.empty((height, width, 4), dtype=np.uint8)
+        img[:, :] = (color[2], color[1], color[0], 255)
+        return img
+
+    @staticmethod
+    def draw_border(img: np.ndarray, thickness: int, color: tuple) -> np.ndarray:
+        """
+        Draw an opaque border along the inside of the image edges.
+
+        Args:
+            img: BGRA image (modified in place)
+            thickness: Border width in pixels
+            color: RGB color tuple
+
+        Returns:
+            Image with border
+        """
+        if thickness <= 0:
+            return img
+        bgra = (color[2], color[1], color[0], 255)
+        img[:thickness, :] = bgra
+        img[-thickness:, :] = bgra
+        img[:, :thickness] = bgra
+        img[:, -thickness:] = bgra
+        return img
+
     @staticmethod
     def cv2_to_qimage(img: np.ndarray) -> tuple:
         """
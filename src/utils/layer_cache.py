@@ -0,0 +1,52 @@
+"""Cache keys for rasterized month layers and the registry cache holding them."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+from src.utils.cache_registry import MemoryCache, file_signature, get_cache_registry
+
+__all__ = ['array_signature', 'file_signature', 'get_layer_cache', 'layer_key']
+
+
+def array_signature(array) -> tuple | None:
+    """
+    Identify in-memory image content for cache keys, like file_signature for files.
+
+    Args:
+        array: Numpy array (or None)
+
+    Returns:
+        (shape, content digest) or None
+    """
+    if array is None:
+        return None
+    digest = hashlib.blake2b(array.tobytes(), digest_size=16).hexdigest()
+    return (tuple(array.shape), digest)
+
+
+def layer_key(name: str, inputs) -> str:
+    """
+    Hash a layer's inputs into a cache key.
+
+    Args:
+        name: Layer name (part of the key, so layers never collide)
+        inputs: JSON-serializable description of everything the layer depends on
+
+    Returns:
+        Hex digest
+    """
+    payload = json.dumps([name, inputs], sort_keys=True, ensure_ascii=False, default=str)
+    return f"{name}:{hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()}"
+
+
+def get_layer_cache() -> MemoryCache:
+    """
+    Get the cache of rendered month layers.
+
+    Keys come from layer_key, so a layer is reused whenever its inputs
+    (config values, file versions, geometry) are unchanged, regardless of
+    which renderer instance asks for it.
+    """
+    return get_cache_registry().cache('layers')
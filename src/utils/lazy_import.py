@@ -0,0 +1,44 @@
+"""Deferred imports for heavy dependencies (cv2, numpy, PIL)."""
+
+import importlib
+from types import ModuleType
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        """
+        Initialize lazy module proxy.
+
+        Args:
+            name: Fully qualified module name, e.g. 'cv2' or 'PIL.Image'
+        """
+        self._name = name
+        self._module: ModuleType | None = None
+
+    def _load(self) -> ModuleType:
+        """Import the wrapped module once and remember it."""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Return a proxy that imports module `name` on first use.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        Lazy module proxy
+    """
+    return LazyModule(name)
@@ -0,0 +1,404 @@
+"""Small PDF writer: pages, shared image XObjects and embedded TrueType fonts."""
+
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import Callable
+
+from src.utils.lazy_import import lazy_import
+from src.utils.truetype import TrueTypeFont
+
+np = lazy_import('numpy')
+
+PDF_VERSION = '1.6'
+
+# FontDescriptor flags: symbolic (glyphs are addressed by id, not a standard encoding)
+FONT_FLAG_FIXED_PITCH = 1
+FONT_FLAG_SYMBOLIC = 4
+FONT_FLAG_ITALIC = 64
+
+
+def _num(value: float) -> str:
+    """Format a number compactly for content streams."""
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.4f}".rstrip('0').rstrip('.')
+
+
+def _color(rgb: tuple) -> str:
+    return ' '.join(_num(c / 255) for c in rgb[:3])
+
+
+class EmbeddedFont:
+    """A font file used on some pages; written once, subset to the glyphs used."""
+
+    def __init__(self, writer: PdfWriter, ttf: TrueTypeFont, name: str):
+        self.ttf = ttf
+        self.name = name
+        self.object_id = writer.reserve()
+        # glyph id -> text it stands for (for copy/paste via ToUnicode)
+        self.used: dict[int, str] = {}
+
+    def encode(self, text: str) -> list[int]:
+        """Glyph ids for text, recording them for the subset."""
+        gids = self.ttf.glyph_ids(text)
+        for gid, char in zip(gids, text):
+            self.used.setdefault(gid, char)
+        return gids
+
+    def _subset_tag(self) -> str:
+        digest = hashlib.md5(repr(sorted(self.used)).encode()).digest()
+        return ''.join(chr(ord('A') + b % 26) for b in digest[:6])
+
+    def _widths(self) -> str:
+        entries = ' '.join(f"{gid} [{_num(round(self.ttf.advance(gid)))}]"
+                           for gid in sorted(self.used))
+        return f"[{entries}]"
+
+    def _to_unicode(self) -> bytes:
+        lines = [f"<{gid:04X}> <{''.join(f'{u:04X}' for u in _utf16(text))}>"
+                 for gid, text in sorted(self.used.items())]
+        chunks = [lines[i:i + 100] for i in range(0, len(lines), 100)]
+        body = ''.join(f"{len(chunk)} beginbfchar\n" + '\n'.join(chunk) + "\nendbfchar\n"
+                       for chunk in chunks)
+        return ("/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+                "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+                "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+                "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+                f"{body}endcmap\nCMapName currentdict /CMap defineresource pop\nend\nend\n"
+                ).encode('ascii')
+
+    def write(self, writer: PdfWriter):
+        """Write the font dictionaries and the (subset) font file."""
+        ttf = self.ttf
+        scale = 1000 / ttf.units_per_em
+        if ttf.is_cff:
+            base_font = ttf.postscript_name
+            font_file = writer.add_stream('/Subtype /OpenType', ttf.font_file())
+            file_key, subtype, cid_map = 'FontFile3', 'CIDFontType0', ''
+        else:
+            base_font = f"{self._subset_tag()}+{ttf.postscript_name}"
+            font_file = writer.add_stream('', ttf.font_file(set(self.used)))
+            file_key, subtype, cid_map = 'FontFile2', 'CIDFontType2', ' /CIDToGIDMap /Identity'
+
+        flags = FONT_FLAG_SYMBOLIC
+        if ttf.fixed_pitch:
+            flags |= FONT_FLAG_FIXED_PITCH
+        if ttf.italic_angle:
+            flags |= FONT_FLAG_ITALIC
+        bbox = ' '.join(_num(round(v * scale)) for v in ttf.bbox)
+        descriptor = writer.add_object(
+            f"<< /Type /FontDescriptor /FontName /{base_font} /Flags {flags} "
+            f"/FontBBox [{bbox}] /ItalicAngle {_num(ttf.italic_angle)} "
+            f"/Ascent {_num(round(ttf.ascent * scale))} /Descent {_num(round(ttf.descent * scale))} "
+            f"/CapHeight {_num(round(ttf.cap_height * scale))} "
+            f"/StemV {_num(50 + ttf.weight // 5)} /{file_key} {font_file} 0 R >>"
+        )
+        cid_font = writer.add_object(
+            f"<< /Type /Font /Subtype /{subtype} /BaseFont /{base_font} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {descriptor} 0 R /W {self._widths()}{cid_map} >>"
+        )
+        to_unicode = writer.add_stream('', self._to_unicode())
+        writer.set_object(self.object_id, (
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{base_font} /Encoding /Identity-H "
+            f"/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>"
+        ))
+
+
+def _utf16(text: str) -> list[int]:
+    """UTF-16 code units of text."""
+    data = text.encode('utf-16-be')
+    return [int.from_bytes(data[i:i + 2], 'big') for i in range(0, len(data), 2)]
+
+
+class PdfCanvas:
+    """
+    Content stream builder in pixel coordinates (origin top-left, y down).
+
+    The page transform set up by PdfWriter.add_page maps pixels to points,
+    so drawing code uses the same coordinates as the raster renderers.
+    """
+
+    def __init__(self):
+        self.ops: list[str] = []
+
+    def save(self):
+        self.ops.append('q')
+
+    def restore(self):
+        self.ops.append('Q')
+
+    def clip(self, x: float, y: float, width: float, height: float):
+        """Intersect the clip region with a rectangle (until restore)."""
+        self.ops.append(f"{_num(x)} {_num(y)} {_num(width)} {_num(height)} re W n")
+
+    def rect(self, x: float, y: float, width: float, height: float, color: tuple):
+        """Fill a rectangle with an RGB color."""
+        self.ops.append(f"{_color(color)} rg {_num(x)} {_num(y)} {_num(width)} {_num(height)} re f")
+
+    def image(self, name: str, x: float, y: float, width: float, height: float):
+        """Draw an image XObject stretched to a rectangle."""
+        self.ops.append(f"q {_num(width)} 0 0 {_num(-height)} {_num(x)} {_num(y + height)} cm "
+                        f"/{name} Do Q")
+
+    def form(self, name: str, alpha_state: str | None = None):
+        """Draw a form XObject, optionally through an ExtGState (e.g. group opacity)."""
+        state = f"/{alpha_state} gs " if alpha_state else ''
+        self.ops.append(f"q {state}/{name} Do Q")
+
+    def text(self, font: EmbeddedFont, size: float, x: float, baseline: float, text: str,
+             positions: list[float], color: tuple, outline: float = 0.0):
+        """
+        Show a line of text with each glyph at a given pen position.
+
+        Args:
+            font: Embedded font
+            size: Font size in pixels
+            x: Pen start
+            baseline: Baseline y
+            text: Text
+            positions: Pen x of each character relative to x (as laid out
+                by the raster renderer, including hinting and kerning)
+            color: RGB fill color
+            outline: White outline width in pixels (0 for none)
+        """
+        gids = font.encode(text)
+        parts = []
+        for i, gid in enumerate(gids):
+            parts.append(f"<{gid:04X}>")
+            if i + 1 < len(gids):
+                natural = font.ttf.advance(gid) * size / 1000
+                shift = positions[i + 1] - positions[i] - natural
+                if abs(shift) > 1e-3:
+                    parts.append(_num(round(-shift * 1000 / size, 3)))
+        shown = f"[{''.join(parts)}] TJ"
+        setup = f"BT /{font.name} {_num(size)} Tf 1 0 0 -1 {_num(x)} {_num(baseline)} Tm"
+        if outline:
+            self.ops.append(f"q 1 1 1 RG {_num(2 * outline)} w 1 j {setup} 1 Tr {shown} ET Q")
+        self.ops.append(f"{_color(color)} rg {setup} {shown} ET")
+
+    def content(self) -> bytes:
+        return '\n'.join(self.ops).encode('latin-1')
+
+
+class PdfWriter:
+    """
+    Assembles a PDF from pages drawn with PdfCanvas.
+
+    Images and fonts are document-wide resources: an image registered
+    twice under the same key, or a font file used on many pages, is
+    stored once and referenced everywhere. All pages share one resource
+    dictionary.
+    """
+
+    def __init__(self):
+        self._objects: list[bytes | None] = []
+        self._pages_id = self.reserve()
+        self._resources_id = self.reserve()
+        self._page_ids: list[int] = []
+        self._images: dict = {}
+        self._xobjects: dict[str, int] = {}
+        self._fonts: dict[tuple, EmbeddedFont | None] = {}
+        self._states: dict[float, str] = {}
+
+    def reserve(self) -> int:
+        """Reserve an object number to fill in later."""
+        self._objects.append(None)
+        return len(self._objects)
+
+    def set_object(self, object_id: int, body: str | bytes):
+        self._objects[object_id - 1] = body.encode('latin-1') if isinstance(body, str) else body
+
+    def add_object(self, body: str | bytes) -> int:
+        object_id = self.reserve()
+        self.set_object(object_id, body)
+        return object_id
+
+    def add_stream(self, entries: str, data: bytes, compress: bool = True) -> int:
+        """
+        Add a stream object.
+
+        Args:
+            entries: Extra dictionary entries (e.g. '/Subtype /Image ...')
+            data: Stream data
+            compress: Flate-compress the data
+
+        Returns:
+            Object number
+        """
+        if compress:
+            data = zlib.compress(data, 6)
+            entries = f"{entries} /Filter /FlateDecode".strip()
+        head = f"<< {entries} /Length {len(data)} >>\nstream\n".encode('latin-1')
+        return self.add_object(head + data + b"\nendstream")
+
+    def _register_xobject(self, prefix: str, object_id: int) -> str:
+        name = f"{prefix}{len(self._xobjects) + 1}"
+        self._xobjects[name] = object_id
+        return name
+
+    def image(self, key, load: Callable[[], tuple | None]) -> str | None:
+        """
+        Get the resource name of a shared image, embedding it on first use.
+
+        Args:
+            key: Identity of the image (same key, same XObject)
+            load: Function returning ('jpeg', data, width, height, channels)
+                for a JPEG file to embed as is, ('pixels', BGRA/BGR array),
+                or None if the image cannot be loaded
+
+        Returns:
+            XObject name, or None if loading failed
+        """
+        if key in self._images:
+            return self._images[key]
+        source = load()
+        name = None
+        if source is not None:
+            object_id = (self._jpeg_object(*source[1:]) if source[0] == 'jpeg'
+                         else self._pixels_object(source[1]))
+            name = self._register_xobject('Im', object_id)
+        self._images[key] = name
+        return name
+
+    def _jpeg_object(self, data: bytes, width: int, height: int, channels: int) -> int:
+        space = '/DeviceGray' if channels == 1 else '/DeviceRGB'
+        return self.add_stream(
+            f"/Type /XObject /Subtype /Image /Width {width} /Height {height} "
+            f"/ColorSpace {space} /BitsPerComponent 8 /Interpolate true /Filter /DCTDecode",
+            data, compress=False
+        )
+
+    def _pixels_object(self, pixels: np.ndarray) -> int:
+        height, width = pixels.shape[:2]
+        mask = ''
+        if pixels.ndim == 3 and pixels.shape[2] == 4 and pixels[:, :, 3].min() < 255:
+            smask = self.add_stream(
+                f"/Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Interpolate true",
+                np.ascontiguousarray(pixels[:, :, 3]).tobytes()
+            )
+            mask = f" /SMask {smask} 0 R"
+        if pixels.ndim == 2:
+            data, space = np.ascontiguousarray(pixels).tobytes(), '/DeviceGray'
+        else:
+            data, space = np.ascontiguousarray(pixels[:, :, 2::-1]).tobytes(), '/DeviceRGB'
+        return self.add_stream(
+            f"/Type /XObject /Subtype /Image /Width {width} /Height {height} "
+            f"/ColorSpace {space} /BitsPerComponent 8 /Interpolate true{mask}", data
+        )
+
+    @property
+    def image_count(self) -> int:
+        """Number of distinct images embedded so far."""
+        return sum(1 for name in self._images.values() if name)
+
+    def font(self, path: str, index: int = 0) -> EmbeddedFont | None:
+        """
+        Get an embedded font for a font file.
+
+        Args:
+            path: TrueType/OpenType file
+            index: Face index in a collection
+
+        Returns:
+            Embedded font, or None if the file cannot or may not be embedded
+        """
+        key = (path, index)
+        if key not in self._fonts:
+            try:
+                ttf = TrueTypeFont(path, index)
+            except (OSError, ValueError, IndexError, KeyError):
+                ttf = None
+            if ttf is not None and ttf.embeddable:
+                self._fonts[key] = EmbeddedFont(self, ttf, f"F{len(self._fonts) + 1}")
+            else:
+                self._fonts[key] = None
+        return self._fonts[key]
+
+    def alpha_state(self, alpha: float) -> str:
+        """Name of an ExtGState setting fill and stroke opacity."""
+        if alpha not in self._states:
+            self._states[alpha] = f"GS{len(self._states) + 1}"
+        return self._states[alpha]
+
+    def form(self, canvas: PdfCanvas, bbox: tuple[float, float, float, float]) -> str:
+        """
+        Turn drawn content into a transparency group form XObject.
+
+        Args:
+            canvas: Content in page pixel coordinates
+            bbox: (x, y, width, height) the content covers
+
+        Returns:
+            XObject name
+        """
+        x, y, width, height = bbox
+        object_id = self.add_stream(
+            f"/Type /XObject /Subtype /Form /BBox [{_num(x)} {_num(y)} {_num(x + width)} "
+            f"{_num(y + height)}] /Group << /S /Transparency >> "
+            f"/Resources {self._resources_id} 0 R", canvas.content()
+        )
+        return self._register_xobject('Fm', object_id)
+
+    def add_page(self, canvas: PdfCanvas, width: int, height: int, dpi: float):
+        """
+        Add a page of width x height pixels printed at dpi.
+
+        Args:
+            canvas: Page content in pixel coordinates
+            width: Page width in pixels
+            height: Page height in pixels
+            dpi: Pixels per inch (sets the page size in points)
+        """
+        scale = 72 / dpi
+        content = (f"{_num(scale)} 0 0 {_num(-scale)} 0 {_num(height * scale)} cm\n".encode('latin-1')
+                   + canvas.content())
+        content_id = self.add_stream('', content)
+        self._page_ids.append(self.add_object(
+            f"<< /Type /Page /Parent {self._pages_id} 0 R "
+            f"/MediaBox [0 0 {_num(round(width * scale, 3))} {_num(round(height * scale, 3))}] "
+            f"/Resources {self._resources_id} 0 R /Contents {content_id} 0 R >>"
+        ))
+
+    def save(self, path: str) -> int:
+        """
+        Write the document.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            File size in bytes
+        """
+        for font in self._fonts.values():
+            if font is not None:
+                font.write(self)
+        fonts = ' '.join(f"/{f.name} {f.object_id} 0 R" for f in self._fonts.values() if f)
+        xobjects = ' '.join(f"/{name} {oid} 0 R" for name, oid in self._xobjects.items())
+        states = ' '.join(f"/{name} << /ca {_num(alpha)} /CA {_num(alpha)} >>"
+                          for alpha, name in self._states.items())
+        self.set_object(self._resources_id, (
+            f"<< /ProcSet [/PDF /Text /ImageB /ImageC] /Font << {fonts} >> "
+            f"/XObject << {xobjects} >> /ExtGState << {states} >> >>"
+        ))
+        kids = ' '.join(f"{page} 0 R" for page in self._page_ids)
+        self.set_object(self._pages_id,
+                        f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>")
+        catalog = self.add_object(f"<< /Type /Catalog /Pages {self._pages_id} 0 R >>")
+
+        out = bytearray(f"%PDF-{PDF_VERSION}\n%\xe2\xe3\xcf\xd3\n".encode('latin-1'))
+        offsets = []
+        for number, body in enumerate(self._objects, start=1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode('latin-1') + (body or b'null') + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(self._objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+        out += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+        out += (f"trailer\n<< /Size {len(self._objects) + 1} /Root {catalog} 0 R >>\n"
+                f"startxref\n{xref}\n%%EOF\n").encode('latin-1')
+        with open(path, 'wb') as f:
+            f.write(out)
+        return len(out)
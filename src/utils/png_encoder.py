@@ -0,0 +1,175 @@
+"""Named PNG encoder profiles: fast drafts, archival finals and palette PNGs for the web."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from src.utils.lazy_import import lazy_import
+from src.utils.raster_backend import get_raster_backend
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+
+# zlib strategies (OpenCV's IMWRITE_PNG_STRATEGY_* use the same values)
+PNG_STRATEGIES = {
+    'default': 0,
+    'filtered': 1,
+    'huffman': 2,
+    'rle': 3,
+    'fixed': 4,
+}
+
+# Row filters, as names of OpenCV IMWRITE_PNG_* constants (OpenCV >= 4.11)
+PNG_FILTERS = {
+    'none': 'IMWRITE_PNG_FILTER_NONE',
+    'sub': 'IMWRITE_PNG_FILTER_SUB',
+    'up': 'IMWRITE_PNG_FILTER_UP',
+    'avg': 'IMWRITE_PNG_FILTER_AVG',
+    'paeth': 'IMWRITE_PNG_FILTER_PAETH',
+    'fast': 'IMWRITE_PNG_FAST_FILTERS',
+    'all': 'IMWRITE_PNG_ALL_FILTERS',
+}
+
+# compression: zlib level 0-9; strategy/filter: keys of the tables above;
+# colors: palette size for quantized output (None keeps full color)
+ENCODER_PROFILES = {
+    # OpenCV's own defaults: quickest to write, largest files
+    'draft': {'compression': 1, 'strategy': 'rle', 'filter': 'sub', 'colors': None},
+    # Lossless and smallest; several seconds per photo-heavy page
+    'final': {'compression': 9, 'strategy': 'filtered', 'filter': 'fast', 'colors': None},
+    # 8-bit palette PNG, lossy when a page has more than 256 colors
+    'web': {'compression': 9, 'strategy': 'default', 'filter': 'none', 'colors': 256},
+}
+
+DEFAULT_PROFILE = 'draft'
+
+
+def get_encoder_profile(profile: str | dict | None) -> dict:
+    """
+    Resolve a profile name to its settings.
+
+    Args:
+        profile: Profile name, a settings dict, or None for DEFAULT_PROFILE
+
+    Returns:
+        Settings dict with 'compression', 'strategy', 'filter' and 'colors'
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if isinstance(profile, dict):
+        return {**ENCODER_PROFILES[DEFAULT_PROFILE], **profile}
+    name = profile or DEFAULT_PROFILE
+    if name not in ENCODER_PROFILES:
+        raise ValueError(f"Unknown encoder profile '{name}' "
+                         f"(choose from {', '.join(ENCODER_PROFILES)})")
+    return ENCODER_PROFILES[name]
+
+
+def imwrite_params(settings: dict) -> list[int]:
+    """
+    Build cv2.imwrite parameters for a full-color profile.
+
+    The row filter is skipped on OpenCV builds that cannot set it.
+
+    Args:
+        settings: get_encoder_profile result
+
+    Returns:
+        Flat list of (flag, value) pairs
+    """
+    params = [cv2.IMWRITE_PNG_COMPRESSION, settings['compression'],
+              cv2.IMWRITE_PNG_STRATEGY, PNG_STRATEGIES[settings['strategy']]]
+    row_filter = getattr(cv2, PNG_FILTERS[settings['filter']], None)
+    if row_filter is not None and hasattr(cv2, 'IMWRITE_PNG_FILTER'):
+        params += [cv2.IMWRITE_PNG_FILTER, row_filter]
+    return params
+
+
+def quantize_palette(image: np.ndarray, colors: int = 256) -> Image.Image:
+    """
+    Convert a BGRA/BGR page to a palette image.
+
+    Pages with at most `colors` distinct colors (flat designs) are mapped
+    exactly: pixels are packed into 32-bit keys and looked up in the sorted
+    palette with one vectorized searchsorted. Other pages are reduced
+    without dithering, by median cut when opaque and fast octree when they
+    have transparency.
+
+    Args:
+        image: BGRA or BGR image
+        colors: Palette size (2-256)
+
+    Returns:
+        PIL image in mode 'P' (palette with alpha when the page has any)
+    """
+    if image.ndim == 3 and image.shape[2] == 4:
+        rgba = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
+    else:
+        rgba = cv2.cvtColor(image, cv2.COLOR_BGR2RGBA)
+    opaque = bool(rgba[:, :, 3].min() == 255)
+    pil_image = Image.fromarray(rgba, 'RGBA')
+
+    counts = pil_image.getcolors(colors)
+    if counts is not None:
+        keys = np.ascontiguousarray(rgba).view(np.uint32).reshape(rgba.shape[:2])
+        palette = np.array([color for _, color in counts], dtype=np.uint8)
+        palette_keys = palette.view(np.uint32).ravel()
+        order = np.argsort(palette_keys)
+        indices = np.searchsorted(palette_keys[order], keys).astype(np.uint8)
+        result = Image.fromarray(indices, 'P')
+        if opaque:
+            result.putpalette(palette[order][:, :3].tobytes(), rawmode='RGB')
+        else:
+            result.putpalette(palette[order].tobytes(), rawmode='RGBA')
+        return result
+
+    if opaque:
+        return pil_image.convert('RGB').quantize(colors, method=Image.Quantize.MEDIANCUT,
+                                                 dither=Image.Dither.NONE)
+    return pil_image.quantize(colors, method=Image.Quantize.FASTOCTREE,
+                              dither=Image.Dither.NONE)
+
+
+def encode_png(image: np.ndarray, profile: str | dict | None = None) -> bytes:
+    """
+    Encode an image as PNG with an encoder profile.
+
+    Args:
+        image: BGRA or BGR image
+        profile: Profile name or settings (see ENCODER_PROFILES)
+
+    Returns:
+        PNG file contents
+    """
+    settings = get_encoder_profile(profile)
+    if settings['colors']:
+        buffer = io.BytesIO()
+        quantize_palette(image, settings['colors']).save(
+            buffer, 'PNG', compress_level=settings['compression'],
+            compress_type=PNG_STRATEGIES[settings['strategy']]
+        )
+        return buffer.getvalue()
+    return get_raster_backend().encode(image, settings)
+
+
+def write_png(path: str, image: np.ndarray, profile: str | dict | None = None):
+    """
+    Write an image as PNG with an encoder profile.
+
+    Full-color profiles go straight through cv2.imwrite when the raster
+    backend encodes with cv2; palette profiles are quantized and written
+    by Pillow.
+
+    Args:
+        path: Output file path
+        image: BGRA or BGR image
+        profile: Profile name or settings (see ENCODER_PROFILES)
+    """
+    settings = get_encoder_profile(profile)
+    if settings['colors'] or get_raster_backend().selection['encode'] != 'cv2':
+        Path(path).write_bytes(encode_png(image, settings))
+    elif not cv2.imwrite(path, image, imwrite_params(settings)):
+        raise OSError(f"Could not write {path}")
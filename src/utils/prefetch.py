@@ -0,0 +1,169 @@
+"""Decode the backgrounds a render needs on a thread pool, ahead of the renderer."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from src.utils.lazy_import import lazy_import
+from src.utils.trace import Trace, trace_span
+
+np = lazy_import('numpy')
+
+# Decoded images held ahead of the renderer (not yet taken), in megabytes
+DEFAULT_PREFETCH_MB = 256
+
+# Decode threads; OpenCV releases the GIL while reading and resizing
+DEFAULT_PREFETCH_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def prefetch_budget() -> int:
+    """
+    Bytes of decoded images a prefetcher may hold ahead of the renderer.
+
+    Set in megabytes with $CALENDAR_MAKER_PREFETCH_MB (default 256);
+    0 disables prefetching.
+    """
+    value = os.environ.get('CALENDAR_MAKER_PREFETCH_MB')
+    return int(float(value) * 1024 * 1024) if value else DEFAULT_PREFETCH_MB * 1024 * 1024
+
+
+class AssetPrefetcher:
+    """
+    Loads a list of resized backgrounds concurrently, in the order a render uses them.
+
+    While attached (inside a with block), ImageUtils.load_background takes
+    its images from here: finished ones immediately, ones still being
+    decoded after waiting for them. Decoding runs at most max_bytes ahead
+    of what the renderer has taken. Images the renderer passes by without
+    asking for them (e.g. found in a cache) are dropped.
+    """
+
+    def __init__(self, assets: list[tuple[str, int, int]],
+                 loader: Callable[[str, int, int], tuple],
+                 max_bytes: int | None = None, max_workers: int = DEFAULT_PREFETCH_WORKERS,
+                 trace: Trace | None = None):
+        """
+        Initialize prefetcher.
+
+        Args:
+            assets: (path, width, height) in first-use order (duplicates ignored)
+            loader: Thread-safe function (path, width, height) -> (BGRA image
+                or None, seconds taken)
+            max_bytes: Decoded bytes held ahead of the renderer (prefetch_budget() if None)
+            max_workers: Decode threads
+            trace: Trace to record decodes and waits in (optional)
+        """
+        self.assets = list(dict.fromkeys(assets))
+        self.loader = loader
+        self.max_bytes = prefetch_budget() if max_bytes is None else max_bytes
+        self.max_workers = max_workers
+        self.trace = trace
+        self._index = {asset: i for i, asset in enumerate(self.assets)}
+        self._futures: dict[int, Future] = {}
+        self._next = 0
+        self._held = 0
+        self._pool: ThreadPoolExecutor | None = None
+        self.stats = {'taken': 0, 'waited': 0, 'missed': 0, 'dropped': 0}
+
+    @staticmethod
+    def _nbytes(asset: tuple[str, int, int]) -> int:
+        return asset[1] * asset[2] * 4
+
+    def _load(self, asset: tuple[str, int, int]) -> tuple:
+        path, width, height = asset
+        with trace_span(self.trace, f"{Path(path).name} {width}x{height}", 'io'):
+            return self.loader(path, width, height)
+
+    def _fill(self):
+        """Submit decodes until the byte budget is used (always at least one)."""
+        while self._next < len(self.assets) and (self._held < self.max_bytes or not self._futures):
+            asset = self.assets[self._next]
+            self._futures[self._next] = self._pool.submit(self._load, asset)
+            self._held += self._nbytes(asset)
+            self._next += 1
+
+    def _release(self, index: int):
+        future = self._futures.pop(index)
+        future.cancel()
+        self._held -= self._nbytes(self.assets[index])
+        self.stats['dropped'] += 1
+
+    def take(self, path: str, width: int, height: int) -> tuple | None:
+        """
+        Get a prefetched image, waiting if it is still being decoded.
+
+        Args:
+            path: Image path
+            width: Target width
+            height: Target height
+
+        Returns:
+            (BGRA image or None, seconds the decode took), or None if this
+            image is not prefetched (the caller loads it itself)
+        """
+        index = self._index.get((path, width, height))
+        if index is None or self._pool is None:
+            return None
+        # The renderer has moved past anything earlier it did not ask for
+        for earlier in [i for i in self._futures if i < index]:
+            self._release(earlier)
+
+        future = self._futures.pop(index, None)
+        if future is None:
+            # Not submitted yet (renderer ahead of the budget) or already taken
+            self._next = max(self._next, index + 1)
+            self.stats['missed'] += 1
+            self._fill()
+            return None
+        self._held -= self._nbytes(self.assets[index])
+        self._fill()
+
+        if not future.done():
+            self.stats['waited'] += 1
+            with trace_span(self.trace, f"wait {Path(path).name}", 'wait'):
+                result = future.exception() or future.result()
+        else:
+            result = future.exception() or future.result()
+        if isinstance(result, BaseException):
+            self.stats['missed'] += 1
+            return None
+        self.stats['taken'] += 1
+        return result
+
+    def start(self) -> AssetPrefetcher:
+        """Start decoding and attach this prefetcher to the process."""
+        global _attached_prefetcher
+        if self.max_bytes > 0 and self.assets:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='prefetch')
+            self._fill()
+        _attached_prefetcher = self
+        return self
+
+    def close(self):
+        """Detach, cancel decodes not started yet and wait for the running ones."""
+        global _attached_prefetcher
+        if _attached_prefetcher is self:
+            _attached_prefetcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._futures.clear()
+        self._held = 0
+
+    def __enter__(self) -> AssetPrefetcher:
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_attached_prefetcher: AssetPrefetcher | None = None
+
+
+def get_attached_prefetcher() -> AssetPrefetcher | None:
+    """Get the prefetcher attached to this process, if any."""
+    return _attached_prefetcher
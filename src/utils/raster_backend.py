@@ -0,0 +1,454 @@
+"""Raster backends: one interface for decode, resize, composite, text and encode."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+
+from src.utils.lazy_import import lazy_import
+from src.utils.cache_dir import get_cache_dir
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+
+# Operations a backend implements; a selection picks a backend for each
+RASTER_OPERATIONS = ('decode', 'resize', 'composite', 'draw_text', 'encode')
+
+# What the renderer has always used: OpenCV/numpy for pixels, Pillow for glyphs
+DEFAULT_SELECTION = {
+    'decode': 'cv2',
+    'resize': 'cv2',
+    'composite': 'cv2',
+    'draw_text': 'pil',
+    'encode': 'cv2',
+}
+
+SELECTION_ENV = 'CALENDAR_MAKER_RASTER_BACKEND'
+SELECTION_FILE = 'raster_backend.json'
+
+# Interpolation names shared by both backends
+INTERPOLATIONS = ('nearest', 'linear', 'cubic', 'area', 'lanczos')
+
+
+class RasterBackend(ABC):
+    """
+    Pixel operations on BGRA uint8 arrays.
+
+    Every backend takes and returns numpy arrays in the renderer's BGRA
+    layout, so operations from different backends can be mixed freely.
+    Colors are given in the image's channel order. Results of different
+    backends agree on opaque images up to resampling and rounding details.
+    Subclasses implement every operation; an incomplete one cannot be
+    instantiated.
+    """
+
+    name = ''
+
+    @abstractmethod
+    def decode(self, path: str, factor: int = 1) -> np.ndarray | None:
+        """
+        Decode an image file without applying EXIF orientation.
+
+        Args:
+            path: Image file path
+            factor: JPEG DCT scale (1, 2, 4 or 8); only used for opaque JPEGs
+
+        Returns:
+            BGRA image or None if the file cannot be decoded
+        """
+
+    @abstractmethod
+    def resize(self, image: np.ndarray, width: int, height: int,
+               interpolation: str = 'lanczos') -> np.ndarray:
+        """
+        Resize an image.
+
+        Args:
+            image: BGRA image
+            width: Target width
+            height: Target height
+            interpolation: One of INTERPOLATIONS
+
+        Returns:
+            Resized BGRA image
+        """
+
+    @abstractmethod
+    def composite(self, background: np.ndarray, placements: list[tuple]) -> np.ndarray:
+        """
+        Alpha-composite tiles onto a background, in order.
+
+        Tiles are clipped to the background; the background is not modified.
+
+        Args:
+            background: BGRA image
+            placements: List of (tile, x, y) with BGRA tiles
+
+        Returns:
+            New BGRA image
+        """
+
+    @abstractmethod
+    def draw_text(self, image: np.ndarray, runs: list[tuple]) -> np.ndarray:
+        """
+        Draw text runs, in order, on a copy of the image.
+
+        Args:
+            image: BGRA image
+            runs: List of (text, (x, y) PIL draw origin, PIL font, fill) where
+                fill is a color in the image's channel order (alpha optional)
+
+        Returns:
+            BGRA image with the text
+        """
+
+    @abstractmethod
+    def encode(self, image: np.ndarray, settings: dict) -> bytes:
+        """
+        Encode a full-color PNG.
+
+        Args:
+            image: BGRA or BGR image
+            settings: png_encoder profile settings ('compression', 'strategy',
+                'filter'; backends that cannot pick a row filter ignore it)
+
+        Returns:
+            PNG file contents
+        """
+
+
+class Cv2Backend(RasterBackend):
+    """OpenCV and numpy implementations (text glyphs still come from PIL fonts)."""
+
+    name = 'cv2'
+
+    INTERPOLATION_FLAGS = {
+        'nearest': 'INTER_NEAREST',
+        'linear': 'INTER_LINEAR',
+        'cubic': 'INTER_CUBIC',
+        'area': 'INTER_AREA',
+        'lanczos': 'INTER_LANCZOS4',
+    }
+
+    def decode(self, path: str, factor: int = 1) -> np.ndarray | None:
+        from src.utils.image_utils import REDUCED_DECODE_FLAGS, ImageUtils
+        flag = dict(REDUCED_DECODE_FLAGS).get(factor)
+        if flag:
+            # Like IMREAD_UNCHANGED, keep the stored orientation (EXIF is not applied)
+            image = cv2.imread(path, getattr(cv2, flag) | cv2.IMREAD_IGNORE_ORIENTATION)
+        else:
+            image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            return None
+        return ImageUtils.ensure_bgra(image)
+
+    @staticmethod
+    def interpolation_name(flag: int) -> str:
+        """Name in INTERPOLATIONS for a cv2 interpolation flag."""
+        for name, constant in Cv2Backend.INTERPOLATION_FLAGS.items():
+            if getattr(cv2, constant) == flag:
+                return name
+        raise ValueError(f"Unsupported interpolation flag {flag}")
+
+    def resize(self, image: np.ndarray, width: int, height: int,
+               interpolation: str = 'lanczos') -> np.ndarray:
+        flag = getattr(cv2, self.INTERPOLATION_FLAGS[interpolation])
+        return cv2.resize(image, (width, height), interpolation=flag)
+
+    def composite(self, background: np.ndarray, placements: list[tuple]) -> np.ndarray:
+        from src.utils.image_utils import ImageUtils
+        if len(placements) == 1:
+            tile, x, y = placements[0]
+            return ImageUtils._overlay_image(background, tile, x, y)
+        return ImageUtils._composite_batch(background, placements)
+
+    def draw_text(self, image: np.ndarray, runs: list[tuple]) -> np.ndarray:
+        image = image.copy()
+        height, width = image.shape[:2]
+        masks = {}
+        for text, (x, y), font, fill in runs:
+            # Outline passes repeat one text at several offsets: rasterize it once
+            key = (text, id(font))
+            if key not in masks:
+                masks[key] = _coverage(text, font)
+            mask, left, top = masks[key]
+            if mask is None:
+                continue
+            x0, y0 = x + left, y + top
+            x1, y1 = min(width, x0 + mask.shape[1]), min(height, y0 + mask.shape[0])
+            cx, cy = max(0, x0), max(0, y0)
+            if x1 <= cx or y1 <= cy:
+                continue
+            _fill_mask(image[cy:y1, cx:x1], mask[cy - y0:y1 - y0, cx - x0:x1 - x0], fill)
+        return image
+
+    def encode(self, image: np.ndarray, settings: dict) -> bytes:
+        from src.utils.png_encoder import imwrite_params
+        ok, data = cv2.imencode('.png', image, imwrite_params(settings))
+        if not ok:
+            raise ValueError("PNG encoding failed")
+        return data.tobytes()
+
+
+class PilBackend(RasterBackend):
+    """Pillow implementations; arrays are converted at the operation boundary."""
+
+    name = 'pil'
+
+    INTERPOLATION_FILTERS = {
+        'nearest': 'NEAREST',
+        'linear': 'BILINEAR',
+        'cubic': 'BICUBIC',
+        'area': 'BOX',
+        'lanczos': 'LANCZOS',
+    }
+
+    @staticmethod
+    def _to_pil(image: np.ndarray) -> Image.Image:
+        """BGRA array -> RGBA image (one swizzling copy)."""
+        height, width = image.shape[:2]
+        return Image.frombuffer('RGBA', (width, height), np.ascontiguousarray(image),
+                                'raw', 'BGRA', 0, 1)
+
+    @staticmethod
+    def _to_array(image: Image.Image) -> np.ndarray:
+        """RGBA image -> BGRA array."""
+        data = image.tobytes('raw', 'BGRA')
+        return np.frombuffer(data, np.uint8).reshape(image.height, image.width, 4).copy()
+
+    def decode(self, path: str, factor: int = 1) -> np.ndarray | None:
+        try:
+            with Image.open(path) as img:
+                if factor > 1 and img.format == 'JPEG':
+                    # draft() picks the DCT scale that still covers the requested size
+                    img.draft('RGB', (-(-img.width // factor), -(-img.height // factor)))
+                return self._to_array(img.convert('RGBA'))
+        except Exception:
+            return None
+
+    def resize(self, image: np.ndarray, width: int, height: int,
+               interpolation: str = 'lanczos') -> np.ndarray:
+        resample = getattr(Image.Resampling, self.INTERPOLATION_FILTERS[interpolation])
+        return self._to_array(self._to_pil(image).resize((width, height), resample))
+
+    def composite(self, background: np.ndarray, placements: list[tuple]) -> np.ndarray:
+        result = self._to_pil(background)
+        for tile, x, y in placements:
+            # alpha_composite needs the tile inside the destination
+            tile_h = min(tile.shape[0], result.height - y)
+            tile_w = min(tile.shape[1], result.width - x)
+            if tile_h > 0 and tile_w > 0:
+                result.alpha_composite(self._to_pil(tile[:tile_h, :tile_w]), (x, y))
+        return self._to_array(result)
+
+    def draw_text(self, image: np.ndarray, runs: list[tuple]) -> np.ndarray:
+        # Drawn on the array's bytes as RGBA: fills are in the array's channel order
+        pil_image = Image.fromarray(image)
+        draw = ImageDraw.Draw(pil_image)
+        for text, origin, font, fill in runs:
+            draw.text(origin, text, fill=tuple(fill), font=font)
+        return np.array(pil_image)
+
+    def encode(self, image: np.ndarray, settings: dict) -> bytes:
+        from src.utils.png_encoder import PNG_STRATEGIES
+        if image.ndim == 3 and image.shape[2] == 4:
+            pil_image = self._to_pil(image)
+        else:
+            height, width = image.shape[:2]
+            pil_image = Image.frombuffer('RGB', (width, height), np.ascontiguousarray(image),
+                                         'raw', 'BGR', 0, 1)
+        buffer = io.BytesIO()
+        pil_image.save(buffer, 'PNG', compress_level=settings['compression'],
+                       compress_type=PNG_STRATEGIES[settings['strategy']])
+        return buffer.getvalue()
+
+
+def _coverage(text: str, font) -> tuple:
+    """Glyph coverage of text as an 'L' array and its offset from the draw origin."""
+    canvas = Image.new('L', (1, 1), 0)
+    # textbbox (unlike font.getbbox) also lays out multiline text like draw.text
+    left, top, right, bottom = ImageDraw.Draw(canvas).textbbox((0, 0), text, font=font)
+    if right <= left or bottom <= top:
+        return None, 0, 0
+    canvas = Image.new('L', (right - left, bottom - top), 0)
+    ImageDraw.Draw(canvas).text((-left, -top), text, fill=255, font=font)
+    return np.asarray(canvas), left, top
+
+
+def _fill_mask(roi: np.ndarray, mask: np.ndarray, fill: tuple):
+    """
+    Fill a color through a coverage mask in place, exactly as PIL does on RGBA.
+
+    Every channel is blended by coverage with PIL's rounding; pixels that
+    were fully transparent take the fill color outright.
+    """
+    ink = np.array((*fill, 255)[:4], dtype=np.uint32)
+    coverage = mask.astype(np.uint32)[..., None]
+    value = roi * (255 - coverage) + ink * coverage + 128
+    blended = ((value + (value >> 8)) >> 8).astype(np.uint8)
+    clear = (roi[..., 3] == 0) & (mask > 0)
+    blended[clear, :3] = ink[:3]
+    covered = mask > 0
+    roi[covered] = blended[covered]
+
+
+BACKENDS = {backend.name: backend for backend in (Cv2Backend(), PilBackend())}
+
+
+def parse_selection(spec: str | dict | None) -> dict:
+    """
+    Turn a backend choice into a full per-operation selection.
+
+    Args:
+        spec: Backend name for every operation ('cv2', 'pil'), a string like
+            'decode=pil,resize=cv2', a dict, or None; operations not named
+            keep DEFAULT_SELECTION
+
+    Returns:
+        Dict of operation -> backend name
+
+    Raises:
+        ValueError: On unknown operations or backends
+    """
+    selection = dict(DEFAULT_SELECTION)
+    if not spec:
+        return selection
+    if isinstance(spec, str):
+        if spec in BACKENDS:
+            return {op: spec for op in RASTER_OPERATIONS}
+        spec = dict(part.split('=', 1) for part in spec.replace(' ', '').split(',') if part)
+    for op, name in spec.items():
+        if op not in RASTER_OPERATIONS:
+            raise ValueError(f"Unknown raster operation '{op}' "
+                             f"(choose from {', '.join(RASTER_OPERATIONS)})")
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown raster backend '{name}' "
+                             f"(choose from {', '.join(BACKENDS)})")
+        selection[op] = name
+    return selection
+
+
+def format_selection(selection: dict) -> str:
+    """Selection as 'op=backend,...' (the CALENDAR_MAKER_RASTER_BACKEND format)."""
+    return ','.join(f"{op}={selection[op]}" for op in RASTER_OPERATIONS)
+
+
+class MixedBackend(RasterBackend):
+    """Dispatches each operation to the backend selected for it."""
+
+    def __init__(self, selection: dict):
+        """
+        Initialize mixed backend.
+
+        Args:
+            selection: parse_selection result
+        """
+        self.selection = dict(selection)
+        self.name = format_selection(self.selection)
+        self._backends = {op: BACKENDS[name] for op, name in self.selection.items()}
+
+    def decode(self, path: str, factor: int = 1) -> np.ndarray | None:
+        return self._backends['decode'].decode(path, factor)
+
+    def resize(self, image: np.ndarray, width: int, height: int,
+               interpolation: str = 'lanczos') -> np.ndarray:
+        return self._backends['resize'].resize(image, width, height, interpolation)
+
+    def composite(self, background: np.ndarray, placements: list[tuple]) -> np.ndarray:
+        return self._backends['composite'].composite(background, placements)
+
+    def draw_text(self, image: np.ndarray, runs: list[tuple]) -> np.ndarray:
+        return self._backends['draw_text'].draw_text(image, runs)
+
+    def encode(self, image: np.ndarray, settings: dict) -> bytes:
+        return self._backends['encode'].encode(image, settings)
+
+    def cache_tag(self, *operations: str) -> str:
+        """
+        Tag for cache keys of results produced by these operations.
+
+        Empty while they use DEFAULT_SELECTION, so existing cache entries
+        stay valid. Safe to use in file names.
+
+        Args:
+            operations: Operation names
+
+        Returns:
+            '' or e.g. 'decode-pil_resize-cv2'
+        """
+        if all(self.selection[op] == DEFAULT_SELECTION[op] for op in operations):
+            return ''
+        return '_'.join(f"{op}-{self.selection[op]}" for op in operations)
+
+
+def saved_selection_path():
+    """File holding the selection written by benchmarks/raster_backend.py --save."""
+    return get_cache_dir() / SELECTION_FILE
+
+
+def load_saved_selection() -> dict | None:
+    """Selection saved by the backend benchmark, or None."""
+    try:
+        with open(saved_selection_path(), 'r', encoding='utf-8') as f:
+            return json.load(f).get('selection')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def save_selection(selection: dict, timings: dict | None = None):
+    """
+    Store a selection for get_raster_backend to use by default.
+
+    Args:
+        selection: Operation -> backend name
+        timings: Optional benchmark results stored alongside
+    """
+    payload = {'selection': selection, 'timings': timings or {}}
+    saved_selection_path().write_text(json.dumps(payload, indent=2), encoding='utf-8')
+
+
+_backend: MixedBackend | None = None
+
+
+def get_raster_backend() -> MixedBackend:
+    """
+    Get the process-wide raster backend.
+
+    The selection comes from $CALENDAR_MAKER_RASTER_BACKEND ('cv2', 'pil'
+    or 'op=backend,...'), else from the benchmark's saved choice, else
+    DEFAULT_SELECTION.
+    """
+    global _backend
+    if _backend is None:
+        spec = os.environ.get(SELECTION_ENV) or load_saved_selection()
+        try:
+            selection = parse_selection(spec)
+        except ValueError as e:
+            print(f"Raster backend: {e}; using defaults")
+            selection = dict(DEFAULT_SELECTION)
+        _backend = MixedBackend(selection)
+    return _backend
+
+
+def set_raster_backend(spec: str | dict | None) -> MixedBackend:
+    """
+    Replace the process-wide raster backend.
+
+    In-memory caches are cleared, since their layers and backgrounds were
+    produced by the previous backend.
+
+    Args:
+        spec: Anything parse_selection accepts (None restores the defaults)
+
+    Returns:
+        The new backend
+    """
+    from src.utils.cache_registry import get_cache_registry
+    global _backend
+    _backend = MixedBackend(parse_selection(spec))
+    get_cache_registry().clear()
+    return _backend
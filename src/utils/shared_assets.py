@@ -0,0 +1,193 @@
+"""Decoded assets shared zero-copy between worker processes via memory-mapped files."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Callable
+
+from src.utils.cache_dir import get_cache_dir
+from src.utils.lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+
+def _default_store_root() -> Path:
+    """RAM-backed /dev/shm where available, otherwise the user cache dir."""
+    shm = Path('/dev/shm')
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return get_cache_dir('shared')
+
+
+def _entry_key(path: str, width: int, height: int) -> str:
+    return f"{os.path.abspath(path)}|{width}x{height}"
+
+
+class SharedAssetStore:
+    """
+    Read-only store of decoded, resized BGRA assets backed by .npy files.
+
+    The parent process decodes each asset once into the store; workers
+    attach with the picklable handle() and get np.memmap views opened
+    read-only, so every process maps the same physical pages instead of
+    holding its own copy. The owning store deletes its directory on close()
+    or when garbage collected; attached stores only drop their maps.
+    """
+
+    def __init__(self, directory: str | Path | None = None,
+                 entries: dict[str, str] | None = None, owner: bool = True):
+        """
+        Initialize shared asset store.
+
+        Args:
+            directory: Store directory (a new temporary one if None)
+            entries: Existing key -> file name mapping (for attached stores)
+            owner: Whether this instance deletes the directory on close
+        """
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='calendar_assets_', dir=_default_store_root())
+        self.directory = Path(directory)
+        self.entries: dict[str, str] = dict(entries or {})
+        self.owner = owner
+        self._views: dict[str, np.ndarray] = {}
+        self._finalizer = (
+            weakref.finalize(self, shutil.rmtree, str(self.directory), True)
+            if owner else None
+        )
+
+    @classmethod
+    def attach(cls, handle: dict) -> SharedAssetStore:
+        """
+        Attach to a store created in another process.
+
+        Args:
+            handle: Value returned by handle() in the owning process
+
+        Returns:
+            Non-owning store with read-only views
+        """
+        return cls(handle['directory'], handle['entries'], owner=False)
+
+    def handle(self) -> dict:
+        """Get a picklable description of the store for worker processes."""
+        return {'directory': str(self.directory), 'entries': dict(self.entries)}
+
+    def add(self, path: str, width: int, height: int, image: np.ndarray):
+        """
+        Write a decoded asset into the store.
+
+        Args:
+            path: Source image path
+            width: Target width
+            height: Target height
+            image: Decoded BGRA image of that size
+        """
+        key = _entry_key(path, width, height)
+        if key in self.entries:
+            return
+        file_name = f"{len(self.entries):04d}.npy"
+        mapped = np.lib.format.open_memmap(
+            self.directory / file_name, mode='w+', dtype=image.dtype, shape=image.shape
+        )
+        mapped[...] = image
+        mapped.flush()
+        del mapped
+        self.entries[key] = file_name
+
+    def populate(self, refs: list[dict],
+                 loader: Callable[[str, int, int], np.ndarray | None]) -> int:
+        """
+        Decode every image reference once into the store.
+
+        Args:
+            refs: Asset references with 'kind', 'path' and 'size' keys
+                  (as returned by src.preflight.collect_assets)
+            loader: Function (path, width, height) -> BGRA image or None
+
+        Returns:
+            Number of assets stored
+        """
+        for ref in refs:
+            if ref['kind'] != 'image':
+                continue
+            width, height = ref['size']
+            if width <= 0 or height <= 0:
+                continue
+            if _entry_key(ref['path'], width, height) in self.entries:
+                continue
+            image = loader(ref['path'], width, height)
+            if image is not None:
+                self.add(ref['path'], width, height, image)
+        return len(self.entries)
+
+    def get(self, path: str, width: int, height: int) -> np.ndarray | None:
+        """
+        Get a read-only view of a stored asset.
+
+        Args:
+            path: Source image path
+            width: Target width
+            height: Target height
+
+        Returns:
+            Read-only BGRA memmap, or None if not stored
+        """
+        key = _entry_key(path, width, height)
+        view = self._views.get(key)
+        if view is None:
+            file_name = self.entries.get(key)
+            if file_name is None:
+                return None
+            try:
+                view = np.load(self.directory / file_name, mmap_mode='r')
+            except (OSError, ValueError):
+                return None
+            self._views[key] = view
+        return view
+
+    def nbytes(self) -> int:
+        """Total size of stored assets in bytes."""
+        total = 0
+        for file_name in self.entries.values():
+            try:
+                total += (self.directory / file_name).stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def close(self):
+        """Drop mapped views; the owner also deletes the store directory."""
+        self._views.clear()
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_attached_store: SharedAssetStore | None = None
+
+
+def attach_shared_store(handle: dict | None):
+    """
+    Make a shared store the asset source for this process.
+
+    Args:
+        handle: Store handle from the owning process, or None to detach
+    """
+    global _attached_store
+    if _attached_store is not None:
+        _attached_store.close()
+    _attached_store = SharedAssetStore.attach(handle) if handle else None
+
+
+def get_attached_store() -> SharedAssetStore | None:
+    """Get the shared store attached to this process, if any."""
+    return _attached_store
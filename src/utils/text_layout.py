@@ -0,0 +1,304 @@
+"""Shared text measurement and alignment with a metrics cache."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from src.utils.lazy_import import lazy_import
+from src.utils.cache_registry import get_cache_registry
+
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+
+DEFAULT_MIN_FONT_SIZE = 8
+
+ELLIPSIS = '\u2026'
+
+
+def font_key(font) -> tuple:
+    """
+    Stable identity of a PIL font for cache keys.
+
+    FreeType fonts loaded from a file are identified by path, size and face
+    index, so separately loaded copies of the same font share entries.
+    """
+    path = getattr(font, 'path', None)
+    if isinstance(path, (str, bytes)):
+        return (path, getattr(font, 'size', 0), getattr(font, 'index', 0))
+    return ('id', id(font))
+
+
+class TextLayout:
+    """
+    Cached text metrics: bounding box, baseline and per-line boxes.
+
+    Month names, weekday names and day numbers repeat across every render,
+    so each (font, text, stroke) is measured once; wrapped line breaks and
+    auto-fit font sizes are cached the same way. The three caches live in
+    the cache registry ('text_metrics', 'text_wrap', 'text_fit').
+    """
+
+    def __init__(self):
+        """Initialize text layout cache."""
+        registry = get_cache_registry()
+        self._cache = registry.cache('text_metrics')
+        self._wrap_cache = registry.cache('text_wrap')
+        self._fit_cache = registry.cache('text_fit')
+        # Keeps fonts keyed by id() alive so ids are never reused
+        self._pinned: dict[int, object] = {}
+        self._draw = None
+
+    def measure(self, font, text: str, stroke: int = 0) -> dict:
+        """
+        Measure text as PIL would draw it at origin (0, 0).
+
+        Args:
+            font: PIL font object
+            text: Text, may contain newlines
+            stroke: Stroke width
+
+        Returns:
+            Dict with 'bbox' (x0, y0, x1, y1), 'width', 'height', 'ascent',
+            'descent' and 'lines' (list of per-line bboxes)
+        """
+        fkey = font_key(font)
+        key = (fkey, text, stroke)
+        metrics = self._cache.get(key)
+        if metrics is not None:
+            return metrics
+
+        start = time.perf_counter()
+        if self._draw is None:
+            self._draw = ImageDraw.Draw(Image.new('L', (1, 1)))
+        if fkey[0] == 'id':
+            self._pinned[id(font)] = font
+
+        # textbbox handles multiline text exactly like draw.text does
+        bbox = self._draw.textbbox((0, 0), text, font=font, stroke_width=stroke)
+        lines = [font.getbbox(line, stroke_width=stroke) if line else (0, 0, 0, 0)
+                 for line in text.split('\n')]
+        try:
+            ascent, descent = font.getmetrics()
+        except AttributeError:
+            ascent, descent = bbox[3], 0
+
+        metrics = {
+            'bbox': bbox,
+            'width': bbox[2] - bbox[0],
+            'height': bbox[3] - bbox[1],
+            'ascent': ascent,
+            'descent': descent,
+            'lines': lines,
+        }
+        self._cache.put(key, metrics, cost=time.perf_counter() - start)
+        return metrics
+
+    def wrap(self, font, text: str, max_width: int, max_lines: int | None = None,
+             ellipsis: str = ELLIPSIS) -> list[str]:
+        """
+        Break text into lines no wider than max_width.
+
+        Words wrap greedily; explicit newlines start a new paragraph and
+        words wider than the box are split between characters. Text that
+        needs more than max_lines is cut and the last line ends in ellipsis.
+        Results are cached per (font, size, width, text, max_lines).
+
+        Args:
+            font: PIL font object
+            text: Text, may contain newlines
+            max_width: Line width limit in pixels
+            max_lines: Line count limit (None for unlimited)
+            ellipsis: Marker appended to truncated text
+
+        Returns:
+            List of lines (shared, do not modify)
+        """
+        key = (font_key(font), text, max_width, max_lines, ellipsis)
+        lines = self._wrap_cache.get(key)
+        if lines is not None:
+            return lines
+
+        start = time.perf_counter()
+        if font_key(font)[0] == 'id':
+            self._pinned[id(font)] = font
+
+        def width(s: str) -> float:
+            return font.getlength(s)
+
+        lines = []
+        for paragraph in text.split('\n'):
+            line = ''
+            for word in paragraph.split():
+                candidate = f"{line} {word}" if line else word
+                if width(candidate) <= max_width:
+                    line = candidate
+                    continue
+                if line:
+                    lines.append(line)
+                # Split words that do not fit on a line of their own
+                while width(word) > max_width and len(word) > 1:
+                    cut = len(word) - 1
+                    while cut > 1 and width(word[:cut]) > max_width:
+                        cut -= 1
+                    lines.append(word[:cut])
+                    word = word[cut:]
+                line = word
+            lines.append(line)
+
+        if max_lines is not None and len(lines) > max_lines:
+            lines = lines[:max_lines]
+            last = lines[-1].rstrip()
+            while last and width(last + ellipsis) > max_width:
+                last = last[:-1].rstrip()
+            lines[-1] = last + ellipsis
+
+        self._wrap_cache.put(key, lines, cost=time.perf_counter() - start)
+        return lines
+
+    def fit_size(self, load_font: Callable[[int], object], font_id: str, text: str,
+                 box: tuple[int, int], max_size: int, min_size: int = DEFAULT_MIN_FONT_SIZE,
+                 wrap: bool = False, max_lines: int | None = None,
+                 line_spacing: float = 1.0, stroke: int = 0) -> int:
+        """
+        Find the largest font size at which text fits a box.
+
+        Sizes are binary searched (text extent grows with size), so only
+        about log2(max_size - min_size) sizes are loaded and measured. The
+        result is memoized per (font, text, box, limits).
+
+        Args:
+            load_font: Function size -> PIL font (e.g. a FontManager lookup)
+            font_id: Font path or name identifying load_font's face
+            text: Text to fit
+            box: (width, height) available
+            max_size: Largest size to consider
+            min_size: Smallest size returned, even if it does not fit
+            wrap: Fit word-wrapped lines instead of a single line
+            max_lines: With wrap, the line count limit
+            line_spacing: With wrap, line height multiplier
+            stroke: Extra pixels around glyphs (e.g. 1 for an outline)
+
+        Returns:
+            Font size
+        """
+        key = (font_id, text, tuple(box), max_size, min_size, wrap, max_lines,
+               line_spacing, stroke)
+        size = self._fit_cache.get(key)
+        if size is not None:
+            return size
+
+        start = time.perf_counter()
+        box_w, box_h = box[0] - 2 * stroke, box[1] - 2 * stroke
+
+        def fits(candidate: int) -> bool:
+            font = load_font(candidate)
+            if not wrap:
+                width, height = self.text_size(font, text)
+                return width <= box_w and height <= box_h
+            # Words only break between characters at the minimum size
+            if any(font.getlength(word) > box_w for word in text.split()):
+                return False
+            lines = self.wrap(font, text, box_w, None)
+            if max_lines is not None and len(lines) > max_lines:
+                return False
+            ascent, descent = font.getmetrics()
+            return len(lines) * round((ascent + descent) * line_spacing) <= box_h
+
+        low, high = min_size, max(min_size, max_size)
+        if fits(high):
+            low = high
+        else:
+            # Invariant: low fits (or is the floor), high does not
+            while high - low > 1:
+                mid = (low + high) // 2
+                if fits(mid):
+                    low = mid
+                else:
+                    high = mid
+
+        self._fit_cache.put(key, low, cost=time.perf_counter() - start)
+        return low
+
+    def text_size(self, font, text: str, stroke: int = 0) -> tuple[int, int]:
+        """
+        Get text (width, height) from its bounding box.
+
+        Args:
+            font: PIL font object
+            text: Text
+            stroke: Stroke width
+
+        Returns:
+            Tuple of (width, height)
+        """
+        metrics = self.measure(font, text, stroke)
+        return metrics['width'], metrics['height']
+
+    def aligned_position(self, font, text: str, x: int, y: int,
+                         h_align: str = 'left', v_align: str = 'top',
+                         stroke: int = 0) -> tuple[int, int]:
+        """
+        Get PIL draw origin for text anchored at (x, y).
+
+        Args:
+            font: PIL font object
+            text: Text
+            x, y: Anchor position
+            h_align: 'left', 'center' or 'right' (x is left/center/right edge)
+            v_align: 'top', 'center' or 'bottom' (y is top/middle/bottom edge)
+            stroke: Stroke width
+
+        Returns:
+            Tuple of (x, y) to pass to ImageDraw.text
+        """
+        width, height = self.text_size(font, text, stroke)
+
+        if h_align == 'center':
+            x = x - width // 2
+        elif h_align == 'right':
+            x = x - width
+
+        if v_align == 'center':
+            y = y - height // 2
+        elif v_align == 'bottom':
+            y = y - height
+
+        return x, y
+
+    def stats(self) -> dict:
+        """
+        Get counters of the three text caches combined.
+
+        Returns:
+            Dict with 'hits', 'misses', 'entries' and 'hit_rate' (0..1)
+        """
+        caches = (self._cache, self._wrap_cache, self._fit_cache)
+        hits = sum(c.hits for c in caches)
+        misses = sum(c.misses for c in caches)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'entries': sum(len(c) for c in caches),
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """Drop all cached measurements and reset counters."""
+        self._cache.clear()
+        self._wrap_cache.clear()
+        self._fit_cache.clear()
+        self._pinned.clear()
+
+
+_text_layout: TextLayout | None = None
+
+
+def get_text_layout() -> TextLayout:
+    """Get the process-wide text layout cache."""
+    global _text_layout
+    if _text_layout is None:
+        _text_layout = TextLayout()
+    return _text_layout
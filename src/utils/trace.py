@@ -0,0 +1,152 @@
+"""Timeline of what each thread did during a render, to see I/O and compute overlap."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import threading
+import time
+
+# Categories, and their characters in the text timeline
+TRACE_CATEGORIES = {'compute': '#', 'io': '=', 'wait': '!'}
+
+
+class Trace:
+    """
+    Records timed spans from any thread.
+
+    Spans are (name, category, thread, start, end) with times in seconds
+    since the trace was created. Categories: 'compute' (rendering on the
+    main thread), 'io' (decoding assets) and 'wait' (the renderer blocked
+    on an asset still being decoded).
+    """
+
+    def __init__(self):
+        """Initialize an empty trace starting now."""
+        self.origin = time.perf_counter()
+        self.spans: list[tuple[str, str, str, float, float]] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = 'compute'):
+        """
+        Time a block of work.
+
+        Args:
+            name: What is being done (e.g. 'month 3', a file name)
+            category: One of TRACE_CATEGORIES
+        """
+        start = time.perf_counter() - self.origin
+        try:
+            yield
+        finally:
+            end = time.perf_counter() - self.origin
+            with self._lock:
+                self.spans.append((name, category, threading.current_thread().name, start, end))
+
+    @staticmethod
+    def _union(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        """Merge overlapping intervals."""
+        merged: list[list[float]] = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return [(start, end) for start, end in merged]
+
+    def busy(self, category: str) -> list[tuple[float, float]]:
+        """Time ranges in which any thread was doing work of a category."""
+        return self._union([(s, e) for _, cat, _, s, e in self.spans if cat == category])
+
+    def summary(self) -> dict:
+        """
+        Totals of the trace.
+
+        Returns:
+            Dict with 'wall', 'compute', 'io' (summed over threads),
+            'io_busy' (time any decode was running), 'wait' and 'overlap'
+            (time decoding ran while the renderer computed, not
+            waited), in seconds
+        """
+        wall = max((end for *_, end in self.spans), default=0.0)
+        totals = {cat: sum(e - s for _, c, _, s, e in self.spans if c == cat)
+                  for cat in TRACE_CATEGORIES}
+        io_busy = self.busy('io')
+        overlap = 0.0
+        # Waits are nested in compute spans; decoding then did not overlap work
+        for category, sign in (('compute', 1), ('wait', -1)):
+            for start, end in self.busy(category):
+                for io_start, io_end in io_busy:
+                    overlap += sign * max(0.0, min(io_end, end) - max(io_start, start))
+        return {
+            'wall': wall,
+            'compute': totals['compute'],
+            'io': totals['io'],
+            'io_busy': sum(e - s for s, e in io_busy),
+            'wait': totals['wait'],
+            'overlap': overlap,
+        }
+
+    def format_timeline(self, width: int = 72) -> str:
+        """
+        Draw one line per thread over the trace's duration.
+
+        '#' is compute, '=' is decoding, '!' is waiting for a decode and
+        '.' is idle; a column shows what took most of its time slice.
+
+        Args:
+            width: Number of columns
+
+        Returns:
+            Multi-line string ending with the summary
+        """
+        summary = self.summary()
+        wall = summary['wall'] or 1.0
+        step = wall / width
+        threads = list(dict.fromkeys(thread for _, _, thread, _, _ in self.spans))
+        name_width = max((len(t) for t in threads), default=0)
+        lines = [f"Trace: {wall:.2f}s, one column = {step * 1000:.0f} ms "
+                 f"('#' compute, '=' decode, '!' wait)"]
+        for thread in threads:
+            fill = [dict.fromkeys(TRACE_CATEGORIES, 0.0) for _ in range(width)]
+            for _, cat, t, start, end in self.spans:
+                if t != thread:
+                    continue
+                first, last = int(start / step), min(width - 1, int(end / step))
+                for col in range(first, last + 1):
+                    lo, hi = col * step, (col + 1) * step
+                    fill[col][cat] += max(0.0, min(end, hi) - max(start, lo))
+            row = ''.join(
+                TRACE_CATEGORIES[max(col, key=col.get)] if max(col.values()) > step / 4 else '.'
+                for col in fill
+            )
+            lines.append(f"  {thread:<{name_width}} |{row}|")
+        lines.append(
+            f"  compute {summary['compute']:.2f}s, decode {summary['io']:.2f}s over threads "
+            f"({summary['io_busy']:.2f}s wall), {summary['overlap']:.2f}s of decoding "
+            f"overlapped compute, renderer waited {summary['wait']:.2f}s"
+        )
+        return '\n'.join(lines)
+
+    def save_chrome(self, path: str):
+        """
+        Write the trace in Chrome's trace event format (chrome://tracing, Perfetto).
+
+        Args:
+            path: Output JSON file
+        """
+        threads = {thread: i for i, thread in
+                   enumerate(dict.fromkeys(thread for _, _, thread, _, _ in self.spans))}
+        events = [{'name': name, 'cat': cat, 'ph': 'X', 'pid': 1, 'tid': threads[thread],
+                   'ts': round(start * 1e6), 'dur': round((end - start) * 1e6)}
+                  for name, cat, thread, start, end in self.spans]
+        events += [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                    'args': {'name': thread}} for thread, tid in threads.items()]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events}, f)
+
+
+def trace_span(trace: Trace | None, name: str, category: str = 'compute'):
+    """Trace.span, or a no-op when there is no trace."""
+    return trace.span(name, category) if trace is not None else contextlib.nullcontext()
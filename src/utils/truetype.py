@@ -0,0 +1,287 @@
+"""Minimal TrueType/OpenType reader for embedding fonts in PDF files."""
+
+from __future__ import annotations
+
+import struct
+
+# Tables a subset keeps for TrueType outlines (glyph ids are not renumbered)
+SUBSET_TABLES = (b'head', b'hhea', b'hmtx', b'maxp', b'loca', b'glyf',
+                 b'cvt ', b'fpgm', b'prep')
+
+# OS/2 fsType bit: the font must not be embedded
+FS_TYPE_RESTRICTED = 0x0002
+
+# Composite glyph flags
+ARG_1_AND_2_ARE_WORDS = 0x0001
+WE_HAVE_A_SCALE = 0x0008
+MORE_COMPONENTS = 0x0020
+WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+WE_HAVE_A_TWO_BY_TWO = 0x0080
+
+
+def _checksum(data: bytes) -> int:
+    """sfnt table checksum (sum of big-endian uint32 words)."""
+    data += b'\0' * (-len(data) % 4)
+    return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xFFFFFFFF
+
+
+def build_sfnt(tables: dict[bytes, bytes], version: bytes = b'\0\1\0\0') -> bytes:
+    """
+    Assemble a font file from tables.
+
+    Args:
+        tables: Table tag -> data
+        version: sfnt version tag (TrueType or b'OTTO' for CFF outlines)
+
+    Returns:
+        Font file bytes
+    """
+    tags = sorted(tables)
+    count = len(tags)
+    power = 1
+    while power * 2 <= count:
+        power *= 2
+    header = version + struct.pack('>HHHH', count, power * 16, power.bit_length() - 1,
+                                   count * 16 - power * 16)
+    offset = 12 + 16 * count
+    records, body = [], []
+    for tag in tags:
+        data = tables[tag]
+        records.append(struct.pack('>4sIII', tag, _checksum(data), offset, len(data)))
+        padded = data + b'\0' * (-len(data) % 4)
+        body.append(padded)
+        offset += len(padded)
+    return header + b''.join(records) + b''.join(body)
+
+
+class TrueTypeFont:
+    """
+    Font file metrics, character map and glyph subsetting.
+
+    Reads single fonts (.ttf/.otf) and one face of a collection (.ttc).
+    Everything is parsed from the raw tables; nothing is rasterized.
+    """
+
+    def __init__(self, path: str, index: int = 0):
+        """
+        Initialize font reader.
+
+        Args:
+            path: Font file path
+            index: Face index in a font collection
+
+        Raises:
+            ValueError: If the file is not a usable sfnt font
+        """
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        offset = 0
+        if self.data[:4] == b'ttcf':
+            count = struct.unpack_from('>I', self.data, 8)[0]
+            if index >= count:
+                raise ValueError(f"{path} has {count} faces, no face {index}")
+            offset = struct.unpack_from('>I', self.data, 12 + 4 * index)[0]
+        self.version = self.data[offset:offset + 4]
+        if self.version not in (b'\0\1\0\0', b'true', b'OTTO'):
+            raise ValueError(f"{path} is not a TrueType/OpenType font")
+
+        num_tables = struct.unpack_from('>H', self.data, offset + 4)[0]
+        self._tables: dict[bytes, tuple[int, int]] = {}
+        for i in range(num_tables):
+            tag, _, table_offset, length = struct.unpack_from('>4sIII', self.data,
+                                                              offset + 12 + 16 * i)
+            self._tables[tag] = (table_offset, length)
+        if b'head' not in self._tables or b'hmtx' not in self._tables:
+            raise ValueError(f"{path} has no metrics tables")
+
+        self.is_cff = b'CFF ' in self._tables
+        self._read_metrics()
+        self.cmap = self._read_cmap()
+        self.postscript_name = self._read_name(6) or 'Font'
+
+    def table(self, tag: bytes) -> bytes:
+        """Raw data of a table (empty if missing)."""
+        if tag not in self._tables:
+            return b''
+        offset, length = self._tables[tag]
+        return self.data[offset:offset + length]
+
+    def _read_metrics(self):
+        head = self.table(b'head')
+        self.units_per_em = struct.unpack_from('>H', head, 18)[0]
+        self.bbox = struct.unpack_from('>hhhh', head, 36)
+        self.index_to_loc_format = struct.unpack_from('>h', head, 50)[0]
+
+        hhea = self.table(b'hhea')
+        self.ascent, self.descent = struct.unpack_from('>hh', hhea, 4)
+        num_metrics = struct.unpack_from('>H', hhea, 34)[0]
+        self.num_glyphs = struct.unpack_from('>H', self.table(b'maxp'), 4)[0]
+
+        hmtx = self.table(b'hmtx')
+        advances = list(struct.unpack_from(f'>{num_metrics * 2}H', hmtx))[::2]
+        # Glyphs past numberOfHMetrics repeat the last advance
+        self.advances = advances + [advances[-1]] * (self.num_glyphs - num_metrics)
+
+        os2 = self.table(b'OS/2')
+        self.fs_type = struct.unpack_from('>H', os2, 8)[0] if len(os2) >= 10 else 0
+        self.weight = struct.unpack_from('>H', os2, 4)[0] if len(os2) >= 6 else 400
+        self.cap_height = (struct.unpack_from('>h', os2, 88)[0] if len(os2) >= 90
+                           else self.ascent)
+
+        post = self.table(b'post')
+        self.italic_angle = struct.unpack_from('>i', post, 4)[0] / 65536 if len(post) >= 16 else 0.0
+        self.fixed_pitch = bool(struct.unpack_from('>I', post, 12)[0]) if len(post) >= 16 else False
+
+    def _read_cmap(self) -> dict[int, int]:
+        """Map code points to glyph ids from the best Unicode subtable."""
+        cmap = self.table(b'cmap')
+        if not cmap:
+            return {}
+        count = struct.unpack_from('>H', cmap, 2)[0]
+        subtables = {}
+        for i in range(count):
+            platform, encoding, offset = struct.unpack_from('>HHI', cmap, 4 + 8 * i)
+            subtables[(platform, encoding)] = offset
+        for key in ((3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0)):
+            if key in subtables:
+                offset = subtables[key]
+                fmt = struct.unpack_from('>H', cmap, offset)[0]
+                if fmt == 12:
+                    return self._cmap_format12(cmap, offset)
+                if fmt == 4:
+                    return self._cmap_format4(cmap, offset)
+        return {}
+
+    @staticmethod
+    def _cmap_format4(cmap: bytes, offset: int) -> dict[int, int]:
+        seg_count = struct.unpack_from('>H', cmap, offset + 6)[0] // 2
+        ends = struct.unpack_from(f'>{seg_count}H', cmap, offset + 14)
+        starts_at = offset + 16 + 2 * seg_count
+        starts = struct.unpack_from(f'>{seg_count}H', cmap, starts_at)
+        deltas = struct.unpack_from(f'>{seg_count}h', cmap, starts_at + 2 * seg_count)
+        range_at = starts_at + 4 * seg_count
+        range_offsets = struct.unpack_from(f'>{seg_count}H', cmap, range_at)
+        mapping = {}
+        for i in range(seg_count):
+            for code in range(starts[i], ends[i] + 1):
+                if code == 0xFFFF:
+                    continue
+                if range_offsets[i] == 0:
+                    gid = (code + deltas[i]) & 0xFFFF
+                else:
+                    at = range_at + 2 * i + range_offsets[i] + 2 * (code - starts[i])
+                    gid = struct.unpack_from('>H', cmap, at)[0]
+                    if gid:
+                        gid = (gid + deltas[i]) & 0xFFFF
+                if gid:
+                    mapping[code] = gid
+        return mapping
+
+    @staticmethod
+    def _cmap_format12(cmap: bytes, offset: int) -> dict[int, int]:
+        groups = struct.unpack_from('>I', cmap, offset + 12)[0]
+        mapping = {}
+        for i in range(groups):
+            start, end, gid = struct.unpack_from('>III', cmap, offset + 16 + 12 * i)
+            for code in range(start, end + 1):
+                mapping[code] = gid + code - start
+        return mapping
+
+    def _read_name(self, name_id: int) -> str | None:
+        name = self.table(b'name')
+        if not name:
+            return None
+        count, strings = struct.unpack_from('>HH', name, 2)
+        for i in range(count):
+            platform, encoding, _, nid, length, offset = struct.unpack_from('>6H', name, 6 + 12 * i)
+            if nid != name_id:
+                continue
+            raw = name[strings + offset:strings + offset + length]
+            if platform == 3 or platform == 0:
+                return raw.decode('utf-16-be', 'replace')
+            if platform == 1:
+                return raw.decode('latin-1')
+        return None
+
+    def glyph_ids(self, text: str) -> list[int]:
+        """Glyph id of each character (0, the missing glyph, if unmapped)."""
+        return [self.cmap.get(ord(char), 0) for char in text]
+
+    def advance(self, gid: int) -> float:
+        """Advance width of a glyph in PDF glyph space (1000 units per em)."""
+        return self.advances[gid] * 1000 / self.units_per_em
+
+    @property
+    def embeddable(self) -> bool:
+        """False when the font's license forbids embedding."""
+        return not (self.fs_type & FS_TYPE_RESTRICTED) or bool(self.fs_type & 0x000C)
+
+    def _glyph_range(self, loca: bytes, gid: int) -> tuple[int, int]:
+        if self.index_to_loc_format == 0:
+            start, end = struct.unpack_from('>HH', loca, 2 * gid)
+            return start * 2, end * 2
+        return struct.unpack_from('>II', loca, 4 * gid)
+
+    def _components(self, glyph: bytes) -> list[int]:
+        """Glyph ids referenced by a composite glyph."""
+        if len(glyph) < 10 or struct.unpack_from('>h', glyph, 0)[0] >= 0:
+            return []
+        components, at = [], 10
+        while True:
+            flags, gid = struct.unpack_from('>HH', glyph, at)
+            components.append(gid)
+            at += 4 + (4 if flags & ARG_1_AND_2_ARE_WORDS else 2)
+            if flags & WE_HAVE_A_SCALE:
+                at += 2
+            elif flags & WE_HAVE_AN_X_AND_Y_SCALE:
+                at += 4
+            elif flags & WE_HAVE_A_TWO_BY_TWO:
+                at += 8
+            if not flags & MORE_COMPONENTS:
+                return components
+
+    def font_file(self, gids: set[int] | None = None) -> bytes:
+        """
+        Build a standalone font file, optionally keeping only some glyphs.
+
+        TrueType outlines of unused glyphs are emptied; glyph ids stay the
+        same, so text can be shown by glyph id with an identity mapping.
+        CFF fonts and collection faces are returned whole, as one face.
+
+        Args:
+            gids: Glyph ids to keep (glyph 0 and composite parts are added)
+
+        Returns:
+            Font file bytes
+        """
+        if self.is_cff or gids is None or b'glyf' not in self._tables:
+            return build_sfnt({tag: self.table(tag) for tag in self._tables}, self.version)
+
+        loca, glyf = self.table(b'loca'), self.table(b'glyf')
+        keep, pending = set(), {0, *gids}
+        while pending:
+            gid = pending.pop()
+            if gid in keep or gid >= self.num_glyphs:
+                continue
+            keep.add(gid)
+            start, end = self._glyph_range(loca, gid)
+            pending.update(self._components(glyf[start:end]))
+
+        offsets, parts, size = [], [], 0
+        for gid in range(self.num_glyphs):
+            offsets.append(size)
+            if gid in keep:
+                start, end = self._glyph_range(loca, gid)
+                glyph = glyf[start:end] + b'\0' * (-(end - start) % 4)
+                parts.append(glyph)
+                size += len(glyph)
+        offsets.append(size)
+
+        head = bytearray(self.table(b'head'))
+        struct.pack_into('>I', head, 8, 0)      # checkSumAdjustment
+        struct.pack_into('>h', head, 50, 1)     # long loca offsets
+        tables = {tag: self.table(tag) for tag in SUBSET_TABLES if tag in self._tables}
+        tables[b'head'] = bytes(head)
+        tables[b'glyf'] = b''.join(parts)
+        tables[b'loca'] = struct.pack(f'>{len(offsets)}I', *offsets)
+        return build_sfnt(tables, b'\0\1\0\0')
@@ -0,0 +1,294 @@
+"""Watch mode: re-render only the months affected by config or asset edits."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import defaultdict
+
+from src.calendar_generator import CalendarGenerator
+from src.preflight import DAY_SECTIONS
+from src.utils.font_index import get_font_index
+from src.utils.png_encoder import DEFAULT_PROFILE
+from src.utils.text_layout import get_text_layout
+
+ALL_MONTHS = frozenset(range(1, 13))
+
+DEFAULT_INTERVAL = 0.5
+
+
+def _spec_day_month(spec_day: dict) -> int | None:
+    """Month number of a spec_days entry ('DD.MM'), or None if malformed."""
+    try:
+        return int(spec_day['date'].split('.')[1])
+    except (KeyError, IndexError, ValueError, AttributeError):
+        return None
+
+
+def spec_days_generator_files(config: dict) -> set[str]:
+    """Absolute paths of the background and fonts in-memory spec day images are drawn from."""
+    settings = config.get('spec_days_generator') or {}
+    font_index = get_font_index()
+    paths = {settings.get('canvas', {}).get('background')}
+    for section in ('date', 'desc'):
+        font = settings.get(section, {}).get('font')
+        paths.add(font_index.resolve(font) if font else None)
+    return {os.path.abspath(path) for path in paths if path}
+
+
+def month_dependencies(generator: CalendarGenerator) -> dict[str, set[int]]:
+    """
+    Map every asset and font file a render reads to the months using it.
+
+    Args:
+        generator: Generator holding the current config
+
+    Returns:
+        Dict of absolute file path -> set of month numbers
+    """
+    config = generator.config
+    renderer = generator.month_renderer
+    font_index = get_font_index()
+    deps: dict[str, set[int]] = defaultdict(set)
+
+    def add_file(path, months):
+        if path:
+            deps[os.path.abspath(path)].update(months)
+
+    def add_font(font, months):
+        if font:
+            add_file(font_index.resolve(font), months)
+
+    spec_months = {m for m in map(_spec_day_month, config.get('spec_days', [])) if m}
+
+    for month in range(1, 13):
+        month_cfg = renderer.get_month_geometry(month, config)['month_cfg']
+        add_file(month_cfg.get('background'), {month})
+        add_file(month_cfg.get('title_background'), {month})
+        add_font(month_cfg.get('text_font'), {month})
+
+    add_file(config.get('day_of_the_week', {}).get('background'), ALL_MONTHS)
+    add_font(generator.font_manager.default_font, ALL_MONTHS)
+
+    for section in DAY_SECTIONS:
+        cfg = config.get(section, {})
+        months = spec_months if section == 'spec_day' else ALL_MONTHS
+        add_file(cfg.get('background'), months)
+        add_font(cfg.get('text_font'), months)
+
+    for spec_day in config.get('spec_days', []):
+        month = _spec_day_month(spec_day)
+        if month:
+            add_file(spec_day.get('background'), {month})
+            style = spec_day.get('style', {})
+            add_file(style.get('background'), {month})
+            add_font(style.get('text_font'), {month})
+
+    for path in spec_days_generator_files(config):
+        add_file(path, spec_months)
+
+    return dict(deps)
+
+
+def month_signatures(generator: CalendarGenerator) -> dict[int, str]:
+    """
+    Fingerprint the part of the config each month's render depends on.
+
+    Args:
+        generator: Generator holding the current config
+
+    Returns:
+        Dict of month number -> canonical JSON of its inputs
+    """
+    config = generator.config
+    shared = {
+        'day_of_the_week': config.get('day_of_the_week'),
+        'days': {section: config.get(section) for section in DAY_SECTIONS},
+        'spec_days_generator': config.get('spec_days_generator'),
+    }
+    signatures = {}
+    for month in range(1, 13):
+        month_cfg = generator.month_renderer.get_month_geometry(month, config)['month_cfg']
+        spec_days = [s for s in config.get('spec_days', []) if _spec_day_month(s) == month]
+        signatures[month] = json.dumps(
+            {'month': month_cfg, 'spec_days': spec_days, **shared},
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+    return signatures
+
+
+def _stat(path: str) -> tuple[int, int] | None:
+    """File (mtime_ns, size), or None if missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class MonthWatcher:
+    """
+    Polls a config file and its assets and re-renders affected months.
+
+    Uses only os.stat polling. Config edits are diffed per month, so
+    changing one month's background re-renders that month only; asset and
+    font edits re-render the months that reference the file. The generator
+    is kept between renders, so fonts and month layers stay warm and an
+    update rasterizes only the layers whose inputs changed.
+    """
+
+    def __init__(self, generator: CalendarGenerator, config_path: str, year: int,
+                 output_dir: str = 'output', interval: float = DEFAULT_INTERVAL,
+                 profile: str = DEFAULT_PROFILE):
+        """
+        Initialize month watcher.
+
+        Args:
+            generator: Generator already loaded from config_path
+            config_path: Path to the JSON configuration file
+            year: Year being rendered
+            output_dir: Output directory for rewritten months
+            interval: Polling interval in seconds
+            profile: Encoder profile for rewritten months
+        """
+        self.generator = generator
+        self.config_path = os.path.abspath(config_path)
+        self.year = year
+        self.output_dir = output_dir
+        self.interval = interval
+        self.profile = profile
+        self._snapshot()
+
+    def _snapshot(self):
+        """Record dependencies, signatures and file stats for the current config."""
+        self.dependencies = month_dependencies(self.generator)
+        self.signatures = month_signatures(self.generator)
+        paths = [self.config_path, *self.dependencies]
+        self.stats = {path: _stat(path) for path in paths}
+
+    def poll(self) -> set[int]:
+        """
+        Check watched files once.
+
+        Returns:
+            Months that need re-rendering
+        """
+        changed = [path for path, old in self.stats.items() if _stat(path) != old]
+        if not changed:
+            return set()
+
+        months: set[int] = set()
+        fonts_changed = False
+        for path in changed:
+            if path == self.config_path:
+                continue
+            print(f"Changed: {path}")
+            months |= self.dependencies.get(path, set())
+            if path.lower().endswith(('.ttf', '.otf', '.ttc')):
+                fonts_changed = True
+
+        # In-memory spec day images are redrawn from their changed background or fonts
+        if set(changed) & spec_days_generator_files(self.generator.config):
+            self.generator.month_renderer.day_renderer.spec_day_images = (
+                self.generator.generate_spec_day_images())
+
+        if self.config_path in changed:
+            months |= self._reload_config()
+
+        # Layer keys carry asset file versions; fonts are cached by path only
+        if fonts_changed:
+            self.generator.month_renderer.clear_caches()
+            self.generator.font_manager.reload()
+            get_text_layout().clear()
+
+        self._snapshot()
+        return months
+
+    def _reload_config(self) -> set[int]:
+        """Reload the config file; return months whose inputs changed."""
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            # Often a half-written file; the next save triggers another poll
+            print(f"Config not reloaded: {e}")
+            return set()
+
+        print(f"Changed: {self.config_path}")
+        old_signatures = self.signatures
+        previous = self._generator_state()
+        try:
+            self.generator.set_config(config)
+            new_signatures = month_signatures(self.generator)
+        except (ValueError, KeyError, TypeError) as e:
+            # A half-finished edit (e.g. an inherit cycle, a missing section):
+            # keep rendering from the previous config
+            self._restore_generator_state(previous)
+            print(f"Config not reloaded: {type(e).__name__}: {e}")
+            return set()
+        return {m for m in range(1, 13) if new_signatures[m] != old_signatures.get(m)}
+
+    def _generator_state(self) -> dict:
+        """Config-derived generator attributes that set_config replaces."""
+        generator = self.generator
+        day_renderer = generator.month_renderer.day_renderer
+        return {
+            'config': generator.config,
+            'spec_days': generator.spec_days,
+            'months_config': generator.months_config,
+            'spec_day_images': day_renderer.spec_day_images,
+            'default_font': generator.font_manager.default_font,
+        }
+
+    def _restore_generator_state(self, state: dict):
+        """Undo a partial set_config (see _generator_state)."""
+        generator = self.generator
+        generator.config = state['config']
+        generator.spec_days = state['spec_days']
+        generator.months_config = state['months_config']
+        generator.month_renderer.spec_days = state['spec_days']
+        generator.month_renderer.months_config = state['months_config']
+        generator.month_renderer.day_renderer.spec_days = state['spec_days']
+        generator.month_renderer.day_renderer.spec_day_images = state['spec_day_images']
+        if generator.font_manager.default_font != state['default_font']:
+            generator.font_manager.default_font = state['default_font']
+            generator.font_manager.reload()
+
+    def render(self, months: set[int]) -> list[str]:
+        """
+        Re-render and save the given months.
+
+        Each month is rebuilt from cached layers; the report lists the layers
+        that had to be rasterized again.
+
+        Args:
+            months: Month numbers
+
+        Returns:
+            List of written files
+        """
+        filenames = []
+        for month in sorted(months):
+            start = time.perf_counter()
+            month_img = self.generator.create_month(self.year, month)
+            filename = self.generator.save_month(month_img, self.year, month, self.output_dir,
+                                                 self.profile)
+            filenames.append(filename)
+            redrawn = ", ".join(self.generator.month_renderer.rasterized) or "none"
+            print(f"Updated: {filename} ({time.perf_counter() - start:.2f}s, "
+                  f"layers redrawn: {redrawn})")
+        return filenames
+
+    def run(self):
+        """Poll until interrupted with Ctrl+C."""
+        print(f"Watching {self.config_path} and {len(self.dependencies)} files "
+              f"(Ctrl+C to stop)...")
+        try:
+            while True:
+                time.sleep(self.interval)
+                months = self.poll()
+                if months:
+                    self.render(months)
+        except KeyboardInterrupt:
+            print("\nWatch stopped")
@@ -0,0 +1,58 @@
+"""Tests for the persistent asset cache."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from src.utils.asset_cache import AssetCache
+
+
+class EvictionTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.sources = []
+        for i in range(8):
+            source = self.root / f"source{i}.png"
+            source.write_bytes(bytes([i]) * 16)
+            self.sources.append(str(source))
+        self.image = np.zeros((32, 32, 4), dtype=np.uint8)
+
+    def entry_sizes(self, cache: AssetCache) -> list[int]:
+        return [entry.stat().st_size for entry in cache.cache_dir.glob('*.npy')]
+
+    def test_puts_under_budget_do_not_rescan(self):
+        cache = AssetCache(self.root / 'cache', max_bytes=1 << 20)
+        with mock.patch('src.utils.asset_cache.os.scandir', wraps=os.scandir) as scandir:
+            for source in self.sources:
+                cache.put(source, 32, 32, 4, self.image)
+        # One scan on the first write, none for the others
+        self.assertEqual(scandir.call_count, 1)
+        self.assertEqual(cache._size, sum(self.entry_sizes(cache)))
+
+    def test_over_budget_evicts_oldest(self):
+        cache = AssetCache(self.root / 'cache', max_bytes=1 << 20)
+        cache.put(self.sources[0], 32, 32, 4, self.image)
+        entry_size = self.entry_sizes(cache)[0]
+        cache.max_bytes = 3 * entry_size
+        for i, source in enumerate(self.sources):
+            if i:
+                cache.put(source, 32, 32, 4, self.image)
+            # Distinct mtimes so least recently used is well defined
+            entry = cache._entry_path(source, 32, 32, 4)
+            if entry.exists():
+                os.utime(entry, (1000 + i, 1000 + i))
+
+        self.assertEqual(len(self.entry_sizes(cache)), 3)
+        self.assertLessEqual(cache._size, cache.max_bytes)
+        for source in self.sources[-3:]:
+            self.assertIsNotNone(cache.get(source, 32, 32, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for personalized batch rendering against full renders."""
+
+import contextlib
+import copy
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+
+from src.batch import ALL_MONTHS, PersonalizedBatch, merge_spec_days
+from src.calendar_generator import CalendarGenerator
+from src.config_loader import deep_merge
+from src.day_renderer import DayRenderer
+from src.utils.cache_registry import get_cache_registry
+
+ROOT = Path(__file__).resolve().parent.parent
+YEAR = 2026
+MONTH = 3
+
+TITLE_MOVED = {'id': 'moved', 'config': {'month': {'title_offset_y': 12}},
+               'spec_days': [{'date': '14.03', 'name': 'Petr', 'desc': '',
+                              'background': 'assets/img/spec_day1.png'}]}
+
+
+def load_base() -> dict:
+    with open(ROOT / 'settings.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def title_color(base: dict) -> dict:
+    """Recipient whose only change is the title color of MONTH."""
+    months = copy.deepcopy(base['months'])
+    months[MONTH - 1]['text_color'] = [200, 20, 40]
+    return {'id': 'title', 'spec_days': [], 'config': {'months': months}}
+
+
+def full_render(base: dict, recipient: dict):
+    """The recipient's month rendered from scratch with its merged config."""
+    raw = deep_merge(copy.deepcopy(base), recipient.get('config', {}))
+    raw['spec_days'] = merge_spec_days(raw.get('spec_days', []), recipient['spec_days'])
+    return CalendarGenerator(config=raw).create_month(YEAR, MONTH)
+
+
+class TitleOverrideTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output = tmp.name
+        self.base = load_base()
+        get_cache_registry().clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.batch = PersonalizedBatch(self.base, YEAR, self.output)
+
+    def run_batch(self, recipients: list[dict]) -> dict:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.batch.run(recipients, months=[MONTH])
+
+    def page(self, recipient: dict):
+        path = Path(self.output) / recipient['id'] / f"calendar_{YEAR}_{MONTH:02d}.png"
+        return cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+
+    def test_title_only_change_is_not_a_full_render(self):
+        job = self.batch._prepare(title_color(self.base))
+        self.assertEqual(job['full_months'], set())
+        self.assertEqual(job['restyled_months'], {MONTH})
+        job = self.batch._prepare(TITLE_MOVED)
+        self.assertEqual(job['full_months'], set())
+        self.assertEqual(job['restyled_months'], set(ALL_MONTHS))
+
+    def test_cell_style_change_is_a_full_render(self):
+        job = self.batch._prepare({'id': 'cells', 'spec_days': [],
+                                   'config': {'regular_day': {'text_color': [0, 120, 0]}}})
+        self.assertEqual(job['full_months'], set(ALL_MONTHS))
+
+    def test_title_color_reuses_cells(self):
+        recipient = title_color(self.base)
+        with mock.patch.object(DayRenderer, 'create_day_image', autospec=True,
+                               side_effect=DayRenderer.create_day_image) as create_day:
+            stats = self.run_batch([recipient])
+        # Only the base month's 31 cells are drawn
+        self.assertEqual(create_day.call_count, 31)
+        self.assertEqual(stats['cells_redrawn'], 0)
+        self.assertEqual(stats['pages_rendered'], 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = full_render(self.base, recipient)
+        self.assertTrue((self.page(recipient) == expected).all())
+
+    def test_moved_title_with_spec_day(self):
+        stats = self.run_batch([TITLE_MOVED])
+        self.assertEqual(stats['cells_redrawn'], 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = full_render(self.base, TITLE_MOVED)
+        self.assertTrue((self.page(TITLE_MOVED) == expected).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Tests for spec day labels in DayRenderer."""
+
+import unittest
+
+from src.day_renderer import DayRenderer, format_label
+
+SPEC_DAYS = {'14.03': {'name': 'Anna', 'desc': 'Birthday', 'background': ''}}
+
+
+def label(template: str) -> tuple[str, dict] | None:
+    renderer = DayRenderer(None, SPEC_DAYS)
+    return renderer._get_label(14, 3, {'label': {'text': template}})
+
+
+class LabelTemplateTest(unittest.TestCase):
+    def test_known_placeholders(self):
+        self.assertEqual(label('{name}: {desc}')[0], 'Anna: Birthday')
+
+    def test_unknown_placeholder_is_kept(self):
+        self.assertEqual(label('{name} {date}')[0], 'Anna {date}')
+
+    def test_literal_brace_falls_back_to_raw_text(self):
+        self.assertEqual(label('{name} :{')[0], '{name} :{')
+        self.assertEqual(format_label('a } b', SPEC_DAYS['14.03']), 'a } b')
+
+    def test_positional_field_falls_back_to_raw_text(self):
+        self.assertEqual(format_label('{0} {}', SPEC_DAYS['14.03']), '{0} {}')
+
+    def test_no_label_for_other_days(self):
+        renderer = DayRenderer(None, SPEC_DAYS)
+        self.assertIsNone(renderer._get_label(15, 3, {'label': {'text': '{name}'}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
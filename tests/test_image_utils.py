@@ -0,0 +1,31 @@
+"""Tests for batched tile compositing in ImageUtils."""
+
+import unittest
+
+import numpy as np
+
+from src.utils.image_utils import ImageUtils
+
+
+class CompositeBatchTest(unittest.TestCase):
+    def test_grid_matches_per_tile_overlay(self):
+        rng = np.random.default_rng(0)
+        background = rng.integers(0, 256, (120, 150, 4), dtype=np.uint8)
+        placements = []
+        tiles = [rng.integers(0, 256, (30, 32, 4), dtype=np.uint8) for _ in range(11)]
+        # The same tile object placed twice blends like two separate tiles
+        tiles.append(tiles[0])
+        for i, tile in enumerate(tiles):
+            row, col = divmod(i, 4)
+            placements.append((tile, 5 + col * 36, 4 + row * 38))
+        self.assertIsNotNone(ImageUtils._grid_view(background.copy(), placements))
+
+        expected = background.copy()
+        for tile, x, y in placements:
+            expected = ImageUtils._overlay_image(expected, tile, x, y)
+        result = ImageUtils._composite_batch(background, placements)
+        np.testing.assert_array_equal(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+"""Tests for the raster backend interface and selection."""
+
+import unittest
+
+import numpy as np
+
+from src.utils.raster_backend import (
+    BACKENDS, DEFAULT_SELECTION, MixedBackend, RasterBackend, parse_selection,
+)
+
+
+class RasterBackendTest(unittest.TestCase):
+    def test_incomplete_backend_cannot_be_created(self):
+        class DecodeOnly(RasterBackend):
+            def decode(self, path, factor=1):
+                return None
+
+        with self.assertRaises(TypeError):
+            DecodeOnly()
+
+    def test_mixed_backend_dispatches_per_operation(self):
+        backend = MixedBackend(parse_selection('resize=pil'))
+        self.assertEqual(backend.selection, {**DEFAULT_SELECTION, 'resize': 'pil'})
+        image = np.random.default_rng(0).integers(0, 256, (40, 30, 4), dtype=np.uint8)
+        np.testing.assert_array_equal(backend.resize(image, 15, 20, 'area'),
+                                      BACKENDS['pil'].resize(image, 15, 20, 'area'))
+        self.assertEqual(backend.cache_tag('decode', 'resize'), 'decode-cv2_resize-pil')
+
+
+if __name__ == '__main__':
+    unittest.main()
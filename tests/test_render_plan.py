@@ -0,0 +1,43 @@
+"""Tests for dry-run render plans."""
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.calendar_generator import CalendarGenerator
+from src.render_plan import build_render_plan
+
+ROOT = Path(__file__).resolve().parent.parent
+YEAR = 2026
+
+
+class ReducedDecodeTest(unittest.TestCase):
+    def test_large_jpeg_is_planned_at_reduced_size(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        photo = str(Path(tmp.name) / 'photo.jpg')
+        cv2.imwrite(photo, np.full((4000, 6000, 3), 128, dtype=np.uint8))
+        with open(ROOT / 'settings.json', 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        config['months'][0]['background'] = photo
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = CalendarGenerator(config=config)
+
+        plan = build_render_plan(generator, YEAR, [1])
+        asset = next(a for a in plan['assets'] if a['path'] == photo)
+        self.assertEqual(asset['source'], (6000, 4000))
+        # Page targets are 2000 px high, so a half-scale decode covers them
+        self.assertEqual(asset['decoded'], [(3000, 2000)] * len(asset['targets']))
+        self.assertEqual(asset['decode_bytes'], len(asset['targets']) * 3000 * 2000 * 4)
+        # Phases count the reduced decode, not the 6000x4000 source
+        self.assertLess(plan['peak_bytes'], 6000 * 4000 * (3 + 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Tests for the resumable job spool: done, failed and retried jobs."""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import spool as spool_module
+from src.spool import JobSpool, SpoolWorker
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG = str(ROOT / 'settings.json')
+
+
+class SpoolTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.spool = JobSpool(tmp.name)
+        self.worker = SpoolWorker(self.spool)
+        # Keep retry waits short
+        patcher = mock.patch.object(spool_module, 'RETRY_DELAYS', (0.2,))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_once(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            self.worker.run(once=True, interval=0.05)
+
+    def assert_finished(self, job_id: str, state: str) -> dict:
+        self.assertEqual(list(self.spool.dir('inbox').glob('*.json')), [])
+        self.assertEqual(list(self.spool.dir('claimed').glob('*.json')), [])
+        self.assertTrue((self.spool.dir(state) / f"{job_id}.json").exists())
+        status = self.spool.read_status(job_id)
+        self.assertEqual(status['state'], state)
+        return status
+
+    def test_good_job_is_done(self):
+        job_id = self.spool.submit(CONFIG, [2026], months=[1], job_id='good')
+        self.run_once()
+        status = self.assert_finished(job_id, 'done')
+        self.assertEqual(status['completed'], {'2026': [1]})
+        self.assertTrue(Path(status['output'], 'calendar_2026_01.png').exists())
+
+    def test_permanent_error_fails_without_retry(self):
+        bad = self.spool.root / 'broken.json'
+        bad.write_text('{not json', encoding='utf-8')
+        job_id = self.spool.submit(str(bad), [2026], months=[1], job_id='broken')
+        self.run_once()
+        status = self.assert_finished(job_id, 'failed')
+        self.assertEqual(status['attempts'], 1)
+        self.assertIn('JSONDecodeError', status['error'])
+
+    def test_transient_error_is_retried(self):
+        render = SpoolWorker._render_month
+        calls = []
+
+        def flaky(worker, *args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise OSError('spool directory unavailable')
+            return render(worker, *args)
+
+        job_id = self.spool.submit(CONFIG, [2026], months=[1], job_id='flaky')
+        with mock.patch.object(SpoolWorker, '_render_month', flaky):
+            # Requeued with a delay; once-mode waits for it instead of exiting
+            self.run_once()
+        status = self.assert_finished(job_id, 'done')
+        self.assertEqual(status['attempts'], 2)
+        self.assertEqual(len(calls), 2)
+
+    def test_transient_error_fails_after_max_attempts(self):
+        job_id = self.spool.submit(CONFIG, [2026], months=[1], job_id='down')
+        with mock.patch.object(SpoolWorker, '_render_month', side_effect=OSError('down')):
+            self.run_once()
+        status = self.assert_finished(job_id, 'failed')
+        self.assertEqual(status['attempts'], self.spool.max_attempts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for watch mode surviving broken config edits."""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.calendar_generator import CalendarGenerator
+from src.watch import MonthWatcher
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class ConfigReloadTest(unittest.TestCase):
+    def watch(self, name: str) -> MonthWatcher:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_path = Path(tmp.name) / name
+        shutil.copyfile(ROOT / name, self.config_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = CalendarGenerator(str(self.config_path))
+            return MonthWatcher(generator, str(self.config_path), 2026, tmp.name)
+
+    def save(self, config: dict):
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+        # Make sure the poll sees a new mtime even on coarse timestamps
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def assert_reload_rejected(self, watcher: MonthWatcher, config: dict):
+        generator = watcher.generator
+        old_config, old_signatures = generator.config, watcher.signatures
+        old_spec_days = generator.month_renderer.day_renderer.spec_days
+        self.save(config)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(watcher.poll(), set())
+        self.assertIn('Config not reloaded', output.getvalue())
+        self.assertIs(generator.config, old_config)
+        self.assertEqual(watcher.signatures, old_signatures)
+        self.assertIs(generator.month_renderer.day_renderer.spec_days, old_spec_days)
+        # Still renders from the previous config
+        generator.create_month(2026, 1)
+
+    def test_inheritance_cycle_keeps_previous_config(self):
+        watcher = self.watch('calendar_config.json')
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        config['day']['inherit'] = 'regular_day'
+        self.assert_reload_rejected(watcher, config)
+
+    def test_missing_section_keeps_previous_config(self):
+        watcher = self.watch('settings.json')
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        del config['regular_day']
+        self.assert_reload_rejected(watcher, config)
+
+    def test_valid_edit_is_reloaded(self):
+        watcher = self.watch('settings.json')
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        config['months'][4]['text_color'] = [10, 20, 30]
+        self.save(config)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(watcher.poll(), {5})
+
+
+if __name__ == '__main__':
+    unittest.main()
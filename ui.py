@@ -15,7 +15,7 @@ from pathlib import Path
 
 from PySide6.QtWidgets import QApplication
 
-from src.ui_components import MainWindow, STYLESHEET, DEFAULT_CONFIG
+from src.ui_components import MainWindow, STYLESHEET, load_default_config
 
 
 def main():
@@ -24,7 +24,7 @@ def main():
     app.setStyleSheet(STYLESHEET)
 
     # Load config from command line argument or use default
-    config = DEFAULT_CONFIG
+    config = None
     if len(sys.argv) > 1:
         try:
             config_path = Path(sys.argv[1])
@@ -32,6 +32,8 @@ def main():
                 config = json.load(f)
         except Exception as e:
             print(f"Warning: could not load {sys.argv[1]}: {e}")
+    if config is None:
+        config = load_default_config()
 
     win = MainWindow(config)
     win.show()